@@ -18,6 +18,7 @@ import os
 import sqlite3
 import asyncio
 import threading
+import time
 import json
 from datetime import datetime, timedelta
 from contextlib import contextmanager
@@ -35,6 +36,9 @@ DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 ALLOWED_CHANNELS = os.getenv('ALLOWED_CHANNELS', 'claude-tasks').split(',')
 API_PORT = int(os.getenv('API_PORT', '5051'))
 API_KEY = os.getenv('API_KEY', 'athena-secret-key')  # For API authentication
+MAX_TASK_WAIT = 60  # Longest a /api/tasks/next long-poll may park (seconds)
+MAX_BATCH_SIZE = 100  # Most tasks one /api/tasks/batch* request may touch
+PRIORITIES = ('high', 'medium', 'low')
 DB_PATH = os.getenv('DB_PATH', '/app/data/tasks.db')
 NOTIFICATION_CHANNEL = os.getenv('NOTIFICATION_CHANNEL', 'claude-tasks')
 
@@ -114,6 +118,85 @@ def log_task_action(task_id: int, action: str, details: str = None, instance_id:
         ''', (task_id, action, details, instance_id))
         conn.commit()
 
+# =============================================================================
+# Task Dispatch
+# =============================================================================
+
+# Long-polling API threads wait on this until a task becomes pending
+task_available = threading.Condition()
+task_seq = 0
+
+def signal_task_available():
+    """Wake long-poll waiters after a task is created or reset to pending."""
+    global task_seq
+    with task_available:
+        task_seq += 1
+        task_available.notify_all()
+
+def claim_next_task(instance_id: str, instance_name: str):
+    """Atomically claim the highest-priority pending task, or return None."""
+    with get_db() as conn:
+        cursor = conn.cursor()
+        # One statement picks and claims, so two instances can't get the same task
+        cursor.execute('''
+            UPDATE tasks
+            SET status = 'in_progress', instance_id = ?, instance_name = ?, claimed_at = CURRENT_TIMESTAMP
+            WHERE id = (
+                SELECT id FROM tasks
+                WHERE status = 'pending'
+                ORDER BY
+                    CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END,
+                    created_at ASC
+                LIMIT 1
+            )
+            RETURNING *
+        ''', (instance_id, instance_name))
+        task = cursor.fetchone()
+
+        if task:
+            cursor.execute('''
+                INSERT OR REPLACE INTO instances (id, name, last_seen, current_task_id, status)
+                VALUES (?, ?, CURRENT_TIMESTAMP, ?, 'working')
+            ''', (instance_id, instance_name, task['id']))
+        conn.commit()
+
+    if task:
+        log_task_action(task['id'], 'claimed', f'Claimed by {instance_name}', instance_id)
+    return dict(task) if task else None
+
+def wait_for_task(timeout: float, instance_id: str = None, instance_name: str = None):
+    """
+    Get the next task (claimed if instance_id is given), waiting up to
+    timeout seconds for one to be created.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        # Read the sequence first so a task created in between isn't missed
+        seq = task_seq
+        if instance_id:
+            task = claim_next_task(instance_id, instance_name)
+        else:
+            with get_db() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    SELECT * FROM tasks
+                    WHERE status = 'pending'
+                    ORDER BY
+                        CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END,
+                        created_at ASC
+                    LIMIT 1
+                ''')
+                row = cursor.fetchone()
+                task = dict(row) if row else None
+
+        remaining = deadline - time.monotonic()
+        if task or remaining <= 0:
+            return task
+
+        with task_available:
+            if not task_available.wait_for(lambda: task_seq != seq, remaining):
+                return None
+
 # =============================================================================
 # Discord Bot Setup
 # =============================================================================
@@ -192,6 +275,7 @@ async def submit_task(
         conn.commit()
 
     log_task_action(task_id, 'created', f'Priority: {priority}', None)
+    signal_task_available()
 
     priority_emoji = {'high': '🔴', 'medium': '🟡', 'low': '🟢'}
 
@@ -510,6 +594,9 @@ async def check_stale_tasks():
 
         conn.commit()
 
+    if stale_tasks:
+        signal_task_available()
+
     if stale_tasks and bot.notification_channel:
         await bot.notification_channel.send(
             f"⚠️ Reset {len(stale_tasks)} stale task(s) to pending status."
@@ -582,6 +669,7 @@ def create_task():
         conn.commit()
 
     log_task_action(task_id, 'created', 'Created via API', None)
+    signal_task_available()
 
     # Notify Discord
     asyncio.run_coroutine_threadsafe(
@@ -594,21 +682,34 @@ def create_task():
 @api.route('/api/tasks/next', methods=['GET'])
 @require_api_key
 def get_next_task():
-    """Get the next available task (highest priority, oldest)."""
-    with get_db() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            SELECT * FROM tasks
-            WHERE status = 'pending'
-            ORDER BY
-                CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 ELSE 3 END,
-                created_at ASC
-            LIMIT 1
-        ''')
-        task = cursor.fetchone()
+    """
+    Get the next available task (highest priority, oldest).
+
+    Query params:
+        wait: Seconds to wait for a task if the queue is empty (long-poll)
+        claim: 1 to claim the task atomically (needs instance_id)
+        instance_id, instance_name: Claiming instance
+    """
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), MAX_TASK_WAIT)
+    except ValueError:
+        return jsonify({'error': 'wait must be a number'}), 400
+    claim = request.args.get('claim', '').lower() in ('1', 'true', 'yes')
+    instance_id = request.args.get('instance_id')
+    instance_name = request.args.get('instance_name', instance_id)
+
+    if claim and not instance_id:
+        return jsonify({'error': 'instance_id required to claim'}), 400
+
+    task = wait_for_task(wait, instance_id if claim else None, instance_name)
 
     if task:
-        return jsonify({'task': dict(task)})
+        if claim:
+            asyncio.run_coroutine_threadsafe(
+                notify_task_claimed(task['id'], instance_name),
+                bot.loop
+            )
+        return jsonify({'task': task, 'claimed': claim})
     return jsonify({'task': None, 'message': 'No pending tasks'})
 
 @api.route('/api/tasks/<int:task_id>/claim', methods=['POST'])
@@ -754,6 +855,164 @@ def complete_task(task_id):
 
     return jsonify(response)
 
+def parse_task_ids(data):
+    """Read the task_ids list of a batch request; returns (ids, error)."""
+    task_ids = data.get('task_ids')
+    if not isinstance(task_ids, list) or not task_ids:
+        return [], 'task_ids must be a non-empty list'
+    if len(task_ids) > MAX_BATCH_SIZE:
+        return [], f'At most {MAX_BATCH_SIZE} tasks per batch'
+    if not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in task_ids):
+        return [], 'task_ids must be integers'
+    return list(dict.fromkeys(task_ids)), None
+
+@api.route('/api/tasks/batch', methods=['POST'])
+@require_api_key
+def create_tasks_batch():
+    """
+    Create several tasks in one transaction.
+
+    Body: {"tasks": [{"description": ..., "priority": ...} or "description", ...],
+           "submitted_by": ...}
+    Invalid items are reported and skipped; results follow request order.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get('tasks')
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'tasks must be a non-empty list'}), 400
+    if len(items) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'At most {MAX_BATCH_SIZE} tasks per batch'}), 400
+
+    results = []
+    created = []
+    with get_db() as conn:
+        cursor = conn.cursor()
+        for index, item in enumerate(items):
+            if isinstance(item, str):
+                item = {'description': item}
+            if not isinstance(item, dict) or not item.get('description'):
+                results.append({'index': index, 'error': 'description is required'})
+                continue
+            priority = item.get('priority', 'medium')
+            if priority not in PRIORITIES:
+                results.append({'index': index, 'error': f'Invalid priority: {priority}'})
+                continue
+
+            cursor.execute('''
+                INSERT INTO tasks (description, priority, submitted_by)
+                VALUES (?, ?, ?)
+            ''', (item['description'], priority, data.get('submitted_by', 'API')))
+            results.append({'index': index, 'task_id': cursor.lastrowid, 'status': 'pending'})
+            created.append((cursor.lastrowid, item['description']))
+
+        cursor.executemany('''
+            INSERT INTO task_logs (task_id, action, details, instance_id)
+            VALUES (?, 'created', 'Created via API (batch)', NULL)
+        ''', [(task_id,) for task_id, _ in created])
+        conn.commit()
+
+    if created:
+        signal_task_available()
+        asyncio.run_coroutine_threadsafe(notify_tasks_batch('created', created), bot.loop)
+
+    if not created:
+        return jsonify({'error': 'No valid tasks in batch', 'results': results, 'created': 0}), 400
+    return jsonify({'results': results, 'created': len(created)}), 201
+
+@api.route('/api/tasks/batch/complete', methods=['POST'])
+@require_api_key
+def complete_tasks_batch():
+    """
+    Mark several tasks as completed in one transaction.
+
+    Body: {"task_ids": [...], "instance_id": ..., "instance_name": ..., "notes": ...}
+    """
+    data = request.get_json(silent=True) or {}
+    task_ids, error = parse_task_ids(data)
+    if error:
+        return jsonify({'error': error}), 400
+    instance_id = data.get('instance_id', 'unknown')
+    instance_name = data.get('instance_name', instance_id)
+    notes = data.get('notes', '')
+
+    placeholders = ', '.join('?' * len(task_ids))
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            UPDATE tasks
+            SET status = 'completed', completed_at = CURRENT_TIMESTAMP, notes = ?
+            WHERE id IN ({placeholders}) AND status IN ('pending', 'in_progress')
+            RETURNING id, description
+        ''', (notes, *task_ids))
+        completed = {row['id']: row['description'] for row in cursor.fetchall()}
+
+        cursor.executemany('''
+            INSERT INTO task_logs (task_id, action, details, instance_id)
+            VALUES (?, 'completed', ?, ?)
+        ''', [(task_id, notes, instance_id) for task_id in completed])
+
+        cursor.execute('''
+            UPDATE instances SET current_task_id = NULL, status = 'idle', last_seen = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (instance_id,))
+        conn.commit()
+
+    if completed:
+        asyncio.run_coroutine_threadsafe(
+            notify_tasks_batch('completed', list(completed.items()), instance_name),
+            bot.loop
+        )
+
+    results = [
+        {'task_id': task_id, 'status': 'completed'} if task_id in completed
+        else {'task_id': task_id, 'error': 'Task not found or already closed'}
+        for task_id in task_ids
+    ]
+    return jsonify({'results': results, 'completed': len(completed)})
+
+@api.route('/api/tasks/batch/cancel', methods=['POST'])
+@require_api_key
+def cancel_tasks_batch():
+    """
+    Cancel several pending tasks in one transaction.
+
+    Body: {"task_ids": [...], "instance_id": ...}
+    """
+    data = request.get_json(silent=True) or {}
+    task_ids, error = parse_task_ids(data)
+    if error:
+        return jsonify({'error': error}), 400
+    instance_id = data.get('instance_id')
+
+    placeholders = ', '.join('?' * len(task_ids))
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            UPDATE tasks SET status = 'cancelled'
+            WHERE id IN ({placeholders}) AND status = 'pending'
+            RETURNING id, description
+        ''', task_ids)
+        cancelled = {row['id']: row['description'] for row in cursor.fetchall()}
+
+        cursor.executemany('''
+            INSERT INTO task_logs (task_id, action, details, instance_id)
+            VALUES (?, 'cancelled', 'Cancelled via API (batch)', ?)
+        ''', [(task_id, instance_id) for task_id in cancelled])
+        conn.commit()
+
+    if cancelled:
+        asyncio.run_coroutine_threadsafe(
+            notify_tasks_batch('cancelled', list(cancelled.items())),
+            bot.loop
+        )
+
+    results = [
+        {'task_id': task_id, 'status': 'cancelled'} if task_id in cancelled
+        else {'task_id': task_id, 'error': 'Task not found or not pending'}
+        for task_id in task_ids
+    ]
+    return jsonify({'results': results, 'cancelled': len(cancelled)})
+
 @api.route('/api/instance/heartbeat', methods=['POST'])
 @require_api_key
 def instance_heartbeat():
@@ -836,6 +1095,29 @@ async def notify_task_completed(task_id: int, description: str, instance_name: s
 
         await bot.notification_channel.send(embed=embed)
 
+async def notify_tasks_batch(event: str, tasks: list, instance_name: str = None):
+    """Send one summary to Discord for a batch of created/completed/cancelled tasks."""
+    if bot.notification_channel:
+        icon, color = {
+            'created': ('📋', discord.Color.blue()),
+            'completed': ('✅', discord.Color.green()),
+            'cancelled': ('🗑️', discord.Color.red()),
+        }[event]
+
+        lines = [f"`#{task_id}` {description[:80]}" for task_id, description in tasks[:20]]
+        if len(tasks) > 20:
+            lines.append(f"...and {len(tasks) - 20} more")
+
+        embed = discord.Embed(
+            title=f"{icon} {len(tasks)} Tasks {event.title()} (via API)",
+            description="\n".join(lines),
+            color=color
+        )
+        if instance_name:
+            embed.add_field(name="Instance", value=instance_name, inline=True)
+
+        await bot.notification_channel.send(embed=embed)
+
 # =============================================================================
 # Main Entry Point
 # =============================================================================
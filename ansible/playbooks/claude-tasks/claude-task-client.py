@@ -9,9 +9,11 @@ Usage:
     python claude-task-client.py list              # List pending tasks
     python claude-task-client.py next              # Get next task
     python claude-task-client.py claim <id>        # Claim a task
-    python claude-task-client.py complete <id>     # Mark task complete
+    python claude-task-client.py complete <id>...  # Mark task(s) complete
     python claude-task-client.py status            # Show queue status
     python claude-task-client.py add "task desc"   # Add a new task
+    python claude-task-client.py add -f tasks.txt  # Add one task per line (JSON list also accepted)
+    python claude-task-client.py watch             # Wait for tasks and claim them as they arrive
 
 Environment Variables:
     ATHENA_API_URL   - API URL (default: http://192.168.40.14:5051)
@@ -27,6 +29,9 @@ import sys
 import json
 import socket
 import argparse
+import subprocess
+import time
+import urllib.parse
 import urllib.request
 import urllib.error
 from datetime import datetime
@@ -40,11 +45,19 @@ API_KEY = os.getenv('ATHENA_API_KEY', 'athena-homelab-key')
 INSTANCE_ID = os.getenv('CLAUDE_INSTANCE', socket.gethostname())
 INSTANCE_NAME = os.getenv('CLAUDE_INSTANCE_NAME', INSTANCE_ID)
 
+# watch: seconds each long-poll waits server-side, and retry backoff on errors
+WATCH_WAIT = 55
+MIN_POLL_INTERVAL = 5
+MAX_BACKOFF = 60
+
+# Tasks sent per request by add --from-file (the server caps batches at 100)
+BATCH_SIZE = 100
+
 # =============================================================================
 # API Client
 # =============================================================================
 
-def api_request(endpoint: str, method: str = 'GET', data: dict = None) -> dict:
+def api_request(endpoint: str, method: str = 'GET', data: dict = None, timeout: float = 10) -> dict:
     """Make an API request to Athena."""
     url = f"{API_URL}{endpoint}"
 
@@ -58,13 +71,13 @@ def api_request(endpoint: str, method: str = 'GET', data: dict = None) -> dict:
     req = urllib.request.Request(url, data=body, headers=headers, method=method)
 
     try:
-        with urllib.request.urlopen(req, timeout=10) as response:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
             return json.loads(response.read().decode('utf-8'))
     except urllib.error.HTTPError as e:
         error_body = e.read().decode('utf-8')
         try:
             error_json = json.loads(error_body)
-            return {'error': error_json.get('error', str(e)), 'status': e.code}
+            return {**error_json, 'error': error_json.get('error', str(e)), 'status': e.code}
         except:
             return {'error': str(e), 'status': e.code}
     except urllib.error.URLError as e:
@@ -155,12 +168,16 @@ def cmd_claim(args):
     return 0
 
 def cmd_complete(args):
-    """Mark a task as complete."""
-    if not args.task_id:
+    """Mark one or more tasks as complete."""
+    if not args.task_ids:
         print("Error: task_id is required")
         return 1
 
-    result = api_request(f'/api/tasks/{args.task_id}/complete', 'POST', {
+    if len(args.task_ids) > 1:
+        return complete_batch(args.task_ids, args.notes)
+
+    task_id = args.task_ids[0]
+    result = api_request(f'/api/tasks/{task_id}/complete', 'POST', {
         'instance_id': INSTANCE_ID,
         'instance_name': INSTANCE_NAME,
         'notes': args.notes or ''
@@ -170,7 +187,7 @@ def cmd_complete(args):
         print(f"Error: {result['error']}")
         return 1
 
-    print(f"✅ Task #{args.task_id} completed!")
+    print(f"✅ Task #{task_id} completed!")
 
     next_task = result.get('next_task')
     if next_task:
@@ -180,8 +197,107 @@ def cmd_complete(args):
 
     return 0
 
+def complete_batch(task_ids: list, notes: str = None) -> int:
+    """Complete several tasks with one batch request."""
+    result = api_request('/api/tasks/batch/complete', 'POST', {
+        'task_ids': task_ids,
+        'instance_id': INSTANCE_ID,
+        'instance_name': INSTANCE_NAME,
+        'notes': notes or ''
+    })
+
+    if 'error' in result:
+        print(f"Error: {result['error']}")
+        return 1
+
+    failed = 0
+    for item in result.get('results', []):
+        if 'error' in item:
+            failed += 1
+            print(f"❌ Task #{item['task_id']}: {item['error']}")
+        else:
+            print(f"✅ Task #{item['task_id']} completed")
+
+    print(f"\n{result.get('completed', 0)} of {len(task_ids)} task(s) completed")
+    return 1 if failed else 0
+
+def read_task_file(path: str, priority: str) -> list:
+    """
+    Read tasks to add from a file ('-' for stdin).
+
+    Either a JSON list (of descriptions or {"description", "priority"}
+    objects) or plain text with one description per line; blank lines
+    and lines starting with # are skipped. List items that are neither
+    are returned as None, so they can be reported by position.
+    """
+    if path == '-':
+        content = sys.stdin.read()
+    else:
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+
+    if content.lstrip().startswith('['):
+        items = json.loads(content)
+        return [
+            {'description': item, 'priority': priority} if isinstance(item, str)
+            else {'priority': priority, **item} if isinstance(item, dict)
+            else None
+            for item in items
+        ]
+
+    return [
+        {'description': line.strip(), 'priority': priority}
+        for line in content.splitlines()
+        if line.strip() and not line.strip().startswith('#')
+    ]
+
+def add_batch(args) -> int:
+    """Add every task in --from-file, BATCH_SIZE tasks per request."""
+    try:
+        tasks = read_task_file(args.from_file, args.priority or 'medium')
+    except (OSError, ValueError) as e:
+        print(f"Error: could not read {args.from_file}: {e}")
+        return 1
+
+    if not tasks:
+        print("Error: no tasks found in file")
+        return 1
+
+    # (position in file, task), so results can be reported by position
+    numbered = [(number, task) for number, task in enumerate(tasks, 1) if task is not None]
+    created = 0
+    failed = len(tasks) - len(numbered)
+    for number, task in enumerate(tasks, 1):
+        if task is None:
+            print(f"❌ Task {number} in file: expected a description or an object")
+
+    for start in range(0, len(numbered), BATCH_SIZE):
+        chunk = numbered[start:start + BATCH_SIZE]
+        result = api_request('/api/tasks/batch', 'POST', {
+            'tasks': [task for _, task in chunk],
+            'submitted_by': f'CLI ({INSTANCE_NAME})'
+        })
+
+        if 'error' in result and 'results' not in result:
+            print(f"Error: {result['error']}")
+            return 1
+
+        for item in result.get('results', []):
+            if 'error' in item:
+                failed += 1
+                print(f"❌ Task {chunk[item['index']][0]} in file: {item['error']}")
+            else:
+                created += 1
+                print(f"✅ Task #{item['task_id']} created")
+
+    print(f"\n{created} task(s) created" + (f", {failed} skipped" if failed else ""))
+    return 1 if failed else 0
+
 def cmd_add(args):
-    """Add a new task."""
+    """Add a new task (or many with --from-file)."""
+    if args.from_file:
+        return add_batch(args)
+
     if not args.description:
         print("Error: description is required")
         return 1
@@ -275,6 +391,82 @@ def cmd_check(args):
     print()
     return 0
 
+def run_task(task: dict, command: str) -> int:
+    """Run a watch --exec command for a claimed task; returns its exit code."""
+    env = dict(os.environ, TASK_ID=str(task['id']), TASK_DESCRIPTION=task['description'],
+               TASK_PRIORITY=task.get('priority') or 'medium')
+    try:
+        return subprocess.run(command, shell=True, env=env).returncode
+    except OSError as e:
+        print(f"Error: could not run command: {e}")
+        return 1
+
+def cmd_watch(args):
+    """Wait for tasks via long-polling and claim each one as it arrives."""
+    wait = max(1, min(args.wait, 60))
+    query = urllib.parse.urlencode({
+        'wait': wait,
+        'claim': 1,
+        'instance_id': INSTANCE_ID,
+        'instance_name': INSTANCE_NAME
+    })
+
+    api_request('/api/instance/heartbeat', 'POST', {
+        'instance_id': INSTANCE_ID,
+        'instance_name': INSTANCE_NAME
+    })
+    print(f"👀 Watching for tasks as {INSTANCE_NAME} (Ctrl+C to stop)")
+
+    backoff = MIN_POLL_INTERVAL
+    try:
+        while True:
+            started = time.monotonic()
+            # The server holds the request until a task arrives or wait expires
+            result = api_request(f'/api/tasks/next?{query}', timeout=wait + 10)
+
+            if 'error' in result:
+                print(f"⚠️  {result['error']} - retrying in {backoff}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, MAX_BACKOFF)
+                continue
+            backoff = MIN_POLL_INTERVAL
+
+            task = result.get('task')
+            if not task:
+                # Servers without long-poll support answer at once; don't spin on them
+                elapsed = time.monotonic() - started
+                if elapsed < MIN_POLL_INTERVAL:
+                    time.sleep(MIN_POLL_INTERVAL - elapsed)
+                continue
+
+            if not result.get('claimed'):
+                claim = api_request(f"/api/tasks/{task['id']}/claim", 'POST', {
+                    'instance_id': INSTANCE_ID,
+                    'instance_name': INSTANCE_NAME
+                })
+                if 'error' in claim:
+                    continue
+
+            print(f"\n🔄 Claimed task #{task['id']}: {task['description']}")
+
+            if args.exec:
+                code = run_task(task, args.exec)
+                if code == 0:
+                    api_request(f"/api/tasks/{task['id']}/complete", 'POST', {
+                        'instance_id': INSTANCE_ID,
+                        'instance_name': INSTANCE_NAME,
+                        'notes': f'Completed by watch ({args.exec})'
+                    })
+                    print(f"✅ Task #{task['id']} completed")
+                else:
+                    print(f"❌ Command exited with {code}; task #{task['id']} left in progress")
+
+            if args.once:
+                return 0
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+        return 0
+
 # =============================================================================
 # Main
 # =============================================================================
@@ -290,10 +482,14 @@ Examples:
     %(prog)s claim 5                  Claim task #5
     %(prog)s complete 5               Mark task #5 as done
     %(prog)s complete 5 -n "notes"    Complete with notes
+    %(prog)s complete 5 6 7           Complete several tasks at once
     %(prog)s add "Deploy new service" Add a new task
     %(prog)s add "Fix bug" -p high    Add high priority task
+    %(prog)s add -f backlog.txt       Add one task per line of a file
     %(prog)s status                   Show queue statistics
     %(prog)s check                    Startup check (for hooks)
+    %(prog)s watch                    Claim tasks as soon as they are queued
+    %(prog)s watch -x ./run.sh        Run a command per task (TASK_ID set), complete on success
         """
     )
 
@@ -310,13 +506,16 @@ Examples:
     claim_parser.add_argument('task_id', type=int, help='Task ID to claim')
 
     # complete
-    complete_parser = subparsers.add_parser('complete', help='Complete a task')
-    complete_parser.add_argument('task_id', type=int, help='Task ID to complete')
+    complete_parser = subparsers.add_parser('complete', help='Complete one or more tasks')
+    complete_parser.add_argument('task_ids', type=int, nargs='+', metavar='task_id',
+                                 help='Task ID(s) to complete')
     complete_parser.add_argument('-n', '--notes', help='Completion notes')
 
     # add
     add_parser = subparsers.add_parser('add', help='Add a new task')
-    add_parser.add_argument('description', help='Task description')
+    add_parser.add_argument('description', nargs='?', help='Task description')
+    add_parser.add_argument('-f', '--from-file', metavar='FILE',
+                            help="Add one task per line of FILE (or a JSON list); '-' reads stdin")
     add_parser.add_argument('-p', '--priority', choices=['high', 'medium', 'low'],
                             default='medium', help='Task priority')
 
@@ -329,6 +528,14 @@ Examples:
     # check (for startup)
     subparsers.add_parser('check', help='Startup check for pending tasks')
 
+    # watch
+    watch_parser = subparsers.add_parser('watch', help='Wait for tasks and claim them as they arrive')
+    watch_parser.add_argument('-w', '--wait', type=int, default=WATCH_WAIT,
+                              help=f'Seconds each poll waits on the server (default: {WATCH_WAIT})')
+    watch_parser.add_argument('-x', '--exec', metavar='CMD',
+                              help='Command to run for each claimed task; completes the task on exit 0')
+    watch_parser.add_argument('--once', action='store_true', help='Exit after the first task')
+
     args = parser.parse_args()
 
     if not args.command:
@@ -343,7 +550,8 @@ Examples:
         'add': cmd_add,
         'status': cmd_status,
         'heartbeat': cmd_heartbeat,
-        'check': cmd_check
+        'check': cmd_check,
+        'watch': cmd_watch
     }
 
     cmd_func = commands.get(args.command)
@@ -7,14 +7,29 @@ Features:
 - Notifies when downloads start
 - Progress updates at 50%, 80%, 100%
 - Completion notification with Jellyfin link
+
+With SENTINEL_EVENTS_URL set, notifications follow Sentinel's download
+event stream instead of polling Radarr/Sonarr here.
+
+Everything runs on one asyncio loop: both queues are fetched concurrently
+over pooled keep-alive sessions, completion webhooks are served by aiohttp,
+and Discord messages go through a queue with its own sender task, so a
+slow or rate-limited Discord post never holds up polling or webhook intake.
 """
 
 import os
 import time
+import asyncio
 import logging
-import requests
 from datetime import datetime
-from typing import Dict, Set, Optional
+from typing import Any, Dict, Optional, Set
+
+import aiohttp
+from aiohttp import web
+
+from download_tracker import DownloadTracker
+from queue_reader import QueueReader
+from sentinel_events import follow_download_events
 
 # Configuration from environment
 RADARR_URL = os.getenv("RADARR_URL", "http://192.168.40.11:7878")
@@ -26,9 +41,23 @@ JELLYFIN_URL = os.getenv("JELLYFIN_URL", "https://jellyfin.hrmsmrflrii.xyz")
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "30"))  # seconds
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
+# Sentinel's event stream (e.g. http://192.168.40.14:5050/api/events)
+SENTINEL_EVENTS_URL = os.getenv("SENTINEL_EVENTS_URL", "")
+
 # Progress thresholds for notifications
 PROGRESS_THRESHOLDS = [50, 80, 100]
 
+# Webhook receiver port (health check and Radarr/Sonarr completions)
+WEBHOOK_PORT = 5052
+
+# Radarr/Sonarr API clients
+API_TIMEOUT = 10          # seconds per request
+API_MAX_CONNECTIONS = 4   # pooled keep-alive connections per service
+
+# Discord messages waiting to be sent; the oldest is dropped when full
+DISCORD_QUEUE_SIZE = 100
+DISCORD_MAX_ATTEMPTS = 3  # per message, when rate limited or failing
+
 # Logging setup
 logging.basicConfig(
     level=getattr(logging, LOG_LEVEL.upper()),
@@ -37,58 +66,71 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-class DownloadTracker:
-    """Tracks download progress and sent notifications."""
+class DiscordSender:
+    """Posts queued Discord webhook messages from a single background task."""
 
-    def __init__(self):
-        # Track which notifications have been sent: {download_id: set of milestones}
-        self.notified_milestones: Dict[str, Set[int]] = {}
-        # Track downloads we've seen start
-        self.known_downloads: Set[str] = set()
-        # Track completed downloads to avoid duplicate completion messages
-        self.completed_downloads: Set[str] = set()
+    def __init__(self, url: str):
+        self.url = url
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=DISCORD_QUEUE_SIZE)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._task: Optional[asyncio.Task] = None
 
-    def should_notify_start(self, download_id: str) -> bool:
-        """Check if we should send a start notification."""
-        if download_id not in self.known_downloads:
-            self.known_downloads.add(download_id)
-            self.notified_milestones[download_id] = set()
-            return True
-        return False
+    def start(self):
+        self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=API_TIMEOUT))
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10):
+        """Send what is still queued (up to timeout seconds), then stop."""
+        if self._task:
+            try:
+                await asyncio.wait_for(self.queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Dropping {self.queue.qsize()} unsent Discord notification(s)")
+            self._task.cancel()
+        if self._session:
+            await self._session.close()
+
+    def send(self, payload: dict):
+        """Queue a message without waiting for it to be posted."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.queue.task_done()
+            logger.warning("Discord queue full, dropped the oldest notification")
+        self.queue.put_nowait(payload)
+
+    async def _run(self):
+        while True:
+            payload = await self.queue.get()
+            try:
+                await self._post(payload)
+            finally:
+                self.queue.task_done()
+
+    async def _post(self, payload: dict):
+        title = payload["embeds"][0]["title"]
+        for attempt in range(DISCORD_MAX_ATTEMPTS):
+            try:
+                async with self._session.post(self.url, json=payload) as response:
+                    if response.status == 429:
+                        # Rate limited: Discord says how long to wait
+                        data = await response.json(content_type=None)
+                        await asyncio.sleep(float(data.get("retry_after", 1)))
+                        continue
+                    response.raise_for_status()
+                logger.info(f"Discord notification sent: {title}")
+                return
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.error(f"Failed to send Discord notification: {e or 'timeout'}")
+                await asyncio.sleep(2 ** attempt)
+        logger.error(f"Giving up on Discord notification: {title}")
 
-    def should_notify_progress(self, download_id: str, progress: float) -> Optional[int]:
-        """Check if we should send a progress notification. Returns threshold or None."""
-        if download_id not in self.notified_milestones:
-            self.notified_milestones[download_id] = set()
-
-        for threshold in PROGRESS_THRESHOLDS:
-            if progress >= threshold and threshold not in self.notified_milestones[download_id]:
-                self.notified_milestones[download_id].add(threshold)
-                return threshold
-        return None
-
-    def mark_completed(self, download_id: str) -> bool:
-        """Mark download as completed. Returns True if this is a new completion."""
-        if download_id not in self.completed_downloads:
-            self.completed_downloads.add(download_id)
-            # Clean up tracking data
-            self.known_downloads.discard(download_id)
-            self.notified_milestones.pop(download_id, None)
-            return True
-        return False
 
-    def cleanup_stale(self, active_ids: Set[str]):
-        """Remove tracking for downloads that are no longer active."""
-        stale_ids = self.known_downloads - active_ids - self.completed_downloads
-        for stale_id in stale_ids:
-            logger.debug(f"Cleaning up stale download: {stale_id}")
-            self.known_downloads.discard(stale_id)
-            self.notified_milestones.pop(stale_id, None)
+discord_sender = DiscordSender(DISCORD_WEBHOOK_URL)
 
 
 def send_discord_notification(title: str, description: str, color: int = 0x00ff00,
                               thumbnail_url: Optional[str] = None):
-    """Send a Discord embed notification."""
+    """Queue a Discord embed notification."""
     if not DISCORD_WEBHOOK_URL:
         logger.warning("Discord webhook URL not configured")
         return False
@@ -104,56 +146,64 @@ def send_discord_notification(title: str, description: str, color: int = 0x00ff0
     if thumbnail_url:
         embed["thumbnail"] = {"url": thumbnail_url}
 
-    payload = {"embeds": [embed]}
+    discord_sender.send({"embeds": [embed]})
+    return True
 
-    try:
-        response = requests.post(DISCORD_WEBHOOK_URL, json=payload, timeout=10)
-        response.raise_for_status()
-        logger.info(f"Discord notification sent: {title}")
-        return True
-    except requests.RequestException as e:
-        logger.error(f"Failed to send Discord notification: {e}")
-        return False
 
+class ServiceClient:
+    """Radarr/Sonarr API client with a pooled keep-alive session."""
+
+    def __init__(self, name: str, base_url: str, api_key: str):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=API_MAX_CONNECTIONS, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+                headers={"X-Api-Key": self.api_key},
+            )
+        return self._session
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, str]] = None) -> Optional[Any]:
+        """GET /api/v3/<endpoint>; returns decoded JSON, or None on failure."""
+        try:
+            async with self._get_session().get(f"{self.base_url}/api/v3/{endpoint}", params=params) as response:
+                response.raise_for_status()
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Failed to fetch {self.name} {endpoint}: {e or 'timeout'}")
+            return None
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+radarr = ServiceClient("Radarr", RADARR_URL, RADARR_API_KEY)
+sonarr = ServiceClient("Sonarr", SONARR_URL, SONARR_API_KEY)
+
+# Paged queue reads with cached movie/series/episode details
+queues = {"radarr": QueueReader("radarr", radarr.get), "sonarr": QueueReader("sonarr", sonarr.get)}
 
-def get_radarr_queue() -> list:
-    """Fetch current download queue from Radarr."""
+
+async def get_radarr_queue() -> Optional[list]:
+    """Fetch current download queue from Radarr (None if the request failed)."""
     if not RADARR_API_KEY:
         return []
 
-    try:
-        response = requests.get(
-            f"{RADARR_URL}/api/v3/queue",
-            headers={"X-Api-Key": RADARR_API_KEY},
-            params={"includeMovie": "true"},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data.get("records", [])
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch Radarr queue: {e}")
-        return []
+    return await queues["radarr"].read()
 
 
-def get_sonarr_queue() -> list:
-    """Fetch current download queue from Sonarr."""
+async def get_sonarr_queue() -> Optional[list]:
+    """Fetch current download queue from Sonarr (None if the request failed)."""
     if not SONARR_API_KEY:
         return []
 
-    try:
-        response = requests.get(
-            f"{SONARR_URL}/api/v3/queue",
-            headers={"X-Api-Key": SONARR_API_KEY},
-            params={"includeSeries": "true", "includeEpisode": "true"},
-            timeout=10
-        )
-        response.raise_for_status()
-        data = response.json()
-        return data.get("records", [])
-    except requests.RequestException as e:
-        logger.error(f"Failed to fetch Sonarr queue: {e}")
-        return []
+    return await queues["sonarr"].read()
 
 
 def get_movie_poster(movie: dict) -> Optional[str]:
@@ -195,9 +245,8 @@ def format_size(bytes_size: int) -> str:
     return f"{bytes_size:.1f} PB"
 
 
-def process_radarr_downloads(tracker: DownloadTracker):
-    """Process Radarr download queue and send notifications."""
-    queue = get_radarr_queue()
+def process_radarr_downloads(tracker: DownloadTracker, queue: list) -> Set[str]:
+    """Send notifications for the Radarr download queue; returns the active IDs."""
     active_ids = set()
 
     for item in queue:
@@ -239,13 +288,11 @@ def process_radarr_downloads(tracker: DownloadTracker):
                     thumbnail_url=poster
                 )
 
-    tracker.cleanup_stale(active_ids)
     return active_ids
 
 
-def process_sonarr_downloads(tracker: DownloadTracker):
-    """Process Sonarr download queue and send notifications."""
-    queue = get_sonarr_queue()
+def process_sonarr_downloads(tracker: DownloadTracker, queue: list) -> Set[str]:
+    """Send notifications for the Sonarr download queue; returns the active IDs."""
     active_ids = set()
 
     for item in queue:
@@ -293,35 +340,84 @@ def process_sonarr_downloads(tracker: DownloadTracker):
                     thumbnail_url=poster
                 )
 
-    tracker.cleanup_stale(active_ids)
     return active_ids
 
 
-def check_completed_downloads(tracker: DownloadTracker, prev_radarr: Set[str], prev_sonarr: Set[str]):
-    """Check for downloads that completed (disappeared from queue)."""
-    current_radarr = set()
-    current_sonarr = set()
+def check_completed_downloads(tracker: DownloadTracker, prefix: str, active_ids: Set[str]):
+    """Mark tracked downloads that left the queue as completed."""
+    # The completion notification itself comes from the Radarr/Sonarr webhook
+    finished = {i for i in tracker.known_downloads if i.startswith(prefix)} - active_ids
+    for download_id in finished:
+        if tracker.mark_completed(download_id) is not None:
+            logger.info(f"Download left the queue: {download_id}")
 
-    # Get current queue items
-    for item in get_radarr_queue():
-        current_radarr.add(f"radarr_{item.get('id')}")
 
-    for item in get_sonarr_queue():
-        current_sonarr.add(f"sonarr_{item.get('id')}")
+async def poll_downloads(tracker: DownloadTracker):
+    """Fetch both queues concurrently and send notifications for them."""
+    radarr_queue, sonarr_queue = await asyncio.gather(get_radarr_queue(), get_sonarr_queue())
 
-    # Find completed Radarr downloads
-    completed_radarr = prev_radarr - current_radarr
-    for download_id in completed_radarr:
-        if download_id in tracker.known_downloads and tracker.mark_completed(download_id):
-            # We don't have the movie info anymore, but we can send a generic completion
-            # In a more sophisticated setup, we'd cache the movie info
-            logger.info(f"Radarr download completed: {download_id}")
+    # A failed fetch leaves that service's tracking untouched
+    if radarr_queue is not None:
+        check_completed_downloads(tracker, "radarr_", process_radarr_downloads(tracker, radarr_queue))
+    if sonarr_queue is not None:
+        check_completed_downloads(tracker, "sonarr_", process_sonarr_downloads(tracker, sonarr_queue))
 
-    # Find completed Sonarr downloads
-    completed_sonarr = prev_sonarr - current_sonarr
-    for download_id in completed_sonarr:
-        if download_id in tracker.known_downloads and tracker.mark_completed(download_id):
-            logger.info(f"Sonarr download completed: {download_id}")
+
+async def monitor_downloads(tracker: DownloadTracker):
+    """Poll every POLL_INTERVAL seconds, measured from the start of each poll."""
+    while True:
+        started = time.monotonic()
+        try:
+            await poll_downloads(tracker)
+        except Exception as e:
+            logger.error(f"Error in monitoring loop: {e}")
+        finally:
+            tracker.flush()
+
+        await asyncio.sleep(max(0.0, POLL_INTERVAL - (time.monotonic() - started)))
+
+
+async def notify_download_event(event: dict):
+    """Send the Discord notification for a Sentinel download event."""
+    kind = event.get("kind")
+    title = event.get("title", "Unknown")
+    poster = event.get("poster")
+
+    if kind == "grabbed":
+        heading = "New Download Started" if event.get("media_type") == "movie" else "New Episode Downloading"
+        send_discord_notification(
+            title=heading,
+            description=f"Hey Master Hermes, **{title}** is now downloading.\n\n"
+                       f"**Size:** {format_size(event.get('size') or 0)}\n"
+                       f"**Quality:** {event.get('quality') or 'Unknown'}",
+            color=0x3498db,  # Blue
+            thumbnail_url=poster
+        )
+    elif kind == "progress":
+        send_discord_notification(
+            title=f"Download Progress: {event.get('milestone')}%",
+            description=f"**{title}** is {event.get('milestone')}% complete.\n\n"
+                       f"**ETA:** {event.get('timeleft') or 'Unknown'}",
+            color=0xf39c12,  # Orange
+            thumbnail_url=poster
+        )
+    elif kind == "imported":
+        jellyfin_link = f"{JELLYFIN_URL}/web/index.html#!/search.html?query={title.replace(' ', '%20')}"
+        send_discord_notification(
+            title="Download Complete!" if event.get("media_type") == "movie" else "Episode Downloaded!",
+            description=f"**{title}** has finished downloading!\n\n"
+                       f"Watch it now at **[Jellyfin]({jellyfin_link})**",
+            color=0x2ecc71,  # Green
+            thumbnail_url=poster
+        )
+    elif kind == "failed":
+        send_discord_notification(
+            title="Download Failed",
+            description=f"**{title}** could not be downloaded.\n\n"
+                       f"**Reason:** {event.get('reason') or 'Unknown'}",
+            color=0xe74c3c,  # Red
+            thumbnail_url=poster
+        )
 
 
 def setup_completion_webhooks():
@@ -343,167 +439,144 @@ def setup_completion_webhooks():
     pass
 
 
-def run_webhook_server():
-    """Run a simple webhook server for completion notifications from Radarr/Sonarr."""
-    from http.server import HTTPServer, BaseHTTPRequestHandler
-    import json
-    import threading
-
-    class WebhookHandler(BaseHTTPRequestHandler):
-        def do_GET(self):
-            """Handle GET requests for health checks."""
-            if self.path == "/health":
-                self.send_response(200)
-                self.send_header("Content-Type", "text/plain")
-                self.end_headers()
-                self.wfile.write(b"OK")
-            else:
-                self.send_response(404)
-                self.end_headers()
-
-        def do_POST(self):
-            content_length = int(self.headers.get('Content-Length', 0))
-            body = self.rfile.read(content_length)
+def handle_radarr_completion(data: dict):
+    """Handle Radarr download completion webhook."""
+    event_type = data.get("eventType", "")
+    if event_type != "Download":
+        return
 
-            try:
-                data = json.loads(body) if body else {}
-            except json.JSONDecodeError:
-                data = {}
-
-            if self.path == "/radarr/completed":
-                self.handle_radarr_completion(data)
-            elif self.path == "/sonarr/completed":
-                self.handle_sonarr_completion(data)
-            elif self.path == "/health":
-                pass  # Health check
-
-            self.send_response(200)
-            self.end_headers()
-
-        def handle_radarr_completion(self, data):
-            """Handle Radarr download completion webhook."""
-            event_type = data.get("eventType", "")
-            if event_type != "Download":
-                return
+    movie = data.get("movie", {})
+    title = movie.get("title", "Unknown Movie")
+    year = movie.get("year", "")
+    full_title = f"{title} ({year})" if year else title
 
-            movie = data.get("movie", {})
-            title = movie.get("title", "Unknown Movie")
-            year = movie.get("year", "")
-            full_title = f"{title} ({year})" if year else title
-
-            # Get movie ID for Jellyfin link (if available)
-            tmdb_id = movie.get("tmdbId", "")
-            jellyfin_link = JELLYFIN_URL
-            if tmdb_id:
-                # Jellyfin search link
-                jellyfin_link = f"{JELLYFIN_URL}/web/index.html#!/search.html?query={title.replace(' ', '%20')}"
-
-            # Get poster
-            images = movie.get("images", [])
-            poster = None
-            for img in images:
-                if img.get("coverType") == "poster":
-                    poster = img.get("remoteUrl")
-                    break
+    # Get movie ID for Jellyfin link (if available)
+    tmdb_id = movie.get("tmdbId", "")
+    jellyfin_link = JELLYFIN_URL
+    if tmdb_id:
+        # Jellyfin search link
+        jellyfin_link = f"{JELLYFIN_URL}/web/index.html#!/search.html?query={title.replace(' ', '%20')}"
 
-            send_discord_notification(
-                title="Download Complete!",
-                description=f"**{full_title}** has finished downloading!\n\n"
-                           f"Watch it now at **[Jellyfin]({jellyfin_link})**",
-                color=0x2ecc71,  # Green
-                thumbnail_url=poster
-            )
+    send_discord_notification(
+        title="Download Complete!",
+        description=f"**{full_title}** has finished downloading!\n\n"
+                   f"Watch it now at **[Jellyfin]({jellyfin_link})**",
+        color=0x2ecc71,  # Green
+        thumbnail_url=get_movie_poster(movie)
+    )
 
-        def handle_sonarr_completion(self, data):
-            """Handle Sonarr download completion webhook."""
-            event_type = data.get("eventType", "")
-            if event_type != "Download":
-                return
 
-            series = data.get("series", {})
-            episodes = data.get("episodes", [{}])
-            episode = episodes[0] if episodes else {}
+def handle_sonarr_completion(data: dict):
+    """Handle Sonarr download completion webhook."""
+    event_type = data.get("eventType", "")
+    if event_type != "Download":
+        return
 
-            series_title = series.get("title", "Unknown Series")
-            season = episode.get("seasonNumber", 0)
-            ep_num = episode.get("episodeNumber", 0)
-            ep_title = episode.get("title", "")
+    series = data.get("series", {})
+    episodes = data.get("episodes", [{}])
+    episode = episodes[0] if episodes else {}
 
-            full_title = f"{series_title} - S{season:02d}E{ep_num:02d}"
-            if ep_title:
-                full_title += f" - {ep_title}"
+    series_title = series.get("title", "Unknown Series")
+    season = episode.get("seasonNumber", 0)
+    ep_num = episode.get("episodeNumber", 0)
+    ep_title = episode.get("title", "")
 
-            jellyfin_link = f"{JELLYFIN_URL}/web/index.html#!/search.html?query={series_title.replace(' ', '%20')}"
+    full_title = f"{series_title} - S{season:02d}E{ep_num:02d}"
+    if ep_title:
+        full_title += f" - {ep_title}"
 
-            # Get poster
-            images = series.get("images", [])
-            poster = None
-            for img in images:
-                if img.get("coverType") == "poster":
-                    poster = img.get("remoteUrl")
-                    break
+    jellyfin_link = f"{JELLYFIN_URL}/web/index.html#!/search.html?query={series_title.replace(' ', '%20')}"
 
-            send_discord_notification(
-                title="Episode Downloaded!",
-                description=f"**{full_title}** has finished downloading!\n\n"
-                           f"Watch it now at **[Jellyfin]({jellyfin_link})**",
-                color=0x2ecc71,  # Green
-                thumbnail_url=poster
-            )
+    send_discord_notification(
+        title="Episode Downloaded!",
+        description=f"**{full_title}** has finished downloading!\n\n"
+                   f"Watch it now at **[Jellyfin]({jellyfin_link})**",
+        color=0x2ecc71,  # Green
+        thumbnail_url=get_series_poster(series)
+    )
 
-        def log_message(self, format, *args):
-            logger.debug(f"Webhook: {args[0]}")
 
-    server = HTTPServer(("0.0.0.0", 5052), WebhookHandler)
-    thread = threading.Thread(target=server.serve_forever, daemon=True)
-    thread.start()
-    logger.info("Webhook server started on port 5052")
-    return server
+def completion_route(handler):
+    """Wrap a completion handler as a webhook endpoint that answers immediately."""
+    async def route(request: web.Request) -> web.Response:
+        try:
+            data = await request.json() if request.can_read_body else {}
+        except ValueError:
+            data = {}
 
+        # In Sentinel mode completions arrive through Sentinel's event stream
+        if not SENTINEL_EVENTS_URL and isinstance(data, dict):
+            handler(data)
+        return web.Response(status=200)
+    return route
 
-def main():
-    """Main monitoring loop."""
-    logger.info("Starting Media Download Monitor")
-    logger.info(f"Radarr URL: {RADARR_URL}")
-    logger.info(f"Sonarr URL: {SONARR_URL}")
-    logger.info(f"Jellyfin URL: {JELLYFIN_URL}")
-    logger.info(f"Poll interval: {POLL_INTERVAL}s")
-    logger.info(f"Progress thresholds: {PROGRESS_THRESHOLDS}")
 
-    if not DISCORD_WEBHOOK_URL:
-        logger.error("DISCORD_WEBHOOK_URL not set! Notifications will not be sent.")
+async def health(request: web.Request) -> web.Response:
+    """Health check."""
+    return web.Response(text="OK")
 
-    # Start webhook server for completion notifications
-    webhook_server = run_webhook_server()
 
-    # Send startup notification
-    send_discord_notification(
-        title="Download Monitor Online",
-        description="Media download monitor is now active and watching for new downloads.",
-        color=0x9b59b6  # Purple
-    )
+async def run_webhook_server() -> web.AppRunner:
+    """Start the webhook server for completion notifications from Radarr/Sonarr."""
+    app = web.Application()
+    app.router.add_get("/health", health)
+    app.router.add_post("/health", health)
+    app.router.add_post("/radarr/completed", completion_route(handle_radarr_completion))
+    app.router.add_post("/sonarr/completed", completion_route(handle_sonarr_completion))
 
-    tracker = DownloadTracker()
-    prev_radarr_ids: Set[str] = set()
-    prev_sonarr_ids: Set[str] = set()
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "0.0.0.0", WEBHOOK_PORT).start()
+    logger.info(f"Webhook server started on port {WEBHOOK_PORT}")
+    return runner
 
-    while True:
-        try:
-            # Process downloads and get current active IDs
-            radarr_ids = process_radarr_downloads(tracker)
-            sonarr_ids = process_sonarr_downloads(tracker)
 
-            # Check for completions (items that disappeared from queue)
-            # Note: Webhook-based completion is more reliable
-            check_completed_downloads(tracker, prev_radarr_ids, prev_sonarr_ids)
+async def run():
+    """Start the sender and webhook server, then follow events or poll the queues."""
+    discord_sender.start()
+    webhook_server = await run_webhook_server()
+    tracker = None
 
-            prev_radarr_ids = radarr_ids
-            prev_sonarr_ids = sonarr_ids
+    try:
+        # Send startup notification
+        send_discord_notification(
+            title="Download Monitor Online",
+            description="Media download monitor is now active and watching for new downloads.",
+            color=0x9b59b6  # Purple
+        )
+
+        if SENTINEL_EVENTS_URL:
+            await follow_download_events(SENTINEL_EVENTS_URL, notify_download_event)
+        else:
+            tracker = DownloadTracker(thresholds=PROGRESS_THRESHOLDS)
+            await monitor_downloads(tracker)
+    finally:
+        await webhook_server.cleanup()
+        await discord_sender.stop()
+        await asyncio.gather(radarr.close(), sonarr.close())
+        if tracker:
+            tracker.close()
 
-        except Exception as e:
-            logger.error(f"Error in monitoring loop: {e}")
 
-        time.sleep(POLL_INTERVAL)
+def main():
+    """Main entry point."""
+    logger.info("Starting Media Download Monitor")
+    logger.info(f"Radarr URL: {RADARR_URL}")
+    logger.info(f"Sonarr URL: {SONARR_URL}")
+    logger.info(f"Jellyfin URL: {JELLYFIN_URL}")
+    if SENTINEL_EVENTS_URL:
+        logger.info(f"Sentinel events: {SENTINEL_EVENTS_URL}")
+    else:
+        logger.info(f"Poll interval: {POLL_INTERVAL}s")
+        logger.info(f"Progress thresholds: {PROGRESS_THRESHOLDS}")
+
+    if not DISCORD_WEBHOOK_URL:
+        logger.error("DISCORD_WEBHOOK_URL not set! Notifications will not be sent.")
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,184 @@
+"""
+Download Tracker
+Notification state shared by the media download bots (download-monitor
+and Mnemosyne).
+
+Which downloads were announced, which progress milestones were sent and
+which downloads completed live in memory for the poll loops and in a
+SQLite file, so a restarted bot resumes where it left off instead of
+re-announcing its whole queue. Changes are written through to a dirty
+set and stored by flush(), one transaction per poll cycle.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Optional, Dict, Set, Iterable
+
+# SQLite file; keep it on a volume so it survives container rebuilds
+TRACKER_DB = os.getenv("TRACKER_DB", "data/download-tracker.db")
+
+# Pending changes that force a flush before the end of the cycle
+FLUSH_BATCH = 50
+
+# Completed downloads are remembered this long (seconds) to drop late duplicates
+COMPLETED_RETENTION = 7 * 86400
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    download_id TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL DEFAULT 0,
+    milestones TEXT NOT NULL DEFAULT '[]',
+    info TEXT NOT NULL DEFAULT '{}',
+    updated_at REAL NOT NULL
+)
+"""
+
+
+class DownloadTracker:
+    """Tracks download progress and sent notifications, durably."""
+
+    def __init__(self, path: str = TRACKER_DB, thresholds: Iterable[int] = (50, 80, 100)):
+        self.path = path
+        self.thresholds = sorted(thresholds)
+        # Track which notifications have been sent: {download_id: set of milestones}
+        self.notified_milestones: Dict[str, Set[int]] = {}
+        # Track downloads we've seen start
+        self.known_downloads: Set[str] = set()
+        # Completed downloads and when they completed, to avoid duplicate messages
+        self.completed_downloads: Dict[str, float] = {}
+        # Info stored with the start notification, for the completion message
+        self.download_info: Dict[str, dict] = {}
+
+        self._dirty: Set[str] = set()
+        self._db = self._connect()
+        self._load()
+
+    # === Storage ===
+    def _connect(self) -> sqlite3.Connection:
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(SCHEMA)
+            db.commit()
+            return db
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Download tracker cannot use {self.path} ({e}); state will not survive restarts")
+            db = sqlite3.connect(":memory:")
+            db.execute(SCHEMA)
+            return db
+
+    def _load(self):
+        cutoff = time.time() - COMPLETED_RETENTION
+        with self._db:
+            self._db.execute("DELETE FROM downloads WHERE completed = 1 AND updated_at < ?", (cutoff,))
+        rows = self._db.execute(
+            "SELECT download_id, completed, milestones, info, updated_at FROM downloads"
+        ).fetchall()
+
+        for download_id, completed, milestones, info, updated_at in rows:
+            if completed:
+                self.completed_downloads[download_id] = updated_at
+                continue
+            self.known_downloads.add(download_id)
+            self.notified_milestones[download_id] = set(json.loads(milestones))
+            self.download_info[download_id] = json.loads(info)
+
+        if self.known_downloads:
+            logger.info(f"Resuming {len(self.known_downloads)} tracked download(s) from {self.path}")
+
+    def _touch(self, download_id: str):
+        self._dirty.add(download_id)
+        if len(self._dirty) >= FLUSH_BATCH:
+            self.flush()
+
+    def flush(self):
+        """Write the changes made since the last flush in one transaction."""
+        if not self._dirty:
+            return
+        now = time.time()
+        upserts = []
+        deletes = []
+        for download_id in self._dirty:
+            if download_id in self.known_downloads:
+                upserts.append((
+                    download_id, 0,
+                    json.dumps(sorted(self.notified_milestones.get(download_id, ()))),
+                    json.dumps(self.download_info.get(download_id) or {}),
+                    now
+                ))
+            elif download_id in self.completed_downloads:
+                upserts.append((download_id, 1, "[]", "{}", self.completed_downloads[download_id]))
+            else:
+                deletes.append((download_id,))
+
+        try:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO downloads (download_id, completed, milestones, info, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    upserts
+                )
+                self._db.executemany("DELETE FROM downloads WHERE download_id = ?", deletes)
+        except sqlite3.Error as e:
+            # Keep the changes pending; the next flush retries them
+            logger.error(f"Download tracker flush failed: {e}")
+            return
+        self._dirty.clear()
+
+    def close(self):
+        """Flush pending changes and close the database."""
+        self.flush()
+        self._db.close()
+
+    # === Tracking ===
+    def should_notify_start(self, download_id: str, info: Optional[dict] = None) -> bool:
+        """Check if we should send a start notification."""
+        if download_id in self.known_downloads or download_id in self.completed_downloads:
+            return False
+        self.known_downloads.add(download_id)
+        self.notified_milestones[download_id] = set()
+        self.download_info[download_id] = info or {}
+        self._touch(download_id)
+        return True
+
+    def should_notify_progress(self, download_id: str, progress: float) -> Optional[int]:
+        """Check if we should send a progress notification. Returns threshold or None."""
+        milestones = self.notified_milestones.setdefault(download_id, set())
+
+        for threshold in self.thresholds:
+            if progress >= threshold and threshold not in milestones:
+                milestones.add(threshold)
+                self._touch(download_id)
+                return threshold
+        return None
+
+    def mark_completed(self, download_id: str) -> Optional[dict]:
+        """Mark download as completed. Returns its start info if this is a new completion, else None."""
+        if download_id in self.completed_downloads:
+            return None
+        self.completed_downloads[download_id] = time.time()
+        info = self.download_info.pop(download_id, None) or {}
+        # Clean up tracking data
+        self.known_downloads.discard(download_id)
+        self.notified_milestones.pop(download_id, None)
+        self._touch(download_id)
+        return info
+
+    def cleanup_stale(self, active_ids: Set[str], prefix: str = ""):
+        """Remove tracking for downloads starting with prefix that are no longer active."""
+        stale_ids = {i for i in self.known_downloads if i.startswith(prefix)} - active_ids
+        for stale_id in stale_ids:
+            logger.debug(f"Cleaning up stale download: {stale_id}")
+            self.known_downloads.discard(stale_id)
+            self.notified_milestones.pop(stale_id, None)
+            self.download_info.pop(stale_id, None)
+            self._touch(stale_id)
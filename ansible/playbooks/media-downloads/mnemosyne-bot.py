@@ -4,7 +4,8 @@ Mnemosyne - Media Download Discord Bot
 Goddess of Memory - Tracks and manages your media downloads.
 
 Features:
-- Real-time download notifications (50%, 80%, 100% progress)
+- Real-time download notifications (50%, 80%, 100% progress), from
+  Sentinel's download event stream when SENTINEL_EVENTS_URL is set
 - Slash commands for media management
 - Radarr/Sonarr integration
 - Quality profile management
@@ -20,19 +21,28 @@ Commands:
   /stats           - Library statistics
   /recent          - Recent downloads
   /quality         - View quality profiles
+  /apistats        - Radarr/Sonarr API latency and retries
   /mnemosyne       - Show help
 """
 
 import os
+import time
+import random
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Set, List
+from typing import Optional, List
 import discord
 from discord import app_commands
 from discord.ext import commands, tasks
 import aiohttp
 
+from download_tracker import DownloadTracker
+from queue_reader import QueueReader
+from library_index import LibraryIndex
+from sentinel_events import follow_download_events
+
 # === Configuration ===
 DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 MEDIA_CHANNEL_ID = int(os.getenv("MEDIA_CHANNEL_ID", "0"))
@@ -51,6 +61,18 @@ JELLYFIN_URL = os.getenv("JELLYFIN_URL", "https://jellyfin.hrmsmrflrii.xyz")
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL", "60"))  # seconds
 PROGRESS_THRESHOLDS = [50, 80, 100]
 
+# Sentinel's event stream (e.g. http://192.168.40.14:5050/api/events). When set,
+# notifications come from Sentinel's download events and the queues are not
+# polled here.
+SENTINEL_EVENTS_URL = os.getenv("SENTINEL_EVENTS_URL", "")
+
+# Radarr/Sonarr API clients
+API_TIMEOUT = 10            # seconds per request
+API_RETRIES = 2             # extra attempts for failed GETs
+API_RETRY_BACKOFF = 0.5     # seconds, doubled per attempt with full jitter
+API_MAX_CONNECTIONS = 8     # pooled keep-alive connections per service
+API_LATENCY_SAMPLES = 500   # latencies kept for the percentiles
+
 # Logging
 logging.basicConfig(
     level=logging.INFO,
@@ -106,51 +128,7 @@ def is_allowed_channel():
 
 
 # === Download Tracker ===
-class DownloadTracker:
-    """Tracks download progress and sent notifications."""
-
-    def __init__(self):
-        self.notified_milestones: Dict[str, Set[int]] = {}
-        self.known_downloads: Set[str] = set()
-        self.completed_downloads: Set[str] = set()
-        self.download_info: Dict[str, dict] = {}  # Store info for notifications
-
-    def should_notify_start(self, download_id: str, info: dict) -> bool:
-        if download_id not in self.known_downloads:
-            self.known_downloads.add(download_id)
-            self.notified_milestones[download_id] = set()
-            self.download_info[download_id] = info
-            return True
-        return False
-
-    def should_notify_progress(self, download_id: str, progress: float) -> Optional[int]:
-        if download_id not in self.notified_milestones:
-            self.notified_milestones[download_id] = set()
-
-        for threshold in PROGRESS_THRESHOLDS:
-            if progress >= threshold and threshold not in self.notified_milestones[download_id]:
-                self.notified_milestones[download_id].add(threshold)
-                return threshold
-        return None
-
-    def mark_completed(self, download_id: str) -> Optional[dict]:
-        if download_id not in self.completed_downloads:
-            self.completed_downloads.add(download_id)
-            info = self.download_info.pop(download_id, None)
-            self.known_downloads.discard(download_id)
-            self.notified_milestones.pop(download_id, None)
-            return info
-        return None
-
-    def cleanup_stale(self, active_ids: Set[str]):
-        stale_ids = self.known_downloads - active_ids - self.completed_downloads
-        for stale_id in stale_ids:
-            self.known_downloads.discard(stale_id)
-            self.notified_milestones.pop(stale_id, None)
-            self.download_info.pop(stale_id, None)
-
-
-tracker = DownloadTracker()
+tracker = DownloadTracker(thresholds=PROGRESS_THRESHOLDS)
 
 
 # === Helper Functions ===
@@ -187,87 +165,158 @@ intents = discord.Intents.default()
 bot = commands.Bot(command_prefix="!", intents=intents)
 
 
+# === API Clients ===
+class ServiceClient:
+    """
+    Long-lived HTTP client for one Radarr/Sonarr instance.
+
+    Keeps a pooled keep-alive session, retries GETs on timeouts, connection
+    errors and 5xx responses with jittered backoff, and records request
+    latencies for /apistats.
+    """
+
+    def __init__(self, name: str, base_url: str, api_key: str):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        # Metrics
+        self.latencies: deque = deque(maxlen=API_LATENCY_SAMPLES)
+        self.counters = {"requests": 0, "errors": 0, "retries": 0}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=API_MAX_CONNECTIONS,
+                    keepalive_timeout=60,
+                    ttl_dns_cache=300
+                ),
+                headers={"X-Api-Key": self.api_key, "Accept-Encoding": "gzip, deflate"},
+                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT)
+            )
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def request(self, method: str, endpoint: str, params: dict = None, data: dict = None):
+        """
+        Call /api/v3/<endpoint> and return the decoded JSON, or None on failure.
+
+        POSTs are only retried when the connection could not be opened, so a
+        request is never applied twice.
+        """
+        if not self.api_key:
+            return None
+
+        url = f"{self.base_url}/api/v3/{endpoint}"
+        for attempt in range(API_RETRIES + 1):
+            if attempt:
+                self.counters["retries"] += 1
+                await asyncio.sleep(random.uniform(0, API_RETRY_BACKOFF * 2 ** attempt))
+
+            self.counters["requests"] += 1
+            started = time.monotonic()
+            retryable = False
+            try:
+                async with self._get_session().request(method, url, params=params, json=data) as resp:
+                    if resp.status in (200, 201):
+                        return await resp.json()
+                    text = await resp.text()
+                    logger.error(f"{self.name} {method} {endpoint} failed: {resp.status} - {text[:200]}")
+                    retryable = method == "GET" and resp.status >= 500
+            except aiohttp.ClientConnectorError as e:
+                logger.error(f"{self.name} API error: {e}")
+                retryable = True
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"{self.name} API error: {e or 'timeout'}")
+                retryable = method == "GET"
+            finally:
+                self.latencies.append(time.monotonic() - started)
+
+            self.counters["errors"] += 1
+            if not retryable:
+                break
+        return None
+
+    async def get(self, endpoint: str, params: dict = None):
+        return await self.request("GET", endpoint, params=params)
+
+    async def post(self, endpoint: str, data: dict):
+        return await self.request("POST", endpoint, data=data)
+
+    def stats(self) -> dict:
+        """Request counters and latency percentiles (ms)."""
+        latencies = sorted(self.latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            **self.counters,
+            "avg": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "max": round(latencies[-1] * 1000, 1) if latencies else None,
+        }
+
+
+radarr = ServiceClient("Radarr", RADARR_URL, RADARR_API_KEY)
+sonarr = ServiceClient("Sonarr", SONARR_URL, SONARR_API_KEY)
+
+# Paged queue reads with cached movie/series/episode details
+queues = {"radarr": QueueReader("radarr", radarr.get), "sonarr": QueueReader("sonarr", sonarr.get)}
+
+
 # === API Helpers ===
 async def fetch_radarr(endpoint: str, params: dict = None) -> Optional[dict]:
     """Fetch data from Radarr API."""
-    if not RADARR_API_KEY:
-        return None
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{RADARR_URL}/api/v3/{endpoint}",
-                headers={"X-Api-Key": RADARR_API_KEY},
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-    except Exception as e:
-        logger.error(f"Radarr API error: {e}")
-    return None
+    return await radarr.get(endpoint, params)
 
 
 async def fetch_sonarr(endpoint: str, params: dict = None) -> Optional[dict]:
     """Fetch data from Sonarr API."""
-    if not SONARR_API_KEY:
-        return None
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                f"{SONARR_URL}/api/v3/{endpoint}",
-                headers={"X-Api-Key": SONARR_API_KEY},
-                params=params,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-    except Exception as e:
-        logger.error(f"Sonarr API error: {e}")
-    return None
+    return await sonarr.get(endpoint, params)
 
 
 async def post_radarr(endpoint: str, data: dict) -> Optional[dict]:
     """POST data to Radarr API."""
-    if not RADARR_API_KEY:
-        return None
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{RADARR_URL}/api/v3/{endpoint}",
-                headers={"X-Api-Key": RADARR_API_KEY},
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status in [200, 201]:
-                    return await resp.json()
-                else:
-                    text = await resp.text()
-                    logger.error(f"Radarr POST error: {resp.status} - {text}")
-    except Exception as e:
-        logger.error(f"Radarr POST error: {e}")
-    return None
+    return await radarr.post(endpoint, data)
 
 
 async def post_sonarr(endpoint: str, data: dict) -> Optional[dict]:
     """POST data to Sonarr API."""
-    if not SONARR_API_KEY:
-        return None
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"{SONARR_URL}/api/v3/{endpoint}",
-                headers={"X-Api-Key": SONARR_API_KEY},
-                json=data,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status in [200, 201]:
-                    return await resp.json()
-                else:
-                    text = await resp.text()
-                    logger.error(f"Sonarr POST error: {resp.status} - {text}")
-    except Exception as e:
-        logger.error(f"Sonarr POST error: {e}")
-    return None
+    return await sonarr.post(endpoint, data)
+
+
+# === Library Index ===
+async def arr_get(service: str, endpoint: str, params: dict = None):
+    """GET from Radarr or Sonarr by service name, for the library index."""
+    return await (radarr if service == "radarr" else sonarr).get(endpoint, params)
+
+
+# Movies and series held in memory; commands page through title-sorted views
+library = LibraryIndex(arr_get)
+
+
+def add_chunked_fields(embed: discord.Embed, name: str, lines: List[str]):
+    """Add lines to an embed as fields of at most ~1000 characters each."""
+    chunks = [[]]
+    length = 0
+    for line in lines:
+        if chunks[-1] and length + len(line) + 1 > 1000:
+            chunks.append([])
+            length = 0
+        chunks[-1].append(line)
+        length += len(line) + 1
+    for number, chunk in enumerate(chunks, 1):
+        if chunk:
+            embed.add_field(name=f"{name} {number}" if number > 1 else name, value="\n".join(chunk), inline=False)
 
 
 # === Slash Commands ===
@@ -281,9 +330,9 @@ async def downloads_command(interaction: discord.Interaction):
     embed = create_embed("Current Downloads", color=0x3498db)
 
     # Radarr queue
-    radarr_queue = await fetch_radarr("queue", {"includeMovie": "true"})
-    if radarr_queue:
-        records = radarr_queue.get("records", [])
+    radarr_queue = await queues["radarr"].read()
+    if radarr_queue is not None:
+        records = radarr_queue
         if records:
             movie_list = []
             for item in records[:5]:
@@ -302,9 +351,9 @@ async def downloads_command(interaction: discord.Interaction):
             embed.add_field(name="Movies", value="No active downloads", inline=False)
 
     # Sonarr queue
-    sonarr_queue = await fetch_sonarr("queue", {"includeSeries": "true", "includeEpisode": "true"})
-    if sonarr_queue:
-        records = sonarr_queue.get("records", [])
+    sonarr_queue = await queues["sonarr"].read()
+    if sonarr_queue is not None:
+        records = sonarr_queue
         if records:
             episode_list = []
             for item in records[:5]:
@@ -324,7 +373,7 @@ async def downloads_command(interaction: discord.Interaction):
         else:
             embed.add_field(name="TV Episodes", value="No active downloads", inline=False)
 
-    if not radarr_queue and not sonarr_queue:
+    if radarr_queue is None and sonarr_queue is None:
         embed.description = "Unable to fetch download queues. Check API configuration."
         embed.color = 0xff0000
 
@@ -539,27 +588,19 @@ async def stats_command(interaction: discord.Interaction):
 
     embed = create_embed("Media Library Stats", color=0x9b59b6)
 
-    # Radarr stats
-    movies = await fetch_radarr("movie")
-    if movies:
-        total_movies = len(movies)
-        downloaded = sum(1 for m in movies if m.get("hasFile"))
-        monitored = sum(1 for m in movies if m.get("monitored"))
+    # Library stats (precomputed by the index)
+    counts = library.stats() if await library.ensure_loaded() else {}
+    if library.movies:
         embed.add_field(
             name="Movies",
-            value=f"Total: {total_movies}\nDownloaded: {downloaded}\nMonitored: {monitored}",
+            value=f"Total: {counts['movies']}\nDownloaded: {counts['movies_available']}\nMonitored: {counts['movies_monitored']}",
             inline=True
         )
 
-    # Sonarr stats
-    series = await fetch_sonarr("series")
-    if series:
-        total_series = len(series)
-        continuing = sum(1 for s in series if s.get("status") == "continuing")
-        ended = sum(1 for s in series if s.get("status") == "ended")
+    if library.series:
         embed.add_field(
             name="TV Shows",
-            value=f"Total: {total_series}\nContinuing: {continuing}\nEnded: {ended}",
+            value=f"Total: {counts['series']}\nContinuing: {counts['series_continuing']}\nEnded: {counts['series_ended']}",
             inline=True
         )
 
@@ -581,13 +622,37 @@ async def stats_command(interaction: discord.Interaction):
             inline=True
         )
 
-    if not movies and not series:
+    if not library.movies and not library.series:
         embed.description = "Unable to fetch library stats. Check API configuration."
         embed.color = 0xff0000
 
     await interaction.followup.send(embed=embed)
 
 
+@bot.tree.command(name="apistats", description="Show Radarr/Sonarr API latency and retry stats")
+@is_allowed_channel()
+async def apistats_command(interaction: discord.Interaction):
+    """Show request counters and latencies of the API clients."""
+    embed = create_embed("API Client Stats", color=0x9b59b6)
+
+    for client in (radarr, sonarr):
+        stats = client.stats()
+        if stats["requests"]:
+            latency = f"avg {stats['avg']} ms | p50 {stats['p50']} ms | p95 {stats['p95']} ms | max {stats['max']} ms"
+        else:
+            latency = "No requests yet"
+        embed.add_field(
+            name=client.name,
+            value=(
+                f"Requests: {stats['requests']} | Errors: {stats['errors']} | Retries: {stats['retries']}\n"
+                f"{latency}"
+            ),
+            inline=False
+        )
+
+    await interaction.response.send_message(embed=embed)
+
+
 @bot.tree.command(name="recent", description="Show recently added media")
 @is_allowed_channel()
 @app_commands.describe(media_type="Movies or TV Shows")
@@ -700,13 +765,12 @@ async def quality_command(interaction: discord.Interaction, service: str = "rada
 
 @bot.tree.command(name="availablemovies", description="List movies available in your library")
 @is_allowed_channel()
-@app_commands.describe(limit="Number of movies to show (default: 20)")
-async def available_movies_command(interaction: discord.Interaction, limit: int = 20):
+@app_commands.describe(limit="Number of movies per page (default: 20)", page="Page number")
+async def available_movies_command(interaction: discord.Interaction, limit: int = 20, page: int = 1):
     """Show movies that are downloaded and available to watch."""
     await interaction.response.defer()
 
-    movies = await fetch_radarr("movie")
-    if not movies:
+    if not await library.ensure_loaded():
         await interaction.followup.send(embed=create_embed(
             "Error",
             "Could not fetch movies from Radarr.",
@@ -714,10 +778,8 @@ async def available_movies_command(interaction: discord.Interaction, limit: int
         ))
         return
 
-    # Filter to only movies with files (available to watch)
-    available = [m for m in movies if m.get("hasFile")]
-
-    if not available:
+    result = library.page("movies_available", page, min(limit, 50))
+    if not result.total:
         await interaction.followup.send(embed=create_embed(
             "No Movies Available",
             "No movies are currently downloaded in your library.",
@@ -725,66 +787,32 @@ async def available_movies_command(interaction: discord.Interaction, limit: int
         ))
         return
 
-    # Sort by title
-    available.sort(key=lambda x: x.get("title", "").lower())
-
-    # Limit results
-    limit = min(limit, 50)
-    displayed = available[:limit]
-
     embed = create_embed(
-        f"Available Movies ({len(available)} total)",
-        f"Showing {len(displayed)} of {len(available)} movies in your library.",
+        f"Available Movies ({result.total} total)",
+        f"Page {result.page}/{result.pages}: {len(result.items)} of {result.total} movies in your library.",
         color=0x2ecc71
     )
 
-    # Split into chunks for fields
-    movie_lines = []
-    for movie in displayed:
-        title = movie.get("title", "Unknown")
-        year = movie.get("year", "N/A")
-        quality = movie.get("movieFile", {}).get("quality", {}).get("quality", {}).get("name", "Unknown")
-        movie_lines.append(f"**{title}** ({year}) - {quality}")
-
-    # Add movies in chunks (max 1024 chars per field)
-    current_chunk = []
-    current_len = 0
-    chunk_num = 1
-
-    for line in movie_lines:
-        if current_len + len(line) + 1 > 1000:
-            embed.add_field(
-                name=f"Movies {chunk_num}" if chunk_num > 1 else "Movies",
-                value="\n".join(current_chunk),
-                inline=False
-            )
-            current_chunk = [line]
-            current_len = len(line)
-            chunk_num += 1
-        else:
-            current_chunk.append(line)
-            current_len += len(line) + 1
-
-    if current_chunk:
-        embed.add_field(
-            name=f"Movies {chunk_num}" if chunk_num > 1 else "Movies",
-            value="\n".join(current_chunk),
-            inline=False
-        )
+    movie_lines = [
+        f"**{movie.title}** ({movie.year or 'N/A'}) - {movie.quality or 'Unknown'}"
+        for movie in result.items
+    ]
+    add_chunked_fields(embed, "Movies", movie_lines)
 
-    embed.set_footer(text=f"Mnemosyne - {len(available)} movies available | {len(movies) - len(available)} missing")
+    counts = library.stats()
+    missing = counts["movies"] - counts["movies_available"]
+    embed.set_footer(text=f"Mnemosyne - {result.total} movies available | {missing} missing")
     await interaction.followup.send(embed=embed)
 
 
 @bot.tree.command(name="availableseries", description="List TV series available in your library")
 @is_allowed_channel()
-@app_commands.describe(limit="Number of series to show (default: 20)")
-async def available_series_command(interaction: discord.Interaction, limit: int = 20):
+@app_commands.describe(limit="Number of series per page (default: 20)", page="Page number")
+async def available_series_command(interaction: discord.Interaction, limit: int = 20, page: int = 1):
     """Show TV series that have episodes downloaded."""
     await interaction.response.defer()
 
-    series = await fetch_sonarr("series")
-    if not series:
+    if not await library.ensure_loaded():
         await interaction.followup.send(embed=create_embed(
             "Error",
             "Could not fetch series from Sonarr.",
@@ -792,10 +820,8 @@ async def available_series_command(interaction: discord.Interaction, limit: int
         ))
         return
 
-    # Filter to series with at least one episode
-    available = [s for s in series if s.get("statistics", {}).get("episodeFileCount", 0) > 0]
-
-    if not available:
+    result = library.page("series_available", page, min(limit, 50))
+    if not result.total:
         await interaction.followup.send(embed=create_embed(
             "No Series Available",
             "No TV series episodes are currently downloaded in your library.",
@@ -803,58 +829,20 @@ async def available_series_command(interaction: discord.Interaction, limit: int
         ))
         return
 
-    # Sort by title
-    available.sort(key=lambda x: x.get("title", "").lower())
-
-    # Limit results
-    limit = min(limit, 50)
-    displayed = available[:limit]
-
     embed = create_embed(
-        f"Available Series ({len(available)} total)",
-        f"Showing {len(displayed)} of {len(available)} series in your library.",
+        f"Available Series ({result.total} total)",
+        f"Page {result.page}/{result.pages}: {len(result.items)} of {result.total} series in your library.",
         color=0x2ecc71
     )
 
-    # Split into chunks for fields
-    series_lines = []
-    for show in displayed:
-        title = show.get("title", "Unknown")
-        stats = show.get("statistics", {})
-        episodes = stats.get("episodeFileCount", 0)
-        total_eps = stats.get("totalEpisodeCount", 0)
-        seasons = show.get("seasonCount", 0)
-        status = show.get("status", "Unknown").title()
-        series_lines.append(f"**{title}** - {episodes}/{total_eps} eps ({seasons} seasons) [{status}]")
-
-    # Add series in chunks (max 1024 chars per field)
-    current_chunk = []
-    current_len = 0
-    chunk_num = 1
-
-    for line in series_lines:
-        if current_len + len(line) + 1 > 1000:
-            embed.add_field(
-                name=f"Series {chunk_num}" if chunk_num > 1 else "Series",
-                value="\n".join(current_chunk),
-                inline=False
-            )
-            current_chunk = [line]
-            current_len = len(line)
-            chunk_num += 1
-        else:
-            current_chunk.append(line)
-            current_len += len(line) + 1
+    series_lines = [
+        f"**{show.title}** - {show.episode_files}/{show.total_episodes} eps "
+        f"({show.seasons} seasons) [{show.status.title()}]"
+        for show in result.items
+    ]
+    add_chunked_fields(embed, "Series", series_lines)
 
-    if current_chunk:
-        embed.add_field(
-            name=f"Series {chunk_num}" if chunk_num > 1 else "Series",
-            value="\n".join(current_chunk),
-            inline=False
-        )
-
-    total_episodes = sum(s.get("statistics", {}).get("episodeFileCount", 0) for s in available)
-    embed.set_footer(text=f"Mnemosyne - {len(available)} series | {total_episodes} episodes available")
+    embed.set_footer(text=f"Mnemosyne - {result.total} series | {library.stats()['episodes']} episodes available")
     await interaction.followup.send(embed=embed)
 
 
@@ -872,26 +860,21 @@ async def showlist_command(interaction: discord.Interaction, media_type: str = "
 
     lines = []
 
-    if media_type in ["movie", "both"]:
-        movies = await fetch_radarr("movie")
-        if movies:
-            available_movies = [m for m in movies if m.get("hasFile")]
-            available_movies.sort(key=lambda x: x.get("title", "").lower())
+    if await library.ensure_loaded():
+        if media_type in ["movie", "both"]:
+            available_movies = library.view("movies_available")
             if available_movies:
                 lines.append(f"**MOVIES ({len(available_movies)})**")
-                lines.extend([f"- {m.get('title')} ({m.get('year', 'N/A')})" for m in available_movies[:25]])
+                lines.extend([f"- {m.title} ({m.year or 'N/A'})" for m in available_movies[:25]])
                 if len(available_movies) > 25:
                     lines.append(f"*...and {len(available_movies) - 25} more*")
                 lines.append("")
 
-    if media_type in ["tv", "both"]:
-        series = await fetch_sonarr("series")
-        if series:
-            available_series = [s for s in series if s.get("statistics", {}).get("episodeFileCount", 0) > 0]
-            available_series.sort(key=lambda x: x.get("title", "").lower())
+        if media_type in ["tv", "both"]:
+            available_series = library.view("series_available")
             if available_series:
                 lines.append(f"**TV SERIES ({len(available_series)})**")
-                lines.extend([f"- {s.get('title')}" for s in available_series[:25]])
+                lines.extend([f"- {s.title}" for s in available_series[:25]])
                 if len(available_series) > 25:
                     lines.append(f"*...and {len(available_series) - 25} more*")
 
@@ -941,7 +924,7 @@ async def help_command(interaction: discord.Interaction):
 
     embed.add_field(
         name="Library Info",
-        value="`/stats` - Library statistics\n`/quality` - View quality profiles",
+        value="`/stats` - Library statistics\n`/quality` - View quality profiles\n`/apistats` - API latency and retries",
         inline=False
     )
 
@@ -963,11 +946,13 @@ async def monitor_downloads():
         return
 
     active_ids = set()
+    answered = []  # services whose queue was fetched; the others keep their state
 
     # Check Radarr queue
-    radarr_queue = await fetch_radarr("queue", {"includeMovie": "true"})
-    if radarr_queue:
-        for item in radarr_queue.get("records", []):
+    radarr_queue = await queues["radarr"].read()
+    if radarr_queue is not None:
+        answered.append("radarr_")
+        for item in radarr_queue:
             download_id = f"radarr_{item.get('id')}"
             active_ids.add(download_id)
 
@@ -1013,9 +998,10 @@ async def monitor_downloads():
                     await channel.send(embed=embed)
 
     # Check Sonarr queue
-    sonarr_queue = await fetch_sonarr("queue", {"includeSeries": "true", "includeEpisode": "true"})
-    if sonarr_queue:
-        for item in sonarr_queue.get("records", []):
+    sonarr_queue = await queues["sonarr"].read()
+    if sonarr_queue is not None:
+        answered.append("sonarr_")
+        for item in sonarr_queue:
             download_id = f"sonarr_{item.get('id')}"
             active_ids.add(download_id)
 
@@ -1063,7 +1049,7 @@ async def monitor_downloads():
 
     # Check for completed downloads
     for download_id in list(tracker.known_downloads):
-        if download_id not in active_ids:
+        if download_id not in active_ids and download_id.startswith(tuple(answered)):
             info = tracker.mark_completed(download_id)
             if info:
                 embed = create_embed(
@@ -1076,7 +1062,9 @@ async def monitor_downloads():
                     embed.set_thumbnail(url=info.get("poster"))
                 await channel.send(embed=embed)
 
-    tracker.cleanup_stale(active_ids)
+    for prefix in answered:
+        tracker.cleanup_stale(active_ids, prefix)
+    tracker.flush()
 
 
 @monitor_downloads.before_loop
@@ -1084,6 +1072,54 @@ async def before_monitor():
     await bot.wait_until_ready()
 
 
+# === Background Task: Sentinel Download Events ===
+async def announce_download_event(channel, event: dict):
+    """Post a Sentinel download event to the media channel."""
+    kind = event.get("kind")
+    title = event.get("title", "Unknown")
+    poster = event.get("poster")
+
+    if kind == "grabbed":
+        heading = "New Download Started" if event.get("media_type") == "movie" else "New Episode Downloading"
+        embed = create_embed(heading, f"**{title}** is now downloading.", color=0x3498db)
+        if event.get("size"):
+            embed.add_field(name="Size", value=format_size(event["size"]), inline=True)
+        if event.get("quality"):
+            embed.add_field(name="Quality", value=event["quality"], inline=True)
+    elif kind == "progress":
+        embed = create_embed(
+            f"Download Progress: {event.get('milestone')}%",
+            f"**{title}** is {event.get('milestone')}% complete.",
+            color=0xf39c12
+        )
+        embed.add_field(name="ETA", value=event.get("timeleft") or "Unknown", inline=True)
+    elif kind == "imported":
+        if event.get("media_id") and library.loaded_at:
+            await library.refresh_item(event.get("service"), event["media_id"])
+        embed = create_embed("Download Complete!", f"**{title}** has finished downloading!", color=0x2ecc71)
+        embed.add_field(name="Watch Now", value=f"[Open Jellyfin]({JELLYFIN_URL})", inline=True)
+    elif kind == "failed":
+        embed = create_embed("Download Failed", f"**{title}** could not be downloaded.", color=0xe74c3c)
+        embed.add_field(name="Reason", value=str(event.get("reason") or "Unknown")[:1024], inline=False)
+    else:
+        # "completed" is followed by "imported" once the file is in the library
+        return
+
+    if poster:
+        embed.set_thumbnail(url=poster)
+    await channel.send(embed=embed)
+
+
+async def on_download_event(event: dict):
+    """Announce a Sentinel download event in the media channel."""
+    channel = bot.get_channel(MEDIA_CHANNEL_ID)
+    if channel:
+        await announce_download_event(channel, event)
+
+
+download_events_task: Optional[asyncio.Task] = None
+
+
 # === Bot Events ===
 @bot.event
 async def on_ready():
@@ -1096,7 +1132,14 @@ async def on_ready():
     except Exception as e:
         logger.error(f"Failed to sync commands: {e}")
 
-    if not monitor_downloads.is_running():
+    # History deltas keep the library index current, with a full reload now and then
+    library.start()
+
+    global download_events_task
+    if SENTINEL_EVENTS_URL:
+        if download_events_task is None:
+            download_events_task = asyncio.create_task(follow_download_events(SENTINEL_EVENTS_URL, on_download_event))
+    elif not monitor_downloads.is_running():
         monitor_downloads.start()
         logger.info(f"Download monitor started (interval: {POLL_INTERVAL}s)")
 
@@ -1172,6 +1215,16 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
         logger.error(f"Failed to send error message: {e}")
 
 
+async def run_bot():
+    """Run the bot; on shutdown close the API clients and flush the download tracker."""
+    try:
+        async with bot:
+            await bot.start(DISCORD_TOKEN)
+    finally:
+        await asyncio.gather(radarr.close(), sonarr.close())
+        tracker.close()
+
+
 def main():
     """Main entry point."""
     if not DISCORD_TOKEN:
@@ -1183,7 +1236,10 @@ def main():
     logger.info(f"Sonarr: {SONARR_URL}")
     logger.info(f"Allowed channels: {ALLOWED_CHANNEL_LIST}")
 
-    bot.run(DISCORD_TOKEN)
+    try:
+        asyncio.run(run_bot())
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
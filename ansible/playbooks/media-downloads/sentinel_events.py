@@ -0,0 +1,63 @@
+"""
+Sentinel Events
+Client for Sentinel's download event stream, shared by the media download
+bots (download-monitor and Mnemosyne).
+
+Sentinel publishes Radarr/Sonarr download events as server-sent events
+(with a keepalive comment every 15 seconds). One connection stays open;
+each download.* event is handed to a callback, and a dropped or failed
+stream is reopened with exponential backoff.
+"""
+
+import json
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+import aiohttp
+
+# Seconds between reconnect attempts, at most
+MAX_BACKOFF = 60
+
+# No total limit on the long-lived stream; keepalives arrive well within sock_read
+STREAM_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_read=60)
+
+# handler(event) for each download event
+DownloadEventHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+logger = logging.getLogger(__name__)
+
+
+async def follow_download_events(url: str, handler: DownloadEventHandler):
+    """Pass each download event from Sentinel's stream to handler; runs until cancelled."""
+    backoff = 1
+    async with aiohttp.ClientSession(timeout=STREAM_TIMEOUT) as session:
+        while True:
+            try:
+                async with session.get(url, params={"events": "download"}) as response:
+                    response.raise_for_status()
+                    logger.info(f"Following download events from {url}")
+                    backoff = 1
+
+                    event_name = None
+                    async for raw in response.content:
+                        line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                        if line.startswith("event:"):
+                            event_name = line[6:].strip()
+                        elif line.startswith("data:") and (event_name or "").startswith("download."):
+                            await _handle(handler, json.loads(line[5:]))
+                        elif not line:
+                            event_name = None
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                logger.warning(f"Download event stream error: {e or 'timeout'}")
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, MAX_BACKOFF)
+
+
+async def _handle(handler: DownloadEventHandler, event: Dict[str, Any]):
+    # One failed notification should not drop the stream
+    try:
+        await handler(event)
+    except Exception as e:
+        logger.error(f"Download event {event.get('kind')} not handled: {e}")
@@ -159,6 +159,7 @@ class GitLabCog(commands.Cog, name="GitLab"):
 
         progress = ProgressEmbed(":clipboard: Creating Issues...", len(task_list))
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         created = []
         failed = []
@@ -166,7 +167,6 @@ class GitLabCog(commands.Cog, name="GitLab"):
 
         for task in task_list:
             progress.update(processed, f":hourglass: Creating issue: **{task[:30]}**...")
-            await status_msg.edit(embed=progress.embed)
 
             url = f"{self.gitlab_url}/api/v4/projects/{self.project_id}/issues"
             data = {"title": task[:100], "description": task}
@@ -197,7 +197,7 @@ class GitLabCog(commands.Cog, name="GitLab"):
                 inline=False
             )
 
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
     # ==================== Project Info ====================
 
@@ -4,14 +4,13 @@ Commands for Proxmox cluster and infrastructure management.
 """
 
 import logging
+import asyncio
 import json
 import discord
 from discord import app_commands
 from discord.ext import commands
 from typing import TYPE_CHECKING
 
-from core.progress import make_progress_bar, ProgressEmbed
-
 if TYPE_CHECKING:
     from core import SentinelBot
 
@@ -105,129 +104,109 @@ class HomelabCog(commands.Cog, name="Homelab"):
     # ==================== Insight Command ====================
 
     @app_commands.command(name="insight", description="Get health insights for your homelab")
-    async def insight_command(self, interaction: discord.Interaction):
+    @app_commands.describe(refresh="Poll hosts now instead of using the latest snapshot")
+    async def insight_command(self, interaction: discord.Interaction, refresh: bool = False):
         """Check homelab health: high memory, errors, storage, and issues."""
         await interaction.response.defer()
 
-        progress = ProgressEmbed(":mag: Analyzing Homelab Health...", 5)
-        status_msg = await interaction.followup.send(embed=progress.embed)
+        poller = self.bot.poller
+        store = poller.store
+        jobs = ('health', 'nodes')
+        await asyncio.gather(*(poller.refresh(job) if refresh else poller.ensure(job) for job in jobs))
 
         issues = []
         warnings = []
         healthy = []
 
-        # Docker hosts to check
-        docker_hosts = [
-            ('utilities', self.config.ssh.docker_utilities_ip),
-            ('media', self.config.ssh.docker_media_ip),
-            ('glance', self.config.ssh.docker_glance_ip),
-        ]
-
-        # Step 1: Check container memory usage
-        progress.update(0, ":hourglass: Checking container memory usage...")
-        await status_msg.edit(embed=progress.embed)
-
+        # Health probe results (one round-trip per host)
+        probes = {}
+        unreachable = []
+        for host_name, host_ip in poller.disk_hosts:
+            entry = store.get(f'health:{host_ip}')
+            if entry and entry.ok:
+                probes[host_name] = entry.data
+            elif entry:
+                unreachable.append(host_name)
+
+        # Container memory usage
         high_memory_containers = []
-        for host_name, host_ip in docker_hosts:
-            result = await self.ssh.run(
-                host_ip,
-                'docker stats --no-stream --format "{{.Name}}:{{.MemPerc}}" 2>/dev/null'
-            )
-            if result.success:
-                for line in result.output.split('\n'):
-                    if ':' in line:
-                        name, mem = line.split(':')
-                        try:
-                            mem_pct = float(mem.replace('%', '').strip())
-                            if mem_pct > 80:
-                                high_memory_containers.append(f"{name} ({mem_pct:.0f}%)")
-                        except:
-                            pass
+        for probe in probes.values():
+            for c in probe.containers:
+                if c.mem_pct is not None and c.mem_pct > 80:
+                    high_memory_containers.append(f"{c.name} ({c.mem_pct:.0f}%)")
 
         if high_memory_containers:
             issues.append(f"🔴 **High Memory** ({len(high_memory_containers)}): " + ", ".join(high_memory_containers[:5]))
         else:
             healthy.append("✅ Container memory usage normal")
 
-        # Step 2: Check for unhealthy/restarting containers
-        progress.update(1, ":hourglass: Checking container health...")
-        await status_msg.edit(embed=progress.embed)
-
+        # Unhealthy/restarting/crashed containers
         unhealthy_containers = []
-        for host_name, host_ip in docker_hosts:
-            result = await self.ssh.run(
-                host_ip,
-                'docker ps -a --format "{{.Names}}:{{.Status}}" 2>/dev/null'
-            )
-            if result.success:
-                for line in result.output.split('\n'):
-                    if ':' in line:
-                        name, status = line.split(':', 1)
-                        status_lower = status.lower()
-                        if 'restarting' in status_lower:
-                            unhealthy_containers.append(f"{name} (restarting)")
-                        elif 'unhealthy' in status_lower:
-                            unhealthy_containers.append(f"{name} (unhealthy)")
-                        elif 'exited' in status_lower and 'exited (0)' not in status_lower:
-                            unhealthy_containers.append(f"{name} (crashed)")
+        for probe in probes.values():
+            for c in probe.containers:
+                if c.state == 'restarting':
+                    unhealthy_containers.append(f"{c.name} (restarting)")
+                elif c.health == 'unhealthy':
+                    unhealthy_containers.append(f"{c.name} (unhealthy)")
+                elif c in probe.crashed:
+                    reason = "OOM-killed" if c.oom_killed else f"exit {c.exit_code}"
+                    unhealthy_containers.append(f"{c.name} (crashed, {reason})")
 
         if unhealthy_containers:
             issues.append(f"🔴 **Unhealthy Containers** ({len(unhealthy_containers)}): " + ", ".join(unhealthy_containers[:5]))
         else:
             healthy.append("✅ All containers healthy")
 
-        # Step 3: Check disk usage
-        progress.update(2, ":hourglass: Checking disk usage...")
-        await status_msg.edit(embed=progress.embed)
+        # Recent OOM kills and restart loops
+        oom_events = [name for probe in probes.values() for name in probe.oom_events]
+        if oom_events:
+            issues.append(f"💥 **OOM Kills (1h)** ({len(oom_events)}): " + ", ".join(oom_events[:5]))
 
-        disk_warnings = []
-        all_hosts = docker_hosts + [
-            ('traefik', self.config.ssh.traefik_ip),
-            ('authentik', self.config.ssh.authentik_ip),
+        restarting = [
+            f"{c.name} ({c.restarts}x)"
+            for probe in probes.values() for c in probe.containers if c.restarts >= 3
         ]
-        for host_name, host_ip in all_hosts:
-            result = await self.ssh.run(host_ip, "df -h / | tail -1 | awk '{print $5}'")
-            if result.success:
-                try:
-                    usage = int(result.output.replace('%', '').strip())
-                    if usage > 90:
-                        disk_warnings.append(f"{host_name} ({usage}%) 🔴")
-                    elif usage > 80:
-                        disk_warnings.append(f"{host_name} ({usage}%) 🟡")
-                except:
-                    pass
+        if restarting:
+            warnings.append("🔁 **Frequent Restarts**: " + ", ".join(restarting[:5]))
+
+        # Disk usage
+        disk_warnings = []
+        for host_name, probe in probes.items():
+            usage = probe.disk
+            if usage is None:
+                continue
+            if usage > 90:
+                disk_warnings.append(f"{host_name} ({usage}%) 🔴")
+            elif usage > 80:
+                disk_warnings.append(f"{host_name} ({usage}%) 🟡")
 
         if disk_warnings:
             warnings.append(f"💾 **Disk Usage**: " + ", ".join(disk_warnings))
         else:
             healthy.append("✅ Disk usage normal (<80%)")
 
-        # Step 4: Check Proxmox nodes
-        progress.update(3, ":hourglass: Checking Proxmox nodes...")
-        await status_msg.edit(embed=progress.embed)
+        if unreachable:
+            warnings.append("📡 **Unreachable**: " + ", ".join(unreachable))
 
+        # Proxmox nodes
         proxmox_issues = []
-        for node_name, node_ip in [('node01', self.config.ssh.node01_ip), ('node02', self.config.ssh.node02_ip)]:
-            result = await self.ssh.pve_node_status(node_ip)
-            if result.success:
-                try:
-                    data = json.loads(result.stdout)
-                    cpu = data.get('cpu', 0) * 100
-                    mem = data.get('memory', {})
-                    mem_pct = (mem.get('used', 0) / mem.get('total', 1)) * 100 if mem.get('total') else 0
-
-                    if cpu > 90:
-                        proxmox_issues.append(f"{node_name} CPU {cpu:.0f}% 🔴")
-                    elif cpu > 80:
-                        proxmox_issues.append(f"{node_name} CPU {cpu:.0f}% 🟡")
-
-                    if mem_pct > 90:
-                        proxmox_issues.append(f"{node_name} RAM {mem_pct:.0f}% 🔴")
-                    elif mem_pct > 80:
-                        proxmox_issues.append(f"{node_name} RAM {mem_pct:.0f}% 🟡")
-                except:
-                    pass
-            else:
+        for node_name, _ in poller.nodes:
+            entry = store.get(f'node:{node_name}')
+            if entry and entry.ok:
+                data = entry.data
+                cpu = data['cpu']
+                mem_pct = data['mem_used'] / data['mem_total'] * 100 if data['mem_total'] else 0
+
+                if cpu > 90:
+                    proxmox_issues.append(f"{node_name} CPU {cpu:.0f}% 🔴")
+                elif cpu > 80:
+                    proxmox_issues.append(f"{node_name} CPU {cpu:.0f}% 🟡")
+
+                if mem_pct > 90:
+                    proxmox_issues.append(f"{node_name} RAM {mem_pct:.0f}% 🔴")
+                elif mem_pct > 80:
+                    proxmox_issues.append(f"{node_name} RAM {mem_pct:.0f}% 🟡")
+            elif entry and entry.error != 'parse error':
                 proxmox_issues.append(f"{node_name} unreachable 🔴")
 
         if proxmox_issues:
@@ -235,24 +214,19 @@ class HomelabCog(commands.Cog, name="Homelab"):
         else:
             healthy.append("✅ Proxmox nodes healthy")
 
-        # Step 5: Check for failed downloads
-        progress.update(4, ":hourglass: Checking download queues...")
-        await status_msg.edit(embed=progress.embed)
-
+        # Failed downloads (live - these are quick API calls)
         failed_downloads = []
-        # Check Radarr
-        radarr_url = f"{self.bot.config.api.radarr_url}/api/v3/queue"
-        radarr_data = await self.bot.api_get(radarr_url, 'radarr')
-        if radarr_data:
-            for item in radarr_data.get('records', []):
+        radarr_records, sonarr_records = await asyncio.gather(
+            self.bot.queues['radarr'].read(),
+            self.bot.queues['sonarr'].read(),
+        )
+        if radarr_records:
+            for item in radarr_records:
                 if item.get('status', '').lower() in ['failed', 'warning']:
                     failed_downloads.append(f"🎬 {item.get('title', 'Unknown')[:20]}")
 
-        # Check Sonarr
-        sonarr_url = f"{self.bot.config.api.sonarr_url}/api/v3/queue"
-        sonarr_data = await self.bot.api_get(sonarr_url, 'sonarr')
-        if sonarr_data:
-            for item in sonarr_data.get('records', []):
+        if sonarr_records:
+            for item in sonarr_records:
                 if item.get('status', '').lower() in ['failed', 'warning']:
                     failed_downloads.append(f"📺 {item.get('title', 'Unknown')[:20]}")
 
@@ -271,8 +245,7 @@ class HomelabCog(commands.Cog, name="Homelab"):
             color = discord.Color.yellow()
             title = f"⚠️ Homelab Health: {len(warnings)} Warning(s)"
 
-        embed = progress.complete(title, "Health check complete", color)
-        embed.clear_fields()
+        embed = discord.Embed(title=title, color=color)
 
         if issues:
             embed.add_field(
@@ -295,9 +268,11 @@ class HomelabCog(commands.Cog, name="Homelab"):
                 inline=False
             )
 
-        embed.set_footer(text="Run /check for container updates • /downloads for queue status")
+        embed.set_footer(
+            text=f"{poller.staleness(*jobs)} • Run /check for container updates • /downloads for queue status"
+        )
 
-        await status_msg.edit(embed=embed)
+        await interaction.followup.send(embed=embed)
 
     @property
     def config(self):
@@ -308,112 +283,66 @@ class HomelabCog(commands.Cog, name="Homelab"):
     homelab_group = app_commands.Group(name="homelab", description="Homelab infrastructure commands")
 
     @homelab_group.command(name="status", description="Show cluster overview")
-    async def homelab_status(self, interaction: discord.Interaction):
+    @app_commands.describe(refresh="Poll the nodes now instead of using the latest snapshot")
+    async def homelab_status(self, interaction: discord.Interaction, refresh: bool = False):
         """Get Proxmox cluster status overview."""
         await interaction.response.defer()
 
-        nodes = [
-            ('node01', self.config.ssh.node01_ip),
-            ('node02', self.config.ssh.node02_ip)
-        ]
-
-        progress = ProgressEmbed(":house: Checking Cluster Status...", len(nodes))
-        status_msg = await interaction.followup.send(embed=progress.embed)
+        poller = self.bot.poller
+        await (poller.refresh('nodes') if refresh else poller.ensure('nodes'))
 
         node_results = []
-        checked = 0
-
-        # Get node statuses
-        for node_name, node_ip in nodes:
-            progress.update(checked, f":hourglass: Checking **{node_name}**...")
-            await status_msg.edit(embed=progress.embed)
-
-            result = await self.ssh.pve_node_status(node_ip)
-            if result.success:
-                try:
-                    data = json.loads(result.stdout)
-                    cpu = data.get('cpu', 0) * 100
-                    mem_used = data.get('memory', {}).get('used', 0) / (1024**3)
-                    mem_total = data.get('memory', {}).get('total', 0) / (1024**3)
-                    uptime_days = data.get('uptime', 0) / 86400
-
-                    node_results.append((
-                        f":green_circle: {node_name}",
-                        f"CPU: {cpu:.1f}%\nMemory: {mem_used:.1f}/{mem_total:.1f} GB\nUptime: {uptime_days:.1f} days"
-                    ))
-                except json.JSONDecodeError:
-                    node_results.append((f":yellow_circle: {node_name}", "Parse error"))
+        for node_name, _ in poller.nodes:
+            entry = poller.store.get(f'node:{node_name}')
+            if entry and entry.ok:
+                data = entry.data
+                node_results.append((
+                    f":green_circle: {node_name}",
+                    f"CPU: {data['cpu']:.1f}%\n"
+                    f"Memory: {data['mem_used'] / (1024**3):.1f}/{data['mem_total'] / (1024**3):.1f} GB\n"
+                    f"Uptime: {data['uptime'] / 86400:.1f} days"
+                ))
+            elif entry and entry.error == 'parse error':
+                node_results.append((f":yellow_circle: {node_name}", "Parse error"))
             else:
                 node_results.append((f":red_circle: {node_name}", "Unreachable"))
-            checked += 1
 
         # Build final embed
         all_healthy = all(":green_circle:" in r[0] for r in node_results)
         color = discord.Color.green() if all_healthy else discord.Color.yellow()
-        embed = progress.complete(":house: MorpheusCluster Status", "Cluster check complete", color)
-        embed.clear_fields()
+        embed = discord.Embed(title=":house: MorpheusCluster Status", color=color)
 
         for name, value in node_results:
             embed.add_field(name=name, value=value, inline=True)
 
-        await status_msg.edit(embed=embed)
+        embed.set_footer(text=poller.staleness('nodes'))
+        await interaction.followup.send(embed=embed)
 
     @homelab_group.command(name="uptime", description="Show uptime for all nodes")
-    async def homelab_uptime(self, interaction: discord.Interaction):
+    @app_commands.describe(refresh="Poll the hosts now instead of using the latest snapshot")
+    async def homelab_uptime(self, interaction: discord.Interaction, refresh: bool = False):
         """Get uptime for all infrastructure components."""
         await interaction.response.defer()
 
-        # All hosts to check
-        proxmox_nodes = [
-            ('node01', self.config.ssh.node01_ip),
-            ('node02', self.config.ssh.node02_ip)
-        ]
-        docker_hosts_list = [
-            ('utilities', self.config.ssh.docker_utilities_ip),
-            ('media', self.config.ssh.docker_media_ip),
-            ('glance', self.config.ssh.docker_glance_ip),
-        ]
-
-        total_hosts = len(proxmox_nodes) + len(docker_hosts_list)
-        progress = ProgressEmbed(":clock: Checking Infrastructure Uptime...", total_hosts)
-        status_msg = await interaction.followup.send(embed=progress.embed)
-
-        checked = 0
+        poller = self.bot.poller
+        await (poller.refresh('uptime') if refresh else poller.ensure('uptime'))
 
-        # Proxmox nodes (use root user)
-        nodes = []
-        for node_name, node_ip in proxmox_nodes:
-            progress.update(checked, f":hourglass: Checking **{node_name}**...")
-            await status_msg.edit(embed=progress.embed)
+        def uptime_line(name: str, host_ip: str) -> str:
+            entry = poller.store.get(f'uptime:{host_ip}')
+            if entry and entry.ok:
+                return f"**{name}**: {entry.data}"
+            return f"**{name}**: :x: Unreachable"
 
-            # Use run_proxmox for Proxmox nodes (requires root)
-            result = await self.ssh.run_proxmox(node_ip, 'uptime -p')
-            if result.success:
-                nodes.append(f"**{node_name}**: {result.output}")
-            else:
-                nodes.append(f"**{node_name}**: :x: Unreachable")
-            checked += 1
-
-        # Docker hosts
-        docker_hosts = []
-        for name, ip in docker_hosts_list:
-            progress.update(checked, f":hourglass: Checking **{name}**...")
-            await status_msg.edit(embed=progress.embed)
-
-            result = await self.ssh.system_uptime(ip)
-            if result.success:
-                docker_hosts.append(f"**{name}**: {result.output}")
-            else:
-                docker_hosts.append(f"**{name}**: :x: Unreachable")
-            checked += 1
+        nodes = [uptime_line(name, ip) for name, ip in poller.nodes]
+        docker_hosts = [uptime_line(name, ip) for name, ip in poller.docker_hosts]
 
         # Build final embed
-        embed = progress.complete(":clock: Infrastructure Uptime", "Uptime check complete")
-        embed.clear_fields()
+        embed = discord.Embed(title=":clock: Infrastructure Uptime", color=discord.Color.green())
         embed.add_field(name="Proxmox Nodes", value="\n".join(nodes), inline=False)
         embed.add_field(name="Docker Hosts", value="\n".join(docker_hosts), inline=False)
+        embed.set_footer(text=poller.staleness('uptime'))
 
-        await status_msg.edit(embed=embed)
+        await interaction.followup.send(embed=embed)
 
     # ==================== Node Commands ====================
 
@@ -592,17 +521,12 @@ class HomelabCog(commands.Cog, name="Homelab"):
         """Manage VMs by VMID."""
         await interaction.response.defer()
 
-        # Try both nodes
-        node_ip = None
-        for ip in [self.config.ssh.node01_ip, self.config.ssh.node02_ip]:
-            result = await self.ssh.pve_vm_status(ip, vmid)
-            if result.success:
-                node_ip = ip
-                break
-
-        if not node_ip:
+        # Resolve the owning node from the cluster snapshot
+        guest = await self.bot.cluster.resolve(vmid, 'qemu')
+        if not guest or not guest.node_ip:
             await interaction.followup.send(f":x: VM {vmid} not found on any node")
             return
+        node_ip = guest.node_ip
 
         if action == "status":
             result = await self.ssh.pve_vm_status(node_ip, vmid)
@@ -653,23 +577,13 @@ class HomelabCog(commands.Cog, name="Homelab"):
         """Manage LXC containers by CTID."""
         await interaction.response.defer()
 
-        # Try both nodes to find the container
-        node_ip = None
-        container_name = None
-        for ip in [self.config.ssh.node01_ip, self.config.ssh.node02_ip]:
-            result = await self.ssh.pve_lxc_status(ip, ctid)
-            if result.success:
-                node_ip = ip
-                try:
-                    data = json.loads(result.stdout)
-                    container_name = data.get('name', f'CT{ctid}')
-                except:
-                    container_name = f'CT{ctid}'
-                break
-
-        if not node_ip:
+        # Resolve the owning node from the cluster snapshot
+        guest = await self.bot.cluster.resolve(ctid, 'lxc')
+        if not guest or not guest.node_ip:
             await interaction.followup.send(f":x: LXC container {ctid} not found on any node")
             return
+        node_ip = guest.node_ip
+        container_name = guest.name or f'CT{ctid}'
 
         if action == "status":
             result = await self.ssh.pve_lxc_status(node_ip, ctid)
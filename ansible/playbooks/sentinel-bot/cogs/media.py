@@ -17,6 +17,9 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger('sentinel.cogs.media')
 
+# Discord allows 25 fields per embed
+MAX_LIBRARY_FIELDS = 25
+
 
 class MediaCog(commands.Cog, name="Media"):
     """Media download tracking and library management."""
@@ -38,15 +41,14 @@ class MediaCog(commands.Cog, name="Media"):
         # 2 steps: Radarr queue, Sonarr queue
         progress = ProgressEmbed(":arrow_down: Fetching Download Queue...", 2)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         # Get from Radarr
         progress.update(0, ":hourglass: Checking Radarr queue...")
-        await status_msg.edit(embed=progress.embed)
         radarr_queue = await self._get_radarr_queue()
 
         # Get from Sonarr
         progress.update(1, ":hourglass: Checking Sonarr queue...")
-        await status_msg.edit(embed=progress.embed)
         sonarr_queue = await self._get_sonarr_queue()
 
         # Build final embed
@@ -64,7 +66,7 @@ class MediaCog(commands.Cog, name="Media"):
         if not radarr_queue and not sonarr_queue:
             embed.description = "No active downloads"
 
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
     @app_commands.command(name="download", description="Request a movie or TV show")
     @app_commands.describe(
@@ -153,14 +155,17 @@ class MediaCog(commands.Cog, name="Media"):
     library_group = app_commands.Group(name="library", description="Media library commands")
 
     @library_group.command(name="movies", description="List movies in library")
-    @app_commands.describe(limit="Number of movies to show")
-    async def library_movies(self, interaction: discord.Interaction, limit: int = 10):
+    @app_commands.describe(limit="Number of movies per page", page="Page number")
+    async def library_movies(self, interaction: discord.Interaction, limit: int = 10, page: int = 1):
         """List movies in the Radarr library."""
         await interaction.response.defer()
 
-        movies = await self._get_radarr_movies(limit)
+        if not await self.bot.library.ensure_loaded():
+            await interaction.followup.send(":x: Library not available - check Radarr/Sonarr")
+            return
 
-        if not movies:
+        result = self.bot.library.page('movies', page, min(limit, MAX_LIBRARY_FIELDS))
+        if not result.total:
             await interaction.followup.send(":information_source: No movies found")
             return
 
@@ -169,25 +174,29 @@ class MediaCog(commands.Cog, name="Media"):
             color=discord.Color.blue()
         )
 
-        for movie in movies[:limit]:
-            status = ":white_check_mark:" if movie.get('hasFile') else ":hourglass:"
+        for movie in result.items:
+            status = ":white_check_mark:" if movie.has_file else ":hourglass:"
             embed.add_field(
-                name=f"{status} {movie.get('title', 'Unknown')}",
-                value=f"{movie.get('year', 'Unknown')}",
+                name=f"{status} {movie.title}",
+                value=f"{movie.year or 'Unknown'}",
                 inline=True
             )
 
+        embed.set_footer(text=f"Page {result.page}/{result.pages} | {result.total} movies")
         await interaction.followup.send(embed=embed)
 
     @library_group.command(name="shows", description="List TV shows in library")
-    @app_commands.describe(limit="Number of shows to show")
-    async def library_shows(self, interaction: discord.Interaction, limit: int = 10):
+    @app_commands.describe(limit="Number of shows per page", page="Page number")
+    async def library_shows(self, interaction: discord.Interaction, limit: int = 10, page: int = 1):
         """List TV shows in the Sonarr library."""
         await interaction.response.defer()
 
-        shows = await self._get_sonarr_shows(limit)
+        if not await self.bot.library.ensure_loaded():
+            await interaction.followup.send(":x: Library not available - check Radarr/Sonarr")
+            return
 
-        if not shows:
+        result = self.bot.library.page('series', page, min(limit, MAX_LIBRARY_FIELDS))
+        if not result.total:
             await interaction.followup.send(":information_source: No shows found")
             return
 
@@ -196,14 +205,15 @@ class MediaCog(commands.Cog, name="Media"):
             color=discord.Color.blue()
         )
 
-        for show in shows[:limit]:
-            status = ":white_check_mark:" if show.get('statistics', {}).get('percentOfEpisodes', 0) == 100 else ":hourglass:"
+        for show in result.items:
+            status = ":white_check_mark:" if show.complete else ":hourglass:"
             embed.add_field(
-                name=f"{status} {show.get('title', 'Unknown')}",
-                value=f"Episodes: {show.get('statistics', {}).get('episodeFileCount', 0)}",
+                name=f"{status} {show.title}",
+                value=f"Episodes: {show.episode_files}",
                 inline=True
             )
 
+        embed.set_footer(text=f"Page {result.page}/{result.pages} | {result.total} shows")
         await interaction.followup.send(embed=embed)
 
     @library_group.command(name="stats", description="Show library statistics")
@@ -216,25 +226,16 @@ class MediaCog(commands.Cog, name="Media"):
             color=discord.Color.blue()
         )
 
-        # Get Radarr stats
-        movies = await self._get_radarr_movies(limit=9999)
-        if movies:
-            total_movies = len(movies)
-            available = sum(1 for m in movies if m.get('hasFile'))
+        if await self.bot.library.ensure_loaded():
+            counts = self.bot.library.stats()
             embed.add_field(
                 name=":movie_camera: Movies",
-                value=f"Total: {total_movies}\nAvailable: {available}",
+                value=f"Total: {counts['movies']}\nAvailable: {counts['movies_available']}",
                 inline=True
             )
-
-        # Get Sonarr stats
-        shows = await self._get_sonarr_shows(limit=9999)
-        if shows:
-            total_shows = len(shows)
-            total_episodes = sum(s.get('statistics', {}).get('episodeFileCount', 0) for s in shows)
             embed.add_field(
                 name=":tv: TV Shows",
-                value=f"Shows: {total_shows}\nEpisodes: {total_episodes}",
+                value=f"Shows: {counts['series']}\nEpisodes: {counts['episodes']}",
                 inline=True
             )
 
@@ -278,15 +279,11 @@ class MediaCog(commands.Cog, name="Media"):
 
     async def _get_radarr_queue(self) -> List[dict]:
         """Get Radarr download queue."""
-        url = f"{self.config.api.radarr_url}/api/v3/queue"
-        data = await self.bot.api_get(url, 'radarr')
-        return data.get('records', []) if data else []
+        return await self.bot.queues['radarr'].read() or []
 
     async def _get_sonarr_queue(self) -> List[dict]:
         """Get Sonarr download queue."""
-        url = f"{self.config.api.sonarr_url}/api/v3/queue"
-        data = await self.bot.api_get(url, 'sonarr')
-        return data.get('records', []) if data else []
+        return await self.bot.queues['sonarr'].read() or []
 
     async def _search_jellyseerr(self, query: str, media_type: str = "multi") -> List[dict]:
         """Search Jellyseerr for media."""
@@ -304,18 +301,6 @@ class MediaCog(commands.Cog, name="Media"):
             return [r for r in results if r.get('mediaType') == 'tv']
         return results
 
-    async def _get_radarr_movies(self, limit: int = 10) -> List[dict]:
-        """Get movies from Radarr."""
-        url = f"{self.config.api.radarr_url}/api/v3/movie"
-        data = await self.bot.api_get(url, 'radarr')
-        return (data or [])[:limit]
-
-    async def _get_sonarr_shows(self, limit: int = 10) -> List[dict]:
-        """Get shows from Sonarr."""
-        url = f"{self.config.api.sonarr_url}/api/v3/series"
-        data = await self.bot.api_get(url, 'sonarr')
-        return (data or [])[:limit]
-
 
 async def setup(bot: 'SentinelBot'):
     """Load the Media cog."""
@@ -136,28 +136,24 @@ class OnboardingCog(commands.Cog, name="Onboarding"):
         # 5 checks: dns, traefik, ssl, authentik, docs
         progress = ProgressEmbed(f":clipboard: Onboarding: {service}", 5)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         # Run checks with progress updates
         checks = {}
 
         progress.update(0, ":hourglass: Checking DNS...")
-        await status_msg.edit(embed=progress.embed)
         checks['dns'] = await self._check_dns(service)
 
         progress.update(1, ":hourglass: Checking Traefik...")
-        await status_msg.edit(embed=progress.embed)
         checks['traefik'] = await self._check_traefik(service)
 
         progress.update(2, ":hourglass: Checking SSL...")
-        await status_msg.edit(embed=progress.embed)
         checks['ssl'] = await self._check_ssl(service)
 
         progress.update(3, ":hourglass: Checking Authentik...")
-        await status_msg.edit(embed=progress.embed)
         checks['authentik'] = await self._check_authentik(service)
 
         progress.update(4, ":hourglass: Checking Docs...")
-        await status_msg.edit(embed=progress.embed)
         checks['docs'] = await self._check_docs(service)
 
         # Determine overall status
@@ -188,7 +184,7 @@ class OnboardingCog(commands.Cog, name="Onboarding"):
         embed.add_field(name="Checks", value="\n".join(check_lines), inline=False)
         embed.add_field(name="URL", value=f"https://{service}.{self.config.domain}", inline=True)
 
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
     @app_commands.command(name="onboard-all", description="Check onboarding status for all services")
     async def onboard_all(self, interaction: discord.Interaction):
@@ -8,7 +8,7 @@ import asyncio
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, List, Dict, Optional
 from dataclasses import dataclass, field
 import time
 
@@ -16,8 +16,14 @@ from config import (
     PROXMOX_NODES, LXC_CONTAINERS,
     WOL_MAC_ADDRESSES, WOL_BROADCAST,
     NODE_SHUTDOWN_ORDER, NODE_STARTUP_ORDER,
-    LXC_STARTUP_ORDER, CRITICAL_LXCS
+    CRITICAL_LXCS, POWER_DEPENDENCIES, POWER_FOUNDATION,
+    POWER_NODE_CONCURRENCY, POWER_GLOBAL_CONCURRENCY,
+    GUEST_SHUTDOWN_TIMEOUT, GUEST_START_TIMEOUT, NODE_BOOT_TIMEOUT
 )
+from core.cluster_snapshot import GuestInfo
+from core.power_orchestrator import PowerOrchestrator, GuestOutcome
+from core.wake import WakeResult, wake_and_wait, is_ready
+from core.progress import MessageUpdater
 
 if TYPE_CHECKING:
     from core import SentinelBot
@@ -28,6 +34,14 @@ logger = logging.getLogger('sentinel.cogs.power')
 CONFIRM_EMOJI = "\u26a0\ufe0f"  # Warning sign
 CANCEL_EMOJI = "\u274c"  # Red X
 
+# Minimum seconds between progress edits of the status message
+PROGRESS_EDIT_INTERVAL = 2.0
+
+# Seconds between node shutdowns, and how long to wait for the other nodes
+# to power off before shutting down the last one (Pi-hole's host)
+NODE_SHUTDOWN_GAP = 5
+NODE_OFFLINE_TIMEOUT = 300
+
 
 @dataclass
 class PowerOperationReport:
@@ -48,8 +62,54 @@ class PowerOperationReport:
     lxcs_failures: List[str] = field(default_factory=list)
     lxcs_skipped: List[str] = field(default_factory=list)
 
+    forced: List[str] = field(default_factory=list)
+    active: List[str] = field(default_factory=list)
+    boot_times: Dict[str, float] = field(default_factory=dict)
+
     start_time: float = field(default_factory=time.time)
 
+    def plan(self, guests: List[GuestInfo]) -> None:
+        """Count guests about to be started or stopped."""
+        self.vms_total += sum(1 for g in guests if g.kind == 'qemu')
+        self.lxcs_total += sum(1 for g in guests if g.kind == 'lxc')
+
+    def record(self, outcome: GuestOutcome) -> None:
+        """Apply a guest progress update from the orchestrator."""
+        label = outcome.label
+        if outcome.state == 'running':
+            self.active.append(label)
+            return
+        if label in self.active:
+            self.active.remove(label)
+        if not outcome.finished:
+            return
+
+        is_vm = outcome.guest.kind == 'qemu'
+        if outcome.state == 'done':
+            if is_vm:
+                self.vms_success += 1
+            else:
+                self.lxcs_success += 1
+            if outcome.forced:
+                self.forced.append(label)
+        else:
+            failure = f"{label}: {outcome.error}" if outcome.error else label
+            (self.vms_failures if is_vm else self.lxcs_failures).append(failure)
+
+    def progress_text(self) -> str:
+        """Live guest progress for the status embed."""
+        vms_done = self.vms_success + len(self.vms_failures)
+        lxcs_done = self.lxcs_success + len(self.lxcs_failures)
+        lines = [f":computer: VMs {vms_done}/{self.vms_total} | :package: LXCs {lxcs_done}/{self.lxcs_total}"]
+        if self.active:
+            shown = ', '.join(self.active[:5])
+            more = f" (+{len(self.active) - 5})" if len(self.active) > 5 else ""
+            lines.append(f":gear: {shown}{more}")
+        failed = len(self.vms_failures) + len(self.lxcs_failures)
+        if failed:
+            lines.append(f":x: {failed} failed")
+        return "\n".join(lines)
+
     @property
     def duration(self) -> str:
         elapsed = time.time() - self.start_time
@@ -115,6 +175,19 @@ class PowerOperationReport:
             if failures:
                 embed.add_field(name=":x: Failures", value="\n".join(failures), inline=False)
 
+        if self.boot_times:
+            embed.add_field(
+                name=":stopwatch: Boot Times",
+                value="\n".join(f"{name}: {secs:.0f}s" for name, secs in self.boot_times.items()),
+                inline=False
+            )
+
+        if self.forced:
+            forced_text = "\n".join(self.forced[:5])
+            if len(self.forced) > 5:
+                forced_text += f"\n... and {len(self.forced) - 5} more"
+            embed.add_field(name=":zap: Force-stopped", value=forced_text, inline=False)
+
         # Skipped section
         skipped_items = []
         for s in self.nodes_skipped:
@@ -133,11 +206,24 @@ class PowerCog(commands.Cog, name="Power"):
     def __init__(self, bot: 'SentinelBot'):
         self.bot = bot
         self._pending_confirmations: dict = {}
+        self.orchestrator = PowerOrchestrator(
+            bot.ssh,
+            dependencies=POWER_DEPENDENCIES,
+            foundation=POWER_FOUNDATION,
+            node_concurrency=POWER_NODE_CONCURRENCY,
+            global_concurrency=POWER_GLOBAL_CONCURRENCY,
+            shutdown_timeout=GUEST_SHUTDOWN_TIMEOUT,
+            start_timeout=GUEST_START_TIMEOUT,
+        )
 
     @property
     def ssh(self):
         return self.bot.ssh
 
+    @property
+    def cluster(self):
+        return self.bot.cluster
+
     @property
     def config(self):
         return self.bot.config
@@ -153,26 +239,10 @@ class PowerCog(commands.Cog, name="Power"):
         await interaction.response.defer()
 
         # Build summary of what will be affected
-        summary_lines = []
-        total_vms = 0
-        total_lxcs = 0
-
-        for node_name in NODE_SHUTDOWN_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip:
-                continue
-
-            vms = await self.ssh.pve_get_running_vms(node_ip)
-            lxcs = await self.ssh.pve_get_running_lxcs(node_ip)
-
-            if vms or lxcs:
-                summary_lines.append(f"**{node_name}** ({node_ip})")
-                if vms:
-                    summary_lines.append(f"  VMs: {', '.join(v['name'] for v in vms)}")
-                    total_vms += len(vms)
-                if lxcs:
-                    summary_lines.append(f"  LXCs: {', '.join(l['name'] for l in lxcs)}")
-                    total_lxcs += len(lxcs)
+        await self.cluster.refresh()
+        running = self._running_guests()
+        total_vms = sum(1 for g in running if g.kind == 'qemu')
+        total_lxcs = len(running) - total_vms
 
         await self._confirm_and_execute(
             interaction,
@@ -185,9 +255,9 @@ class PowerCog(commands.Cog, name="Power"):
                 f"- {total_lxcs} LXC containers\n"
                 f"- {len(PROXMOX_NODES)} Proxmox nodes\n\n"
                 "**Shutdown order:**\n"
-                "1. Stop all VMs (gracefully)\n"
-                "2. Stop all LXC containers\n"
-                "3. Shutdown all Proxmox nodes\n\n"
+                "1. Stop VMs and LXCs in parallel, dependents first (Pi-hole last)\n"
+                f"2. Force-stop anything still running after {GUEST_SHUTDOWN_TIMEOUT}s\n"
+                f"3. Shutdown Proxmox nodes in order ({' -> '.join(NODE_SHUTDOWN_ORDER)})\n\n"
                 ":warning: **Everything will be offline!**\n"
                 "Use `/startall` to bring it back up."
             ),
@@ -217,29 +287,15 @@ class PowerCog(commands.Cog, name="Power"):
                 break
 
         # Build summary
-        total_vms = 0
-        total_lxcs = 0
-        nodes_to_shutdown = []
-
-        for node_name in NODE_SHUTDOWN_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip:
-                continue
-
-            if node_ip == pihole_node_ip:
-                continue  # Skip the node hosting Pi-hole
-
-            nodes_to_shutdown.append(node_name)
-            vms = await self.ssh.pve_get_running_vms(node_ip)
-            lxcs = await self.ssh.pve_get_running_lxcs(node_ip)
-            total_vms += len(vms)
-            total_lxcs += len(lxcs)
+        nodes_to_shutdown = [
+            name for name in NODE_SHUTDOWN_ORDER
+            if PROXMOX_NODES.get(name) and PROXMOX_NODES[name] != pihole_node_ip
+        ]
 
-        # Count LXCs on Pi-hole's node that will be stopped (excluding Pi-hole)
-        if pihole_node_ip:
-            lxcs_on_pihole_node = await self.ssh.pve_get_running_lxcs(pihole_node_ip)
-            other_lxcs = [l for l in lxcs_on_pihole_node if l['ctid'] != pihole_ctid]
-            total_lxcs += len(other_lxcs)
+        await self.cluster.refresh()
+        running = self._running_guests(exclude_vmids=[pihole_ctid])
+        total_vms = sum(1 for g in running if g.kind == 'qemu')
+        total_lxcs = len(running) - total_vms
 
         await self._confirm_and_execute(
             interaction,
@@ -273,8 +329,8 @@ class PowerCog(commands.Cog, name="Power"):
         online_nodes = []
         offline_nodes = []
 
-        for node_name, node_ip in PROXMOX_NODES.items():
-            is_online = await self.ssh.pve_is_node_online(node_ip)
+        checks = await asyncio.gather(*(is_ready(node_ip) for node_ip in PROXMOX_NODES.values()))
+        for node_name, is_online in zip(PROXMOX_NODES, checks):
             if is_online:
                 online_nodes.append(node_name)
             else:
@@ -305,9 +361,8 @@ class PowerCog(commands.Cog, name="Power"):
                 f"- Offline: {', '.join(offline_nodes) if offline_nodes else 'None'}\n\n"
                 "**Startup order:**\n"
                 "1. Send Wake-on-LAN to offline nodes\n"
-                "2. Wait for nodes to come online (up to 5 min each)\n"
-                "3. Start all LXC containers (Pi-hole first)\n"
-                "4. Start all VMs\n\n"
+                f"2. Wait for all nodes in parallel (up to {NODE_BOOT_TIMEOUT // 60} min)\n"
+                "3. Start LXCs and VMs in parallel, dependencies first (Pi-hole first)\n\n"
                 f":hourglass: This may take 5-10 minutes.{warning_text}"
             ),
             callback=self._perform_startup_all
@@ -398,6 +453,61 @@ class PowerCog(commands.Cog, name="Power"):
             await message.edit(embed=embed)
             await message.clear_reactions()
 
+    # ==================== Guest Orchestration ====================
+
+    def _running_guests(self, exclude_vmids: List[int] = ()) -> List[GuestInfo]:
+        """Running guests from the cluster snapshot."""
+        return [
+            g for g in self.cluster.guests.values()
+            if g.running and g.vmid not in exclude_vmids
+        ]
+
+    def _progress_callback(
+        self,
+        updater: MessageUpdater,
+        embed: discord.Embed,
+        report: PowerOperationReport,
+        phase: str
+    ):
+        """Build an orchestrator callback that streams progress into the status embed."""
+        async def on_progress(outcome: GuestOutcome):
+            report.record(outcome)
+            embed.set_field_at(
+                0, name="Phase",
+                value=f"{phase}\n{report.progress_text()}",
+                inline=False
+            )
+            # Coalesced and sent in the background so guests never wait on Discord
+            updater.update(embed=embed)
+
+        return on_progress
+
+    async def _run_guests(
+        self,
+        updater: MessageUpdater,
+        embed: discord.Embed,
+        report: PowerOperationReport,
+        guests: List[GuestInfo],
+        phase: str,
+        startup: bool
+    ):
+        """Start or stop guests through the orchestrator, streaming progress."""
+        if not guests:
+            return
+
+        report.plan(guests)
+        embed.set_field_at(0, name="Phase", value=f"{phase}\n{report.progress_text()}", inline=False)
+        updater.update(embed=embed)
+
+        on_progress = self._progress_callback(updater, embed, report, phase)
+        run = self.orchestrator.startup if startup else self.orchestrator.shutdown
+        try:
+            await run(guests, on_progress=on_progress)
+        except ValueError as e:
+            # Dependency cycle in the config - nothing was touched
+            logger.error(f"Power orchestration aborted: {e}")
+            report.vms_failures.append(f"Aborted: {e}")
+
     # ==================== Shutdown Implementation ====================
 
     async def _perform_shutdown_all(self, message: discord.Message, channel):
@@ -411,19 +521,17 @@ class PowerCog(commands.Cog, name="Power"):
             color=discord.Color.blue()
         )
         embed.add_field(name="Phase", value=":computer: Preparing...", inline=False)
-        await message.edit(embed=embed)
+        updater = MessageUpdater(message, PROGRESS_EDIT_INTERVAL)
+        updater.update(embed=embed)
 
-        # Phase 1: Stop VMs (in reverse node order - services on node02 first)
-        await self._shutdown_vms(message, embed, report, exclude_node_ips=[])
+        # Phase 1: Stop VMs and LXCs (dependents before their dependencies)
+        await self._shutdown_guests(updater, embed, report, exclude_vmids=[])
 
-        # Phase 2: Stop LXCs
-        await self._shutdown_lxcs(message, embed, report, exclude_ctids=[])
-
-        # Phase 3: Shutdown nodes
-        await self._shutdown_nodes(message, embed, report, exclude_node_ips=[])
+        # Phase 2: Shutdown nodes
+        await self._shutdown_nodes(updater, embed, report, exclude_node_ips=[])
 
         # Final report
-        await message.edit(embed=report.to_embed())
+        await updater.finish(embed=report.to_embed())
 
     async def _perform_shutdown_nodns(self, message: discord.Message, channel):
         """Execute partial shutdown keeping Pi-hole and node01."""
@@ -447,144 +555,84 @@ class PowerCog(commands.Cog, name="Power"):
             color=discord.Color.blue()
         )
         embed.add_field(name="Phase", value=":computer: Preparing...", inline=False)
-        await message.edit(embed=embed)
-
-        # Phase 1: Stop VMs on all nodes except Pi-hole's node
-        # Actually, we stop VMs on ALL nodes since Pi-hole is an LXC, not a VM
-        await self._shutdown_vms(message, embed, report, exclude_node_ips=[])
+        updater = MessageUpdater(message, PROGRESS_EDIT_INTERVAL)
+        updater.update(embed=embed)
 
-        # Phase 2: Stop LXCs except Pi-hole
-        await self._shutdown_lxcs(message, embed, report, exclude_ctids=[pihole_ctid])
+        # Phase 1: Stop all VMs and every LXC except Pi-hole
+        await self._shutdown_guests(updater, embed, report, exclude_vmids=[pihole_ctid])
         report.lxcs_skipped.append(f"pi-hole (CT{pihole_ctid})")
 
-        # Phase 3: Shutdown nodes except Pi-hole's host
-        await self._shutdown_nodes(message, embed, report, exclude_node_ips=[pihole_node_ip])
+        # Phase 2: Shutdown nodes except Pi-hole's host
+        await self._shutdown_nodes(updater, embed, report, exclude_node_ips=[pihole_node_ip])
         report.nodes_skipped.append(f"{kept_node} (Pi-hole host)")
 
         # Final report
-        await message.edit(embed=report.to_embed())
-
-    async def _shutdown_vms(
-        self,
-        message: discord.Message,
-        embed: discord.Embed,
-        report: PowerOperationReport,
-        exclude_node_ips: List[str]
-    ):
-        """Stop all VMs in proper order."""
-        for node_name in NODE_SHUTDOWN_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip or node_ip in exclude_node_ips:
-                continue
-
-            # Check if node is online
-            if not await self.ssh.pve_is_node_online(node_ip):
-                logger.info(f"Node {node_name} is offline, skipping VM shutdown")
-                continue
-
-            embed.set_field_at(
-                0, name="Phase",
-                value=f":computer: Stopping VMs on {node_name}...",
-                inline=False
-            )
-            await message.edit(embed=embed)
-
-            # Get running VMs
-            vms = await self.ssh.pve_get_running_vms(node_ip)
-
-            for vm in vms:
-                vmid = vm['vmid']
-                name = vm['name']
-                report.vms_total += 1
+        await updater.finish(embed=report.to_embed())
 
-                logger.info(f"Stopping VM {name} ({vmid}) on {node_name}")
-                result = await self.ssh.pve_stop_vm(node_ip, vmid)
-
-                if result.success:
-                    report.vms_success += 1
-                    logger.info(f"VM {name} stopped successfully")
-                else:
-                    report.vms_failures.append(f"{name} ({vmid})")
-                    logger.error(f"Failed to stop VM {name}: {result.stderr}")
-
-                # Small delay between VM stops
-                await asyncio.sleep(1)
-
-    async def _shutdown_lxcs(
+    async def _shutdown_guests(
         self,
-        message: discord.Message,
+        updater: MessageUpdater,
         embed: discord.Embed,
         report: PowerOperationReport,
-        exclude_ctids: List[int]
+        exclude_vmids: List[int]
     ):
-        """Stop all LXC containers in proper order."""
-        embed.set_field_at(
-            0, name="Phase",
-            value=":package: Stopping LXC containers...",
-            inline=False
+        """Stop all running VMs and LXCs in parallel, respecting dependencies."""
+        await self.cluster.refresh()
+        guests = self._running_guests(exclude_vmids)
+
+        for vmid in exclude_vmids:
+            guest = self.cluster.get(vmid)
+            if guest and guest.running:
+                logger.info(f"Skipping {guest.name} ({vmid}) - excluded")
+
+        await self._run_guests(
+            updater, embed, report, guests,
+            phase=":computer: Stopping VMs and LXCs...",
+            startup=False
         )
-        await message.edit(embed=embed)
-
-        for node_name in NODE_SHUTDOWN_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip:
-                continue
-
-            # Check if node is online
-            if not await self.ssh.pve_is_node_online(node_ip):
-                logger.info(f"Node {node_name} is offline, skipping LXC shutdown")
-                continue
-
-            # Get running LXCs
-            lxcs = await self.ssh.pve_get_running_lxcs(node_ip)
-
-            for lxc in lxcs:
-                ctid = lxc['ctid']
-                name = lxc['name']
-
-                if ctid in exclude_ctids:
-                    logger.info(f"Skipping LXC {name} ({ctid}) - excluded")
-                    continue
-
-                report.lxcs_total += 1
-
-                logger.info(f"Stopping LXC {name} ({ctid}) on {node_name}")
-                result = await self.ssh.pve_stop_lxc(node_ip, ctid)
-
-                if result.success:
-                    report.lxcs_success += 1
-                    logger.info(f"LXC {name} stopped successfully")
-                else:
-                    report.lxcs_failures.append(f"{name} ({ctid})")
-                    logger.error(f"Failed to stop LXC {name}: {result.stderr}")
-
-                await asyncio.sleep(1)
 
     async def _shutdown_nodes(
         self,
-        message: discord.Message,
+        updater: MessageUpdater,
         embed: discord.Embed,
         report: PowerOperationReport,
         exclude_node_ips: List[str]
     ):
-        """Shutdown Proxmox nodes in proper order."""
-        for node_name in NODE_SHUTDOWN_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip or node_ip in exclude_node_ips:
-                continue
-
+        """
+        Shutdown Proxmox nodes one at a time in NODE_SHUTDOWN_ORDER (all
+        guests are already stopped).
+
+        The last node (Pi-hole's host, which also carries DNS for the SSH
+        path) is held back until the others have gone offline.
+        """
+        targets = [
+            (name, PROXMOX_NODES[name]) for name in NODE_SHUTDOWN_ORDER
+            if PROXMOX_NODES.get(name) and PROXMOX_NODES[name] not in exclude_node_ips
+        ]
+        stopped: List[str] = []
+
+        for index, (node_name, node_ip) in enumerate(targets):
             # Check if node is online
-            if not await self.ssh.pve_is_node_online(node_ip):
+            if not await is_ready(node_ip):
                 logger.info(f"Node {node_name} is already offline")
                 continue
 
+            if index == len(targets) - 1 and stopped:
+                embed.set_field_at(
+                    0, name="Phase",
+                    value=f":hourglass: Waiting for {', '.join(n for n, _ in targets[:-1])} to power off...",
+                    inline=False
+                )
+                updater.update(embed=embed)
+                await self._wait_nodes_offline(stopped)
+
             report.nodes_total += 1
             embed.set_field_at(
                 0, name="Phase",
                 value=f":desktop_computer: Shutting down {node_name}...",
                 inline=False
             )
-            await message.edit(embed=embed)
+            updater.update(embed=embed)
 
             logger.info(f"Shutting down node {node_name} ({node_ip})")
             result = await self.ssh.pve_shutdown_node(node_ip)
@@ -592,13 +640,27 @@ class PowerCog(commands.Cog, name="Power"):
             # Connection reset is expected during shutdown
             if result.success or 'Connection reset' in result.stderr or 'closed' in result.stderr.lower():
                 report.nodes_success += 1
+                stopped.append(node_ip)
                 logger.info(f"Node {node_name} shutdown initiated")
             else:
                 report.nodes_failures.append(node_name)
                 logger.error(f"Failed to shutdown node {node_name}: {result.stderr}")
 
             # Wait between node shutdowns
-            await asyncio.sleep(5)
+            if index < len(targets) - 1:
+                await asyncio.sleep(NODE_SHUTDOWN_GAP)
+
+    async def _wait_nodes_offline(self, node_ips: List[str]):
+        """Wait until the given nodes stop answering, at most NODE_OFFLINE_TIMEOUT seconds."""
+        deadline = time.monotonic() + NODE_OFFLINE_TIMEOUT
+        pending = list(node_ips)
+        while pending and time.monotonic() < deadline:
+            online = await asyncio.gather(*(is_ready(ip) for ip in pending))
+            pending = [ip for ip, up in zip(pending, online) if up]
+            if pending:
+                await asyncio.sleep(5)
+        if pending:
+            logger.warning(f"Nodes still answering after {NODE_OFFLINE_TIMEOUT}s: {', '.join(pending)}")
 
     # ==================== Startup Implementation ====================
 
@@ -612,197 +674,96 @@ class PowerCog(commands.Cog, name="Power"):
             color=discord.Color.blue()
         )
         embed.add_field(name="Phase", value=":satellite: Preparing...", inline=False)
-        await message.edit(embed=embed)
-
-        # Phase 1: Wake nodes via WoL
-        await self._wake_nodes(message, embed, report)
+        updater = MessageUpdater(message, PROGRESS_EDIT_INTERVAL)
+        updater.update(embed=embed)
 
-        # Phase 2: Wait for nodes to come online
-        await self._wait_for_nodes(message, embed, report)
+        # Phase 1: Wake nodes via WoL and wait for them to come online
+        await self._wake_nodes(updater, embed, report)
 
-        # Phase 3: Start LXCs (Pi-hole first for DNS)
-        await self._start_lxcs(message, embed, report)
-
-        # Phase 4: Start VMs
-        await self._start_vms(message, embed, report)
+        # Phase 2: Start LXCs and VMs (Pi-hole first for DNS)
+        await self._start_guests(updater, embed, report)
 
         # Final report
-        await message.edit(embed=report.to_embed())
+        await updater.finish(embed=report.to_embed())
 
     async def _wake_nodes(
         self,
-        message: discord.Message,
-        embed: discord.Embed,
-        report: PowerOperationReport
-    ):
-        """Send WoL packets to all offline nodes."""
-        for node_name in NODE_STARTUP_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip:
-                continue
-
-            # Check if already online
-            if await self.ssh.pve_is_node_online(node_ip):
-                logger.info(f"Node {node_name} is already online")
-                continue
-
-            mac = WOL_MAC_ADDRESSES.get(node_name)
-            if not mac or mac == 'TBD':
-                logger.warning(f"No MAC address configured for {node_name}")
-                report.nodes_failures.append(f"{node_name} (no MAC)")
-                continue
-
-            report.nodes_total += 1
-            embed.set_field_at(
-                0, name="Phase",
-                value=f":satellite: Sending WoL to {node_name}...",
-                inline=False
-            )
-            await message.edit(embed=embed)
-
-            logger.info(f"Sending WoL to {node_name} ({mac})")
-            result = await self.ssh.send_wol(mac, WOL_BROADCAST)
-
-            if not result.success:
-                logger.error(f"Failed to send WoL to {node_name}: {result.stderr}")
-                # Don't count as failure yet - we'll check if it comes online
-
-            # Small delay between WoL packets
-            await asyncio.sleep(1)
-
-    async def _wait_for_nodes(
-        self,
-        message: discord.Message,
+        updater: MessageUpdater,
         embed: discord.Embed,
         report: PowerOperationReport
     ):
-        """Wait for all nodes to come online."""
-        for node_name in NODE_STARTUP_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip:
-                continue
-
-            # Check if already online
-            if await self.ssh.pve_is_node_online(node_ip):
-                if report.nodes_total > 0:
-                    # Only count if we tried to wake it
-                    pass
-                else:
-                    report.nodes_total += 1
-                report.nodes_success += 1
-                logger.info(f"Node {node_name} is online")
-                continue
-
-            # Skip if we didn't try to wake it (no MAC)
-            mac = WOL_MAC_ADDRESSES.get(node_name)
-            if not mac or mac == 'TBD':
-                continue
-
-            embed.set_field_at(
-                0, name="Phase",
-                value=f":hourglass: Waiting for {node_name} to come online...",
-                inline=False
-            )
-            await message.edit(embed=embed)
-
-            is_online = await self.ssh.wait_for_node_online(node_ip, timeout=300)
-            if is_online:
-                report.nodes_success += 1
-            else:
-                report.nodes_failures.append(f"{node_name} (timeout)")
+        """Wake all offline nodes at once and wait for them in parallel."""
+        nodes = {
+            name: (PROXMOX_NODES[name], WOL_MAC_ADDRESSES.get(name))
+            for name in NODE_STARTUP_ORDER if PROXMOX_NODES.get(name)
+        }
+        waiting = set(nodes)
 
-    async def _start_lxcs(
-        self,
-        message: discord.Message,
-        embed: discord.Embed,
-        report: PowerOperationReport
-    ):
-        """Start LXC containers in priority order."""
         embed.set_field_at(
             0, name="Phase",
-            value=":package: Starting LXC containers...",
+            value=":satellite: Waking offline nodes and waiting for them to come online...",
             inline=False
         )
-        await message.edit(embed=embed)
-
-        # Start in priority order
-        for name, node_ip, ctid in LXC_STARTUP_ORDER:
-            # Check if node is online
-            if not await self.ssh.pve_is_node_online(node_ip):
-                logger.warning(f"Node for LXC {name} is offline, skipping")
-                report.lxcs_failures.append(f"{name} (node offline)")
-                continue
-
-            # Check if already running
-            if await self.ssh.lxc_is_running(node_ip, ctid):
-                logger.info(f"LXC {name} is already running")
-                continue
+        updater.update(embed=embed)
 
-            report.lxcs_total += 1
+        async def on_ready(result: WakeResult):
+            waiting.discard(result.name)
+            if waiting:
+                embed.set_field_at(
+                    0, name="Phase",
+                    value=f":hourglass: Waiting for {', '.join(sorted(waiting))} to come online...",
+                    inline=False
+                )
+                updater.update(embed=embed)
 
-            logger.info(f"Starting LXC {name} ({ctid})")
-            result = await self.ssh.pve_start_lxc(node_ip, ctid)
+        results = await wake_and_wait(nodes, WOL_BROADCAST, timeout=NODE_BOOT_TIMEOUT, on_ready=on_ready)
 
-            if result.success:
-                report.lxcs_success += 1
-                logger.info(f"LXC {name} started successfully")
+        for result in results.values():
+            report.nodes_total += 1
+            if result.ready:
+                report.nodes_success += 1
+                if result.boot_time is not None:
+                    report.boot_times[result.name] = result.boot_time
+                logger.info(f"Node {result.name} is online")
             else:
-                report.lxcs_failures.append(f"{name} ({ctid})")
-                logger.error(f"Failed to start LXC {name}: {result.stderr}")
-
-            # Brief delay to allow service initialization
-            await asyncio.sleep(3)
+                report.nodes_failures.append(f"{result.name} ({result.error})")
 
-    async def _start_vms(
+    async def _start_guests(
         self,
-        message: discord.Message,
+        updater: MessageUpdater,
         embed: discord.Embed,
         report: PowerOperationReport
     ):
-        """Start all VMs in proper order."""
-        for node_name in NODE_STARTUP_ORDER:
-            node_ip = PROXMOX_NODES.get(node_name)
-            if not node_ip:
-                continue
+        """Start managed LXCs and all VMs in parallel, dependencies first."""
+        await self.cluster.refresh()
+        managed_ctids = {ctid for _, ctid in LXC_CONTAINERS.values()}
 
-            # Check if node is online
-            if not await self.ssh.pve_is_node_online(node_ip):
-                logger.warning(f"Node {node_name} is offline, skipping VM startup")
+        guests = []
+        for guest in sorted(self.cluster.guests.values(), key=lambda g: g.vmid):
+            if guest.template or (guest.kind == 'lxc' and guest.vmid not in managed_ctids):
+                continue
+            if guest.running:
+                logger.info(f"{guest.name} ({guest.vmid}) is already running")
                 continue
 
-            embed.set_field_at(
-                0, name="Phase",
-                value=f":computer: Starting VMs on {node_name}...",
-                inline=False
-            )
-            await message.edit(embed=embed)
-
-            # Get all VMs (including stopped)
-            vms = await self.ssh.pve_get_all_vms(node_ip)
-
-            for vm in vms:
-                vmid = vm['vmid']
-                name = vm['name']
-                status = vm['status']
-
-                if status == 'running':
-                    logger.info(f"VM {name} is already running")
-                    continue
-
-                report.vms_total += 1
-
-                logger.info(f"Starting VM {name} ({vmid}) on {node_name}")
-                result = await self.ssh.pve_start_vm(node_ip, vmid)
+            node = self.cluster.nodes.get(guest.node)
+            if not node or not node.online:
+                logger.warning(f"Node for {guest.name} is offline, skipping")
+                failures = report.vms_failures if guest.kind == 'qemu' else report.lxcs_failures
+                failures.append(f"{guest.name} (node offline)")
+                continue
+            guests.append(guest)
 
-                if result.success:
-                    report.vms_success += 1
-                    logger.info(f"VM {name} started successfully")
-                else:
-                    report.vms_failures.append(f"{name} ({vmid})")
-                    logger.error(f"Failed to start VM {name}: {result.stderr}")
+        # Managed LXCs whose node didn't report at all
+        for name, (node_ip, ctid) in LXC_CONTAINERS.items():
+            if ctid not in self.cluster.guests:
+                report.lxcs_failures.append(f"{name} (node offline)")
 
-                # Brief delay between VM starts
-                await asyncio.sleep(2)
+        await self._run_guests(
+            updater, embed, report, guests,
+            phase=":arrow_forward: Starting LXCs and VMs...",
+            startup=True
+        )
 
 
 async def setup(bot: 'SentinelBot'):
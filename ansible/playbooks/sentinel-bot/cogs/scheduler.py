@@ -30,7 +30,8 @@ class SchedulerCog(commands.Cog, name="Scheduler"):
     async def cog_load(self):
         """Called when cog is loaded. Start scheduled tasks."""
         self.daily_update_report.start()
-        self.download_progress_check.start()
+        if self.bot.download_events:
+            self.bot.download_events.subscribe(self._on_download_event)
         self.failed_download_check.start()
         self.stale_task_cleanup.start()
         self.daily_onboarding_report.start()
@@ -39,7 +40,8 @@ class SchedulerCog(commands.Cog, name="Scheduler"):
     async def cog_unload(self):
         """Called when cog is unloaded. Stop scheduled tasks."""
         self.daily_update_report.cancel()
-        self.download_progress_check.cancel()
+        if self.bot.download_events:
+            self.bot.download_events.unsubscribe(self._on_download_event)
         self.failed_download_check.cancel()
         self.stale_task_cleanup.cancel()
         self.daily_onboarding_report.cancel()
@@ -101,126 +103,30 @@ class SchedulerCog(commands.Cog, name="Scheduler"):
         await self.bot.wait_until_ready()
 
     async def _check_all_updates(self) -> List[Dict]:
-        """Check all containers for available updates."""
-        updates = []
-
-        # Group containers by host
-        hosts: Dict[str, List[str]] = {}
-        for container, host_ip in CONTAINER_HOSTS.items():
-            if host_ip not in hosts:
-                hosts[host_ip] = []
-            hosts[host_ip].append(container)
-
-        for host_ip, containers in hosts.items():
-            for container in containers:
-                # Check for updates (simplified - real impl would check digests)
-                # This would compare local image digest with remote
-                has_update = await self._check_container_update(host_ip, container)
-                if has_update:
-                    updates.append({
-                        'container': container,
-                        'host': host_ip,
-                    })
-
-        return updates
-
-    async def _check_container_update(self, host: str, container: str) -> bool:
-        """Check if a container has an available update."""
-        # Simplified check - real implementation would:
-        # 1. Get current image digest
-        # 2. Check remote registry for newer digest
-        # 3. Compare and return True if different
-        return False  # Placeholder
-
-    # ==================== Download Progress Check (Every 60s) ====================
-
-    @tasks.loop(seconds=60)
-    async def download_progress_check(self):
-        """Check download progress and send milestone notifications."""
-        try:
-            await self._check_radarr_progress()
-            await self._check_sonarr_progress()
-        except Exception as e:
-            logger.error(f"Download progress check failed: {e}")
-
-    @download_progress_check.before_loop
-    async def before_download_progress_check(self):
-        """Wait for bot to be ready."""
-        await self.bot.wait_until_ready()
-        # Wait a bit for other systems to initialize
-        await asyncio.sleep(30)
-
-    async def _check_radarr_progress(self):
-        """Check Radarr download progress."""
-        url = f"{self.bot.config.api.radarr_url}/api/v3/queue"
-        data = await self.bot.api_get(url, 'radarr')
-
-        if not data:
-            return
-
-        for item in data.get('records', []):
-            download_id = str(item.get('id'))
-            title = item.get('title', 'Unknown')
-            progress = item.get('sizeleft', 0)
-            size = item.get('size', 1)
-
-            if size > 0:
-                percent_complete = ((size - progress) / size) * 100
-            else:
-                percent_complete = 0
-
-            await self._notify_progress(download_id, title, 'movie', percent_complete)
-
-    async def _check_sonarr_progress(self):
-        """Check Sonarr download progress."""
-        url = f"{self.bot.config.api.sonarr_url}/api/v3/queue"
-        data = await self.bot.api_get(url, 'sonarr')
+        """Check all container hosts for images with a newer registry digest."""
+        report = await self.bot.update_checker.check(CONTAINER_HOSTS.values())
+        for error in report.errors:
+            logger.warning(f"Update check: {error}")
 
-        if not data:
-            return
-
-        for item in data.get('records', []):
-            download_id = str(item.get('id'))
-            title = item.get('title', 'Unknown')
-            progress = item.get('sizeleft', 0)
-            size = item.get('size', 1)
-
-            if size > 0:
-                percent_complete = ((size - progress) / size) * 100
-            else:
-                percent_complete = 0
+        return [
+            {'container': update.container, 'host': update.host}
+            for update in report.updates
+        ]
 
-            await self._notify_progress(download_id, title, 'episode', percent_complete)
+    # ==================== Download Progress (Event Driven) ====================
 
-    async def _notify_progress(self, download_id: str, title: str, media_type: str, percent: float):
-        """Send progress notification at milestones."""
-        milestones = [50, 80, 100]
-
-        if not self.bot.db:
+    async def _on_download_event(self, event: Dict):
+        """Send milestone notifications from the download event service."""
+        if event['kind'] not in ('progress', 'completed') or not self.bot.channel_router:
             return
 
-        # Ensure download is being tracked (creates record if not exists)
-        await self.bot.db.start_download_tracking(download_id, media_type, title)
-
-        # Get already notified milestones
-        notified = await self.bot.db.get_download_milestones(download_id)
-
-        for milestone in milestones:
-            if percent >= milestone and milestone not in notified:
-                # Record milestone
-                await self.bot.db.add_download_milestone(download_id, milestone)
-
-                # Send notification
-                if self.bot.channel_router:
-                    emoji = ":clapper:" if media_type == 'movie' else ":tv:"
-                    if milestone == 100:
-                        msg = f"{emoji} **{title}** download complete!"
-                        await self.bot.db.complete_download(download_id)
-                    else:
-                        msg = f"{emoji} **{title}** - {milestone}% complete"
+        emoji = ":clapper:" if event['media_type'] == 'movie' else ":tv:"
+        if event['kind'] == 'completed':
+            msg = f"{emoji} **{event['title']}** download complete!"
+        else:
+            msg = f"{emoji} **{event['title']}** - {event['milestone']}% complete"
 
-                    await self.bot.channel_router.send('media', content=msg)
-                break
+        await self.bot.channel_router.send('media', content=msg)
 
     # ==================== Failed Download Check (Every 5 min) ====================
 
@@ -241,13 +147,9 @@ class SchedulerCog(commands.Cog, name="Scheduler"):
 
     async def _check_radarr_failures(self):
         """Check Radarr queue for failed downloads."""
-        url = f"{self.bot.config.api.radarr_url}/api/v3/queue"
-        data = await self.bot.api_get(url, 'radarr')
-
-        if not data:
-            return
+        records = await self.bot.queues['radarr'].read()
 
-        for item in data.get('records', []):
+        for item in records or []:
             status = item.get('status', '').lower()
             if status in ['failed', 'warning']:
                 queue_id = item.get('id')
@@ -259,13 +161,9 @@ class SchedulerCog(commands.Cog, name="Scheduler"):
 
     async def _check_sonarr_failures(self):
         """Check Sonarr queue for failed downloads."""
-        url = f"{self.bot.config.api.sonarr_url}/api/v3/queue"
-        data = await self.bot.api_get(url, 'sonarr')
-
-        if not data:
-            return
+        records = await self.bot.queues['sonarr'].read()
 
-        for item in data.get('records', []):
+        for item in records or []:
             status = item.get('status', '').lower()
             if status in ['failed', 'warning']:
                 queue_id = item.get('id')
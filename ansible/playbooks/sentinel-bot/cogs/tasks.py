@@ -236,13 +236,12 @@ class TasksCog(commands.Cog, name="Tasks"):
         # 2 steps: get stats, get instances
         progress = ProgressEmbed(":bar_chart: Loading Task Statistics...", 2)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         progress.update(0, ":hourglass: Fetching task statistics...")
-        await status_msg.edit(embed=progress.embed)
         stats = await self.db.get_task_stats()
 
         progress.update(1, ":hourglass: Fetching active instances...")
-        await status_msg.edit(embed=progress.embed)
         instances = await self.db.get_active_instances(minutes=60)
 
         # Build final embed
@@ -281,7 +280,7 @@ class TasksCog(commands.Cog, name="Tasks"):
                 inline=True
             )
 
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
 
 async def setup(bot: 'SentinelBot'):
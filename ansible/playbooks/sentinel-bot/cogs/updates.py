@@ -47,48 +47,51 @@ class UpdatesCog(commands.Cog, name="Updates"):
         """Scan all containers for available image updates."""
         await interaction.response.defer()
 
-        # Group containers by host
-        hosts = {}
-        for container, host_ip in CONTAINER_HOSTS.items():
-            if host_ip not in hosts:
-                hosts[host_ip] = []
-            hosts[host_ip].append(container)
-
+        hosts = set(CONTAINER_HOSTS.values())
         total_hosts = len(hosts)
-        progress = ProgressEmbed(":mag: Checking for Container Updates...", total_hosts)
+        progress = ProgressEmbed(":mag: Checking for Container Updates...", 1)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
-        updates_available = []
-        errors = []
-        checked = 0
-
-        for host_ip, containers in hosts.items():
-            progress.update(checked, f":hourglass: Checking **{host_ip}** ({len(containers)} containers)...")
-            await status_msg.edit(embed=progress.embed)
-
-            result = await self.ssh.docker_ps_all(host_ip)
-            if not result.success:
-                errors.append(f"**{host_ip}**: Connection failed")
-            checked += 1
+        progress.update(0, f":hourglass: Comparing image digests on {total_hosts} hosts with their registries...")
+        report = await self.bot.update_checker.check(hosts)
+        updates_available = report.updates[:len(NUMBER_EMOJIS)]
 
         # Final result
         if updates_available:
+            lines = [
+                f"{NUMBER_EMOJIS[i]} {u.container} on {u.host} (`{u.image}`)"
+                for i, u in enumerate(updates_available)
+            ]
+            if len(report.updates) > len(updates_available):
+                lines.append(f"...and {len(report.updates) - len(updates_available)} more")
             embed = progress.complete(
                 ":arrow_up: Updates Available",
-                "\n".join([f"• {u['container']} on {u['host']}" for u in updates_available]),
+                "\n".join(lines),
                 discord.Color.yellow()
             )
-            embed.set_footer(text=f"React with {APPROVE_ALL_EMOJI} to update all")
+            embed.set_footer(text=f"React with {APPROVE_ALL_EMOJI} to update all, or a number for one")
         else:
             embed = progress.complete(
                 ":white_check_mark: Update Check Complete",
-                f"All containers are up to date!\nChecked {total_hosts} hosts."
+                f"All containers are up to date!\nChecked {report.checked} containers on {total_hosts} hosts."
             )
 
-        if errors:
-            embed.add_field(name=":warning: Errors", value="\n".join(errors), inline=False)
+        if report.skipped:
+            embed.add_field(name="Skipped", value=f"{report.skipped} pinned or locally built", inline=True)
+        if report.errors:
+            embed.add_field(name=":warning: Errors", value="\n".join(report.errors)[:1024], inline=False)
+
+        await progress.finish()
 
-        await status_msg.edit(embed=embed)
+        if updates_available:
+            self._pending_updates[status_msg.id] = {
+                'containers': [(u.container, u.host) for u in updates_available],
+                'channel_id': interaction.channel_id,
+            }
+            await status_msg.add_reaction(APPROVE_ALL_EMOJI)
+            for i in range(len(updates_available)):
+                await status_msg.add_reaction(NUMBER_EMOJIS[i])
 
     @app_commands.command(name="update", description="Update a specific container")
     @app_commands.describe(container="Container name to update")
@@ -106,48 +109,54 @@ class UpdatesCog(commands.Cog, name="Updates"):
         progress = ProgressEmbed(f":arrows_counterclockwise: Updating {container}", 3)
         progress.embed.add_field(name="Host", value=host_ip, inline=True)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         # Step 1: Pull new image
         progress.update(0, ":hourglass: Pulling latest image...")
-        await status_msg.edit(embed=progress.embed)
 
-        result = await self.ssh.docker_pull(host_ip, container)
+        async def show_pull_progress(lines: List[str]):
+            # Show the latest pull line; the updater coalesces the edits
+            progress.update(0, f":hourglass: Pulling latest image...\n`{lines[-1][:100]}`")
+
+        result = await self.ssh.docker_pull(host_ip, container, on_output=show_pull_progress)
         if not result.success:
-            embed = progress.error(f":x: Update Failed: {container}", f"Failed to pull image: {result.stderr}")
-            await status_msg.edit(embed=embed)
+            progress.error(f":x: Update Failed: {container}", f"Failed to pull image: {result.stderr}")
+            await progress.finish()
             return
 
         # Step 2: Restart container
         progress.update(1, ":hourglass: Restarting container...")
-        await status_msg.edit(embed=progress.embed)
 
         result = await self.ssh.docker_restart(host_ip, container)
         if not result.success:
-            embed = progress.error(f":x: Update Failed: {container}", f"Restart failed: {result.stderr}")
+            progress.error(f":x: Update Failed: {container}", f"Restart failed: {result.stderr}")
             if self.db:
                 await self.db.record_update(container, host_ip, 'failed', str(interaction.user))
-            await status_msg.edit(embed=embed)
+            await progress.finish()
             return
 
         # Step 3: Verify
         progress.update(2, ":hourglass: Verifying...")
-        await status_msg.edit(embed=progress.embed)
 
         # Record success
         if self.db:
             await self.db.record_update(container, host_ip, 'success', str(interaction.user))
 
-        embed = progress.complete(
+        progress.complete(
             f":white_check_mark: {container} Updated",
             "Container updated and restarted successfully"
         )
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
     @app_commands.command(name="containers", description="List all monitored containers")
-    async def list_containers(self, interaction: discord.Interaction):
-        """List all containers being monitored."""
+    @app_commands.describe(refresh="Poll Docker hosts now instead of using the latest snapshot")
+    async def list_containers(self, interaction: discord.Interaction, refresh: bool = False):
+        """List all containers being monitored, with their last polled state."""
         await interaction.response.defer()
 
+        poller = self.bot.poller
+        await (poller.refresh('docker') if refresh else poller.ensure('docker'))
+
         # Group by host
         hosts = {}
         for container, host_ip in CONTAINER_HOSTS.items():
@@ -161,13 +170,29 @@ class UpdatesCog(commands.Cog, name="Updates"):
         )
 
         for host_ip, containers in sorted(hosts.items()):
+            entry = poller.store.get(f'docker:{host_ip}')
+            states = dict(entry.data) if entry and entry.ok else None
+
+            lines = []
+            for c in sorted(containers):
+                if states is None:
+                    lines.append(f"• {c}")
+                elif states.get(c, '').startswith('Up'):
+                    lines.append(f":green_circle: {c}")
+                elif c in states:
+                    lines.append(f":red_circle: {c}")
+                else:
+                    lines.append(f":white_circle: {c}")
+
             embed.add_field(
                 name=f":computer: {host_ip}",
-                value="\n".join([f"• {c}" for c in sorted(containers)]),
+                value="\n".join(lines),
                 inline=True
             )
 
-        embed.set_footer(text=f"Total: {len(CONTAINER_HOSTS)} containers")
+        embed.set_footer(
+            text=f"Total: {len(CONTAINER_HOSTS)} containers • {poller.staleness('docker')}"
+        )
         await interaction.followup.send(embed=embed)
 
     @app_commands.command(name="restart", description="Restart a container")
@@ -185,28 +210,27 @@ class UpdatesCog(commands.Cog, name="Updates"):
         progress = ProgressEmbed(f":arrows_counterclockwise: Restarting {container}", 2)
         progress.embed.add_field(name="Host", value=host_ip, inline=True)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         # Step 1: Stop
         progress.update(0, ":hourglass: Restarting container...")
-        await status_msg.edit(embed=progress.embed)
 
         result = await self.ssh.docker_restart(host_ip, container)
 
         if result.success:
             progress.update(1, ":hourglass: Verifying...")
-            await status_msg.edit(embed=progress.embed)
 
-            embed = progress.complete(
+            progress.complete(
                 f":white_check_mark: {container} Restarted",
                 "Container restarted successfully"
             )
         else:
-            embed = progress.error(
+            progress.error(
                 f":x: Restart Failed: {container}",
                 result.stderr
             )
 
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
     @app_commands.command(name="logs", description="Get container logs")
     @app_commands.describe(container="Container name", lines="Number of lines (default 50)")
@@ -252,29 +276,32 @@ class UpdatesCog(commands.Cog, name="Updates"):
         total_vms = len(VM_HOSTS)
         progress = ProgressEmbed(":mag: Checking VMs for Updates...", total_vms)
         status_msg = await interaction.followup.send(embed=progress.embed)
+        progress.attach(status_msg)
 
         updates_found = []
         errors = []
         checked = 0
 
-        for name, host_ip in VM_HOSTS.items():
-            progress.update(checked, f":hourglass: Checking **{name}** ({host_ip})...")
-            await status_msg.edit(embed=progress.embed)
+        names = {host_ip: name for name, host_ip in VM_HOSTS.items()}
+        progress.update(checked, f":hourglass: Checking {total_vms} VMs...")
 
-            # Run apt update
-            update_result = await self.ssh.apt_update(host_ip)
-            if not update_result.success:
+        # apt update and the upgradable listing run as one command per VM
+        command = (
+            'sudo apt update >/dev/null 2>&1 || { echo "apt update failed" >&2; exit 1; }; '
+            'apt list --upgradable 2>/dev/null | tail -n +2'
+        )
+        async for host_ip, result in self.ssh.as_completed(
+            {host_ip: command for host_ip in names}, timeout=180
+        ):
+            name = names[host_ip]
+            if not result.success:
                 errors.append(f"**{name}**: Connection failed")
-                checked += 1
-                continue
-
-            # Check for upgradable packages
-            result = await self.ssh.apt_upgradable(host_ip)
-            if result.success and result.output.strip():
-                count = len(result.output.strip().split('\n'))
+            elif result.stdout.strip():
+                count = len(result.stdout.strip().split('\n'))
                 updates_found.append(f"**{name}** ({host_ip}): {count} packages")
 
             checked += 1
+            progress.update(checked, f":white_check_mark: **{name}** ({host_ip}) checked")
 
         # Final result
         if updates_found:
@@ -293,7 +320,7 @@ class UpdatesCog(commands.Cog, name="Updates"):
             embed.add_field(name=":warning: Errors", value="\n".join(errors), inline=False)
 
         embed.set_footer(text=f"Checked {total_vms} VMs")
-        await status_msg.edit(embed=embed)
+        await progress.finish()
 
     # ==================== Reaction Handler ====================
 
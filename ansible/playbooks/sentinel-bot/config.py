@@ -22,6 +22,10 @@ class DiscordConfig:
     channel_claude_tasks: str
     channel_announcements: str
 
+    # Outbound notifications
+    notify_batch_window: float  # seconds to collect events before merging them
+    notify_digest_minutes: int  # 0 = off, else low-priority events are rolled up
+
 
 @dataclass
 class APIConfig:
@@ -58,6 +62,14 @@ class APIConfig:
     # Prometheus
     prometheus_url: str
 
+    # Proxmox API (token auth; SSH is used when unset or unreachable)
+    proxmox_token_id: str
+    proxmox_token_secret: str
+    proxmox_api_port: int
+    proxmox_api_scheme: str
+    proxmox_verify_ssl: bool
+    cluster_snapshot_interval: int
+
 
 @dataclass
 class SSHConfig:
@@ -77,11 +89,24 @@ class SSHConfig:
     authentik_ip: str
     ansible_ip: str
 
+    # Connection pool
+    keepalive_interval: int = 15
+    keepalive_count_max: int = 3
+    max_connections_per_host: int = 2
+    max_channels_per_connection: int = 8
+    idle_timeout: int = 300
+
+    # Multi-host fan-out limits
+    fanout_concurrency: int = 16
+    fanout_per_host: int = 4
+
 
 @dataclass
 class WebhookConfig:
     port: int
     api_key: str
+    workers: int     # webhook events processed concurrently
+    queue_size: int  # accepted events waiting to be processed
 
 
 @dataclass
@@ -112,6 +137,8 @@ def load_config() -> Config:
         channel_project_management=os.environ.get('CHANNEL_PROJECT_MANAGEMENT', 'project-management'),
         channel_claude_tasks=os.environ.get('CHANNEL_CLAUDE_TASKS', 'claude-tasks'),
         channel_announcements=os.environ.get('CHANNEL_ANNOUNCEMENTS', 'announcements'),
+        notify_batch_window=float(os.environ.get('NOTIFY_BATCH_WINDOW', 3)),
+        notify_digest_minutes=int(os.environ.get('NOTIFY_DIGEST_MINUTES', 0)),
     )
 
     api = APIConfig(
@@ -132,6 +159,12 @@ def load_config() -> Config:
         opnsense_api_key=os.environ.get('OPNSENSE_API_KEY', ''),
         opnsense_api_secret=os.environ.get('OPNSENSE_API_SECRET', ''),
         prometheus_url=os.environ.get('PROMETHEUS_URL', 'http://192.168.40.13:9090'),
+        proxmox_token_id=os.environ.get('PROXMOX_TOKEN_ID', ''),
+        proxmox_token_secret=os.environ.get('PROXMOX_TOKEN_SECRET', ''),
+        proxmox_api_port=int(os.environ.get('PROXMOX_API_PORT', 8006)),
+        proxmox_api_scheme=os.environ.get('PROXMOX_API_SCHEME', 'https'),
+        proxmox_verify_ssl=os.environ.get('PROXMOX_VERIFY_SSL', '').lower() == 'true',
+        cluster_snapshot_interval=int(os.environ.get('CLUSTER_SNAPSHOT_INTERVAL', 30)),
     )
 
     ssh = SSHConfig(
@@ -148,11 +181,20 @@ def load_config() -> Config:
         traefik_ip=os.environ.get('TRAEFIK_IP', '192.168.40.20'),
         authentik_ip=os.environ.get('AUTHENTIK_IP', '192.168.40.21'),
         ansible_ip=os.environ.get('ANSIBLE_IP', '192.168.20.30'),
+        keepalive_interval=int(os.environ.get('SSH_KEEPALIVE_INTERVAL', 15)),
+        keepalive_count_max=int(os.environ.get('SSH_KEEPALIVE_COUNT_MAX', 3)),
+        max_connections_per_host=int(os.environ.get('SSH_MAX_CONNECTIONS_PER_HOST', 2)),
+        max_channels_per_connection=int(os.environ.get('SSH_MAX_CHANNELS_PER_CONNECTION', 8)),
+        idle_timeout=int(os.environ.get('SSH_IDLE_TIMEOUT', 300)),
+        fanout_concurrency=int(os.environ.get('SSH_FANOUT_CONCURRENCY', 16)),
+        fanout_per_host=int(os.environ.get('SSH_FANOUT_PER_HOST', 4)),
     )
 
     webhook = WebhookConfig(
         port=int(os.environ.get('WEBHOOK_PORT', 5050)),
         api_key=os.environ.get('API_KEY', 'sentinel-secret-key'),
+        workers=int(os.environ.get('WEBHOOK_WORKERS', 4)),
+        queue_size=int(os.environ.get('WEBHOOK_QUEUE_SIZE', 1000)),
     )
 
     database = DatabaseConfig(
@@ -242,3 +284,53 @@ PROXMOX_NODES = {
     'node02': '192.168.20.21',
     'node03': '192.168.20.22',
 }
+
+# LXC containers for apt updates and power management
+# Format: name -> (proxmox_node_ip, ctid)
+LXC_CONTAINERS = {
+    'pbs': ('192.168.20.22', 100),              # node03 - Proxmox Backup Server
+    'docker-lxc-glance': ('192.168.20.22', 200), # node03 - Glance dashboard
+    'pi-hole': ('192.168.20.20', 202),          # node01 - DNS server
+    'homeassistant': ('192.168.20.22', 206),    # node03 - Home Assistant
+}
+
+# LXCs that must stay up for the rest of the homelab to work
+CRITICAL_LXCS = {
+    'pi-hole': LXC_CONTAINERS['pi-hole'],
+}
+
+# ==================== Power Management ====================
+
+# Wake-on-LAN
+WOL_MAC_ADDRESSES = {
+    'node01': '38:05:25:32:82:76',
+    'node02': '84:47:09:4d:7a:ca',
+    'node03': 'd8:43:ae:a8:4c:a7',
+}
+WOL_BROADCAST = '192.168.20.255'
+
+# Node power order (the node hosting Pi-hole goes down last and comes up first)
+NODE_SHUTDOWN_ORDER = ['node03', 'node02', 'node01']
+NODE_STARTUP_ORDER = ['node01', 'node02', 'node03']
+
+# Guests (by VMID) every other guest depends on: started first, stopped last
+POWER_FOUNDATION = [ctid for _, ctid in CRITICAL_LXCS.values()]
+
+# Guest dependency graph by Proxmox guest name: guest -> guests it needs running.
+# Dependencies start before and stop after their dependents; names not present
+# in the cluster are ignored.
+POWER_DEPENDENCIES = {
+    'authentik-vm01': ['traefik-vm01'],
+    'immich-vm01': ['traefik-vm01'],
+    'gitlab-vm01': ['traefik-vm01'],
+    'gitlab-runner-vm01': ['gitlab-vm01'],
+    'docker-vm-media01': ['traefik-vm01'],
+    'docker-vm-utilities01': ['traefik-vm01'],
+}
+
+# Parallelism and per-guest timeouts (seconds) for power operations
+POWER_NODE_CONCURRENCY = 3
+POWER_GLOBAL_CONCURRENCY = 8
+GUEST_SHUTDOWN_TIMEOUT = 120
+GUEST_START_TIMEOUT = 120
+NODE_BOOT_TIMEOUT = 300
@@ -4,6 +4,7 @@ Consolidated Discord bot for homelab management.
 """
 
 import logging
+from functools import partial
 import discord
 from discord.ext import commands
 from typing import Optional, Dict, Any
@@ -49,6 +50,12 @@ class SentinelBot(commands.Bot):
         # Database and SSH manager will be initialized in setup_hook
         self.db = None
         self.ssh = None
+        self.cluster = None
+        self.poller = None
+        self.update_checker = None
+        self.download_events = None
+        self.queues: Dict[str, Any] = {}
+        self.library = None
         self.channel_router = None
 
     async def setup_hook(self) -> None:
@@ -63,13 +70,61 @@ class SentinelBot(commands.Bot):
         self.db = Database(self.config.database.path)
         await self.db.initialize()
 
-        # Initialize SSH manager
+        # Initialize SSH manager (Proxmox calls go through the API when a token is set)
         from .ssh_manager import SSHManager
-        self.ssh = SSHManager(self.config.ssh)
+        pve_api = None
+        if self.config.api.proxmox_token_id and self.config.api.proxmox_token_secret:
+            from .proxmox_api import ProxmoxAPI
+            pve_api = ProxmoxAPI(
+                self.config.api.proxmox_token_id,
+                self.config.api.proxmox_token_secret,
+                port=self.config.api.proxmox_api_port,
+                verify_ssl=self.config.api.proxmox_verify_ssl,
+                scheme=self.config.api.proxmox_api_scheme,
+            )
+            logger.info("Proxmox API client enabled")
+        self.ssh = SSHManager(self.config.ssh, pve_api=pve_api)
+
+        # Cluster-wide guest index, refreshed in the background
+        from .cluster_snapshot import ClusterSnapshot
+        from config import PROXMOX_NODES
+        self.cluster = ClusterSnapshot(
+            self.ssh,
+            PROXMOX_NODES,
+            interval=self.config.api.cluster_snapshot_interval
+        )
+        self.cluster.start()
+
+        # Background poller feeding status commands from memory
+        from .state_poller import StatePoller
+        self.poller = StatePoller(self.ssh, self.config.ssh)
+        self.poller.start()
+
+        # Registry digest checks for container updates
+        from .update_checker import UpdateChecker
+        self.update_checker = UpdateChecker(self.ssh)
+
+        # Paged Radarr/Sonarr queue reads with cached movie/series details
+        from .queue_reader import QueueReader
+        self.queues = {
+            service: QueueReader(service, partial(self.arr_get, service))
+            for service in ('radarr', 'sonarr')
+        }
+
+        # Radarr/Sonarr download events from webhooks and on-demand queue polls
+        from .download_events import DownloadEventService
+        self.download_events = DownloadEventService(self)
+        self.download_events.start()
+
+        # Movie/series catalog index for library commands
+        from .library_index import LibraryIndex
+        self.library = LibraryIndex(self.arr_get)
+        self.library.start()
 
         # Initialize channel router
         from .channel_router import ChannelRouter
         self.channel_router = ChannelRouter(self, self.config.discord)
+        self.channel_router.start()
 
         # Load cogs
         await self._load_cogs()
@@ -105,6 +160,7 @@ class SentinelBot(commands.Bot):
             'cogs.tasks',
             'cogs.onboarding',
             'cogs.scheduler',
+            'cogs.power',
         ]
 
         for cog in cogs:
@@ -141,9 +197,30 @@ class SentinelBot(commands.Bot):
         """Clean up resources when shutting down."""
         logger.info("Sentinel Bot shutting down...")
 
+        if self.channel_router:
+            await self.channel_router.close()
+
         if self.http_session:
             await self.http_session.close()
 
+        if self.poller:
+            self.poller.stop()
+
+        if self.cluster:
+            self.cluster.stop()
+
+        if self.update_checker:
+            await self.update_checker.close()
+
+        if self.download_events:
+            self.download_events.stop()
+
+        if self.library:
+            self.library.stop()
+
+        if self.ssh:
+            await self.ssh.close_all()
+
         if self.db:
             await self.db.close()
 
@@ -185,6 +262,11 @@ class SentinelBot(commands.Bot):
             logger.error(f"API GET {url} error: {e}")
             return None
 
+    async def arr_get(self, service: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """GET /api/v3/<endpoint> from Radarr or Sonarr."""
+        base_url = self.config.api.radarr_url if service == 'radarr' else self.config.api.sonarr_url
+        return await self.api_get(f"{base_url}/api/v3/{endpoint}", service, params=params)
+
     async def api_post(self, url: str, service: str, data: Any = None, **kwargs) -> Optional[Any]:
         """Make an authenticated POST request to a service API."""
         if not self.http_session:
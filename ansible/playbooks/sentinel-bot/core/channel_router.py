@@ -4,17 +4,50 @@ Routes notifications to appropriate Discord channels.
 """
 
 import logging
+import asyncio
+import time
 import discord
-from typing import Optional, Dict, TYPE_CHECKING
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from .bot import SentinelBot
 
 logger = logging.getLogger('sentinel.router')
 
+# Discord allows at most 25 fields per embed
+EMBED_FIELD_LIMIT = 25
+
+# Minimum seconds between queued sends to one channel
+SEND_INTERVAL = 1.0
+
+# Queued notifications per channel before new ones are dropped
+QUEUE_SIZE = 500
+
+# Tasks listed in a batch summary before it says "...and N more"
+BATCH_SUMMARY_LINES = 20
+
+
+@dataclass
+class Notification:
+    """A queued event. Events with the same group can be merged into one embed."""
+    group: str
+    heading: str                # title of a merged embed, e.g. ":package: Container Updates"
+    title: str                  # field name when merged
+    summary: str                # field value when merged
+    embed: discord.Embed        # sent as-is when the event is alone
+    low_priority: bool = False  # rolled into the digest when digest mode is on
+    created_at: float = field(default_factory=time.time)
+
 
 class ChannelRouter:
-    """Routes messages to appropriate Discord channels."""
+    """
+    Routes messages to appropriate Discord channels.
+
+    send() posts immediately. Event notifications go through notify(), which
+    queues them per channel; a worker merges bursts into multi-field embeds
+    and paces sends so webhook handlers never wait on Discord.
+    """
 
     # Channel name to config attribute mapping
     CHANNEL_MAPPING = {
@@ -38,6 +71,14 @@ class ChannelRouter:
         self.config = discord_config
         self._channel_cache: Dict[str, discord.TextChannel] = {}
 
+        # Outbound queue: one queue and worker per channel
+        self.batch_window = discord_config.notify_batch_window
+        self.digest_minutes = discord_config.notify_digest_minutes
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._workers: List[asyncio.Task] = []
+        self._digest: Dict[int, Tuple[discord.TextChannel, List[Notification]]] = {}
+        self._digest_task: Optional[asyncio.Task] = None
+
     async def cache_channels(self) -> None:
         """Cache all configured channels for fast access."""
         if not self.bot.guilds:
@@ -133,14 +174,174 @@ class ChannelRouter:
             logger.error(f"Failed to send to #{channel.name}: {e}")
             return None
 
+    # ==================== Outbound Queue ====================
+
+    def start(self) -> None:
+        """Start the digest loop (queue workers start on first use)."""
+        if self.digest_minutes and self._digest_task is None:
+            self._digest_task = asyncio.create_task(self._digest_loop())
+
+    async def close(self, timeout: float = 10) -> None:
+        """Flush the digest, give queued notifications a moment to go out, then stop."""
+        if self._digest_task:
+            self._digest_task.cancel()
+            self._digest_task = None
+        self.flush_digest()
+
+        if self._queues:
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(*(q.join() for q in self._queues.values())), timeout
+                )
+            except asyncio.TimeoutError:
+                pending = sum(q.qsize() for q in self._queues.values())
+                logger.warning(f"Dropping {pending} queued notifications on shutdown")
+
+        for task in self._workers:
+            task.cancel()
+        self._workers = []
+        self._queues = {}
+
+    def notify(self, channel_type: str, notification: Notification) -> None:
+        """
+        Queue a notification for a channel and return immediately.
+
+        Notifications arriving within the batch window are merged per group;
+        low-priority ones wait for the digest when digest mode is on.
+        """
+        channel = self.get_channel(channel_type)
+        if not channel:
+            logger.error(f"Cannot send to channel type: {channel_type}")
+            return
+
+        if notification.low_priority and self.digest_minutes:
+            self._digest.setdefault(channel.id, (channel, []))[1].append(notification)
+            return
+
+        self._enqueue(channel, notification)
+
+    def flush_digest(self) -> None:
+        """Queue one digest embed per channel with the held low-priority events."""
+        pending, self._digest = self._digest, {}
+        for channel, items in pending.values():
+            embed = self._merge_embed(
+                f":scroll: Digest - {len(items)} event(s) in the last {self.digest_minutes} min",
+                items,
+                by_group=True
+            )
+            self._enqueue(channel, Notification(
+                group='digest', heading='', title='', summary='', embed=embed
+            ))
+
+    def _enqueue(self, channel: discord.TextChannel, notification: Notification) -> None:
+        queue = self._queues.get(channel.id)
+        if queue is None:
+            queue = self._queues[channel.id] = asyncio.Queue(maxsize=QUEUE_SIZE)
+            self._workers.append(asyncio.create_task(self._worker(channel, queue)))
+        try:
+            queue.put_nowait(notification)
+        except asyncio.QueueFull:
+            logger.warning(f"Notification queue for #{channel.name} is full, dropping: {notification.title}")
+
+    async def _digest_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.digest_minutes * 60)
+            self.flush_digest()
+
+    async def _worker(self, channel: discord.TextChannel, queue: asyncio.Queue) -> None:
+        """Send a channel's notifications, merging those that arrive close together."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.batch_window
+            while len(batch) < EMBED_FIELD_LIMIT:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                for embed in self._merge(batch):
+                    await self._deliver(channel, embed)
+                    await asyncio.sleep(SEND_INTERVAL)
+            except Exception as e:
+                logger.error(f"Notification worker for #{channel.name} failed: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _merge(self, batch: List[Notification]) -> List[discord.Embed]:
+        """One embed per group, in the order groups first appeared."""
+        groups: Dict[str, List[Notification]] = {}
+        for notification in batch:
+            groups.setdefault(notification.group, []).append(notification)
+
+        embeds = []
+        for items in groups.values():
+            if len(items) == 1:
+                embeds.append(items[0].embed)
+            else:
+                embeds.append(self._merge_embed(f"{items[0].heading} ({len(items)})", items))
+        return embeds
+
+    @staticmethod
+    def _merge_embed(title: str, items: List[Notification], by_group: bool = False) -> discord.Embed:
+        """Build a multi-field embed; red if any event is red."""
+        colors = [n.embed.color for n in items if n.embed.color]
+        color = discord.Color.red() if discord.Color.red() in colors else (colors[0] if colors else None)
+        embed = discord.Embed(title=title, color=color)
+
+        if by_group:
+            # Digest: one field per group listing its events
+            groups: Dict[str, List[Notification]] = {}
+            for n in items:
+                groups.setdefault(n.heading, []).append(n)
+            for heading, group in list(groups.items())[:EMBED_FIELD_LIMIT]:
+                lines = [f"• **{n.title}** - {n.summary}" for n in group]
+                value = "\n".join(lines)
+                if len(value) > 1024:
+                    value = value[:1000].rsplit("\n", 1)[0] + f"\n...and more ({len(group)} total)"
+                embed.add_field(name=f"{heading} ({len(group)})", value=value, inline=False)
+        else:
+            for n in items[:EMBED_FIELD_LIMIT]:
+                embed.add_field(name=n.title[:256], value=n.summary[:1024] or "-", inline=False)
+        return embed
+
+    async def _deliver(self, channel: discord.TextChannel, embed: discord.Embed, attempts: int = 3) -> None:
+        """Send one embed, waiting out rate limits and retrying Discord server errors."""
+        for attempt in range(1, attempts + 1):
+            try:
+                await channel.send(embed=embed)
+                return
+            except discord.Forbidden:
+                logger.error(f"No permission to send to #{channel.name}")
+                return
+            except discord.RateLimited as e:
+                logger.warning(f"Rate limited on #{channel.name}, retrying in {e.retry_after:.1f}s")
+                await asyncio.sleep(e.retry_after)
+            except discord.DiscordServerError as e:
+                if attempt == attempts:
+                    logger.error(f"Failed to send to #{channel.name}: {e}")
+                    return
+                await asyncio.sleep(2 ** attempt)
+            except discord.HTTPException as e:
+                logger.error(f"Failed to send to #{channel.name}: {e}")
+                return
+        logger.error(f"Gave up sending to #{channel.name} after {attempts} attempts")
+
+    # ==================== Notifications ====================
+
     async def send_update_notification(
         self,
         container_name: str,
         host_ip: str,
         status: str,
         details: str = None
-    ) -> Optional[discord.Message]:
-        """Send a container update notification."""
+    ) -> None:
+        """Queue a container update notification."""
         color = {
             'pending': discord.Color.blue(),
             'in_progress': discord.Color.yellow(),
@@ -156,7 +357,14 @@ class ChannelRouter:
         embed.add_field(name="Host", value=host_ip, inline=True)
         embed.add_field(name="Status", value=status.upper(), inline=True)
 
-        return await self.send('updates', embed=embed)
+        self.notify('updates', Notification(
+            group='updates',
+            heading=":package: Container Updates",
+            title=container_name,
+            summary=f"{status.upper()} on {host_ip}" + (f" - {details}" if details else ""),
+            embed=embed,
+            low_priority=status == 'success'
+        ))
 
     async def send_media_notification(
         self,
@@ -165,8 +373,8 @@ class ChannelRouter:
         event: str,
         poster_url: str = None,
         details: Dict = None
-    ) -> Optional[discord.Message]:
-        """Send a media download/add notification."""
+    ) -> None:
+        """Queue a media download/add notification."""
         emoji = {
             'movie': ':movie_camera:',
             'series': ':tv:',
@@ -195,7 +403,15 @@ class ChannelRouter:
             for key, value in details.items():
                 embed.add_field(name=key, value=str(value), inline=True)
 
-        return await self.send('media', embed=embed)
+        self.notify('media', Notification(
+            group=f'media:{event.lower()}',
+            heading=f":film_frames: Media {event.title()}",
+            title=f"{emoji} {title}",
+            summary=f"{media_type.title()}" + "".join(f" • {k}: {v}" for k, v in (details or {}).items()),
+            embed=embed,
+            # Completions and failures go out right away; progress events can wait
+            low_priority=event.lower() not in ('completed', 'failed')
+        ))
 
     async def send_task_notification(
         self,
@@ -224,13 +440,45 @@ class ChannelRouter:
 
         return await self.send('tasks', embed=embed)
 
+    async def send_task_batch_notification(
+        self,
+        event: str,
+        tasks: List[Tuple[int, str]],
+        instance_name: str = None
+    ) -> Optional[discord.Message]:
+        """Send one summary notification for a batch of tasks."""
+        if not tasks:
+            return None
+
+        color = {
+            'created': discord.Color.blue(),
+            'completed': discord.Color.green(),
+            'cancelled': discord.Color.red(),
+        }.get(event.lower(), discord.Color.greyple())
+
+        lines = [f"`#{task_id}` {description[:80]}" for task_id, description in tasks[:BATCH_SUMMARY_LINES]]
+        if len(tasks) > BATCH_SUMMARY_LINES:
+            lines.append(f"...and {len(tasks) - BATCH_SUMMARY_LINES} more")
+
+        embed = discord.Embed(
+            title=f"{len(tasks)} Tasks {event.title()}",
+            description="\n".join(lines),
+            color=color
+        )
+        embed.add_field(name="Event", value=event.upper(), inline=True)
+
+        if instance_name:
+            embed.add_field(name="Instance", value=instance_name, inline=True)
+
+        return await self.send('tasks', embed=embed)
+
     async def send_homelab_alert(
         self,
         title: str,
         message: str,
         severity: str = 'info'
-    ) -> Optional[discord.Message]:
-        """Send a homelab infrastructure alert."""
+    ) -> None:
+        """Queue a homelab infrastructure alert."""
         color = {
             'info': discord.Color.blue(),
             'warning': discord.Color.yellow(),
@@ -244,7 +492,14 @@ class ChannelRouter:
             color=color
         )
 
-        return await self.send('homelab', embed=embed)
+        self.notify('homelab', Notification(
+            group='homelab',
+            heading=":house: Homelab Alerts",
+            title=title,
+            summary=message,
+            embed=embed,
+            low_priority=severity.lower() in ('info', 'success')
+        ))
 
     async def send_onboarding_status(
         self,
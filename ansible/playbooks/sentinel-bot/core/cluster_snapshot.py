@@ -0,0 +1,214 @@
+"""
+Sentinel Bot Cluster Snapshot
+In-memory index of Proxmox guests and nodes built from /cluster/resources.
+"""
+
+import logging
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, List, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .ssh_manager import SSHManager
+
+logger = logging.getLogger('sentinel.cluster')
+
+# Guest status after a successful power action, applied before the next refresh
+ACTION_STATUS = {
+    'start': 'running',
+    'reboot': 'running',
+    'stop': 'stopped',
+    'shutdown': 'stopped',
+}
+
+
+@dataclass
+class GuestInfo:
+    """A VM or LXC container as seen in the last snapshot."""
+    vmid: int
+    name: str
+    kind: str  # 'qemu' or 'lxc'
+    node: str
+    node_ip: Optional[str]
+    status: str
+    cpu: float = 0.0
+    mem: int = 0
+    maxmem: int = 0
+    uptime: int = 0
+    template: bool = False
+
+    @property
+    def running(self) -> bool:
+        return self.status == 'running'
+
+
+@dataclass
+class NodeInfo:
+    """A Proxmox node as seen in the last snapshot."""
+    name: str
+    ip: Optional[str]
+    status: str
+    cpu: float = 0.0
+    mem: int = 0
+    maxmem: int = 0
+    uptime: int = 0
+
+    @property
+    def online(self) -> bool:
+        return self.status == 'online'
+
+
+class ClusterSnapshot:
+    """
+    Periodically refreshed index of the whole cluster.
+
+    One /cluster/resources query (via any reachable node) replaces per-node
+    and per-VMID probing. Lookups by VMID or name are dictionary reads;
+    guest power actions made through SSHManager update the index at once.
+    """
+
+    def __init__(self, ssh: 'SSHManager', nodes: Dict[str, str], interval: float = 30):
+        self.ssh = ssh
+        self.node_ips = dict(nodes)
+        self.interval = interval
+
+        self.guests: Dict[int, GuestInfo] = {}
+        self.nodes: Dict[str, NodeInfo] = {}
+        self._by_name: Dict[str, int] = {}
+        self.updated_at: float = 0.0
+
+        self._refreshing: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+        ssh.add_mutation_listener(self._on_guest_action)
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        """Start the background refresh loop."""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    def stop(self) -> None:
+        if self._loop_task:
+            self._loop_task.cancel()
+            self._loop_task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Cluster snapshot refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ==================== Refresh ====================
+
+    @property
+    def age(self) -> float:
+        """Seconds since the last successful refresh."""
+        return time.monotonic() - self.updated_at if self.updated_at else float('inf')
+
+    async def refresh(self) -> bool:
+        """Refresh the snapshot; concurrent callers share one query."""
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._do_refresh())
+        return await asyncio.shield(self._refreshing)
+
+    async def _do_refresh(self) -> bool:
+        # Any online node can answer for the whole cluster
+        for node_name, node_ip in self.node_ips.items():
+            result = await self.ssh.pve_cluster_resources(node_ip)
+            if not result.success:
+                logger.debug(f"Cluster resources via {node_name} failed: {result.stderr}")
+                continue
+            try:
+                self._load(json.loads(result.stdout))
+                return True
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning(f"Could not parse cluster resources from {node_name}: {e}")
+
+        logger.warning("Cluster snapshot refresh failed on all nodes")
+        return False
+
+    def _load(self, resources: List[dict]) -> None:
+        guests: Dict[int, GuestInfo] = {}
+        nodes: Dict[str, NodeInfo] = {}
+
+        for res in resources:
+            res_type = res.get('type')
+            if res_type in ('qemu', 'lxc'):
+                node = res.get('node', '')
+                guests[int(res['vmid'])] = GuestInfo(
+                    vmid=int(res['vmid']),
+                    name=res.get('name', ''),
+                    kind=res_type,
+                    node=node,
+                    node_ip=self.node_ips.get(node),
+                    status=res.get('status', 'unknown'),
+                    cpu=res.get('cpu', 0) or 0,
+                    mem=res.get('mem', 0) or 0,
+                    maxmem=res.get('maxmem', 0) or 0,
+                    uptime=res.get('uptime', 0) or 0,
+                    template=bool(res.get('template')),
+                )
+            elif res_type == 'node':
+                name = res.get('node', '')
+                nodes[name] = NodeInfo(
+                    name=name,
+                    ip=self.node_ips.get(name),
+                    status=res.get('status', 'unknown'),
+                    cpu=res.get('cpu', 0) or 0,
+                    mem=res.get('mem', 0) or 0,
+                    maxmem=res.get('maxmem', 0) or 0,
+                    uptime=res.get('uptime', 0) or 0,
+                )
+
+        self.guests = guests
+        self.nodes = nodes
+        self._by_name = {g.name.lower(): g.vmid for g in guests.values() if g.name}
+        self.updated_at = time.monotonic()
+        logger.debug(f"Cluster snapshot: {len(nodes)} nodes, {len(guests)} guests")
+
+    # ==================== Lookups ====================
+
+    def get(self, vmid: int, kind: str = None) -> Optional[GuestInfo]:
+        """Look up a guest by VMID (optionally restricted to 'qemu' or 'lxc')."""
+        guest = self.guests.get(vmid)
+        if guest and (kind is None or guest.kind == kind):
+            return guest
+        return None
+
+    def find_by_name(self, name: str) -> Optional[GuestInfo]:
+        vmid = self._by_name.get(name.lower())
+        return self.guests.get(vmid) if vmid is not None else None
+
+    async def resolve(self, vmid: int, kind: str = None) -> Optional[GuestInfo]:
+        """Look up a guest, refreshing once if it isn't in the snapshot yet."""
+        guest = self.get(vmid, kind)
+        if guest is None and self.age > 2:
+            await self.refresh()
+            guest = self.get(vmid, kind)
+        return guest
+
+    def guests_on(self, node: str, kind: str = None, status: str = None) -> List[GuestInfo]:
+        """Guests on a node, optionally filtered by kind and status, ordered by VMID."""
+        return sorted(
+            (g for g in self.guests.values()
+             if g.node == node and (kind is None or g.kind == kind)
+             and (status is None or g.status == status)),
+            key=lambda g: g.vmid
+        )
+
+    # ==================== Mutation Updates ====================
+
+    def _on_guest_action(self, node_ip: str, kind: str, vmid: int, action: str, success: bool) -> None:
+        """Apply a guest power action to the index without waiting for a refresh."""
+        guest = self.guests.get(vmid)
+        if guest and success and action in ACTION_STATUS:
+            guest.status = ACTION_STATUS[action]
+            if guest.status != 'running':
+                guest.cpu = 0.0
+                guest.mem = 0
@@ -4,13 +4,24 @@ Async SQLite database for task queue, update history, and download tracking.
 """
 
 import logging
+import asyncio
 import aiosqlite
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple, Set
 from datetime import datetime
 import json
 
 logger = logging.getLogger('sentinel.database')
 
+# Task priorities are stored as ranks so the queue index can order by them
+PRIORITY_RANKS = {'high': 1, 'medium': 2, 'low': 3}
+
+# Audit log rows are buffered and written in one transaction
+LOG_FLUSH_INTERVAL = 1.0
+LOG_FLUSH_SIZE = 100
+
+# Events a live subscriber may fall behind by before it is dropped
+EVENT_QUEUE_SIZE = 1000
+
 
 class Database:
     """Async SQLite database manager."""
@@ -18,12 +29,35 @@ class Database:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._connection: Optional[aiosqlite.Connection] = None
+        self._log_buffer: List[Tuple[int, str, Optional[str], Optional[str]]] = []
+        self._log_flusher: Optional[asyncio.Task] = None
+        self._log_writes: Set[asyncio.Task] = set()  # size-triggered flushes in flight
+        self._log_lock = asyncio.Lock()
+
+        # Live event listeners (SSE streams) and the last task_logs row published
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._last_log_id = 0
+
+        # Bumped after every task/instance write; the API uses it as an ETag
+        self.version = 0
+
+        # Long-poll waiters park on this until a task becomes pending
+        self._task_available = asyncio.Condition()
+        self._task_seq = 0
 
     async def initialize(self) -> None:
         """Initialize database and create tables."""
         self._connection = await aiosqlite.connect(self.db_path)
         self._connection.row_factory = aiosqlite.Row
+        # WAL lets readers run alongside the writer; NORMAL sync is safe with WAL
+        await self._connection.execute('PRAGMA journal_mode=WAL')
+        await self._connection.execute('PRAGMA synchronous=NORMAL')
+        await self._connection.execute('PRAGMA busy_timeout=5000')
         await self._create_tables()
+        await self._migrate()
+
+        rows = await self._connection.execute_fetchall('SELECT MAX(id) AS id FROM task_logs')
+        self._last_log_id = rows[0]['id'] or 0
         logger.info(f"Database initialized at {self.db_path}")
 
     async def _create_tables(self) -> None:
@@ -35,6 +69,7 @@ class Database:
                 description TEXT NOT NULL,
                 status TEXT DEFAULT 'pending',
                 priority TEXT DEFAULT 'medium',
+                priority_rank INTEGER NOT NULL DEFAULT 2,
                 instance_id TEXT,
                 instance_name TEXT,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -45,7 +80,6 @@ class Database:
             );
 
             CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
-            CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
 
             -- Task Audit Log
             CREATE TABLE IF NOT EXISTS task_logs (
@@ -109,9 +143,35 @@ class Database:
         ''')
         await self._connection.commit()
 
+    async def _migrate(self) -> None:
+        """Bring databases created by older versions up to the current schema."""
+        cursor = await self._connection.execute('PRAGMA table_info(tasks)')
+        columns = {row['name'] for row in await cursor.fetchall()}
+        if 'priority_rank' not in columns:
+            logger.info("Migrating tasks table: adding priority_rank")
+            await self._connection.execute(
+                'ALTER TABLE tasks ADD COLUMN priority_rank INTEGER NOT NULL DEFAULT 2'
+            )
+            await self._connection.execute(
+                '''UPDATE tasks SET priority_rank =
+                   CASE priority WHEN 'high' THEN 1 WHEN 'low' THEN 3 ELSE 2 END'''
+            )
+
+        await self._connection.executescript('''
+            DROP INDEX IF EXISTS idx_tasks_priority;
+            CREATE INDEX IF NOT EXISTS idx_tasks_queue ON tasks(status, priority_rank, created_at);
+        ''')
+        await self._connection.commit()
+
     async def close(self) -> None:
         """Close database connection."""
         if self._connection:
+            if self._log_flusher:
+                self._log_flusher.cancel()
+                self._log_flusher = None
+            if self._log_writes:
+                await asyncio.gather(*self._log_writes, return_exceptions=True)
+            await self.flush_logs()
             await self._connection.close()
             logger.info("Database connection closed")
 
@@ -125,22 +185,64 @@ class Database:
     ) -> int:
         """Create a new task and return its ID."""
         cursor = await self._connection.execute(
-            '''INSERT INTO tasks (description, priority, submitted_by, status)
-               VALUES (?, ?, ?, 'pending')''',
-            (description, priority, submitted_by)
+            '''INSERT INTO tasks (description, priority, priority_rank, submitted_by, status)
+               VALUES (?, ?, ?, ?, 'pending')''',
+            (description, priority, PRIORITY_RANKS.get(priority, 2), submitted_by)
         )
         await self._connection.commit()
+        self.version += 1
         task_id = cursor.lastrowid
 
-        await self._log_task_action(task_id, 'created', f'Priority: {priority}')
+        self._log_task_action(task_id, 'created', f'Priority: {priority}')
+        await self._signal_task_available()
         return task_id
 
+    async def create_tasks(
+        self,
+        tasks: List[Tuple[str, str]],
+        submitted_by: str = None
+    ) -> List[int]:
+        """
+        Create several tasks in a single statement (one transaction).
+
+        Args:
+            tasks: (description, priority) pairs
+
+        Returns:
+            The new task IDs, in the order given
+        """
+        if not tasks:
+            return []
+        params = []
+        for description, priority in tasks:
+            params += [description, priority, PRIORITY_RANKS.get(priority, 2), submitted_by]
+        rows = await self._connection.execute_fetchall(
+            f'''INSERT INTO tasks (description, priority, priority_rank, submitted_by, status)
+                VALUES {', '.join(["(?, ?, ?, ?, 'pending')"] * len(tasks))}
+                RETURNING id''',
+            params
+        )
+        await self._connection.commit()
+        self.version += 1
+
+        # Rows get ascending IDs in VALUES order
+        task_ids = sorted(row['id'] for row in rows)
+        for task_id, (_, priority) in zip(task_ids, tasks):
+            self._log_task_action(task_id, 'created', f'Priority: {priority}')
+        await self._signal_task_available()
+        return task_ids
+
+    async def get_task(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Get a single task by ID."""
+        cursor = await self._connection.execute('SELECT * FROM tasks WHERE id = ?', (task_id,))
+        row = await cursor.fetchone()
+        return dict(row) if row else None
+
     async def get_pending_tasks(self, limit: int = 10) -> List[Dict[str, Any]]:
-        """Get pending tasks ordered by priority."""
-        priority_order = "CASE priority WHEN 'high' THEN 1 WHEN 'medium' THEN 2 WHEN 'low' THEN 3 END"
+        """Get pending tasks ordered by priority (served by idx_tasks_queue)."""
         cursor = await self._connection.execute(
-            f'''SELECT * FROM tasks WHERE status = 'pending'
-                ORDER BY {priority_order}, created_at ASC LIMIT ?''',
+            '''SELECT * FROM tasks WHERE status = 'pending'
+               ORDER BY priority_rank, created_at, id LIMIT ?''',
             (limit,)
         )
         rows = await cursor.fetchall()
@@ -167,10 +269,46 @@ class Database:
         await self._connection.commit()
 
         if cursor.rowcount > 0:
-            await self._log_task_action(task_id, 'claimed', f'Instance: {instance_name}', instance_id)
+            self.version += 1
+            self._log_task_action(task_id, 'claimed', f'Instance: {instance_name}', instance_id)
             return True
         return False
 
+    async def claim_next_task(
+        self,
+        instance_id: str,
+        instance_name: str = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Atomically claim the highest-priority pending task.
+
+        A single UPDATE ... RETURNING picks and claims the task, so concurrent
+        instances can never claim the same one and never need to retry.
+
+        Returns:
+            The claimed task, or None if the queue is empty
+        """
+        # execute_fetchall runs and drains the statement in one step; a RETURNING
+        # cursor left open would make any other coroutine's commit fail
+        rows = await self._connection.execute_fetchall(
+            '''UPDATE tasks SET status = 'in_progress', instance_id = ?,
+               instance_name = ?, claimed_at = CURRENT_TIMESTAMP
+               WHERE id = (
+                   SELECT id FROM tasks WHERE status = 'pending'
+                   ORDER BY priority_rank, created_at, id LIMIT 1
+               )
+               RETURNING *''',
+            (instance_id, instance_name)
+        )
+        await self._connection.commit()
+
+        if not rows:
+            return None
+        self.version += 1
+        task = dict(rows[0])
+        self._log_task_action(task['id'], 'claimed', f'Instance: {instance_name}', instance_id)
+        return task
+
     async def complete_task(
         self,
         task_id: int,
@@ -187,10 +325,65 @@ class Database:
         await self._connection.commit()
 
         if cursor.rowcount > 0:
-            await self._log_task_action(task_id, 'completed', notes, instance_id)
+            self.version += 1
+            self._log_task_action(task_id, 'completed', notes, instance_id)
             return True
         return False
 
+    async def complete_tasks(
+        self,
+        task_ids: List[int],
+        instance_id: str,
+        notes: str = None
+    ) -> Dict[int, str]:
+        """
+        Mark several tasks claimed by an instance as completed in one statement.
+
+        Returns:
+            Task ID -> description for the tasks that were completed
+        """
+        if not task_ids:
+            return {}
+        rows = await self._connection.execute_fetchall(
+            f'''UPDATE tasks SET status = 'completed', notes = ?,
+                completed_at = CURRENT_TIMESTAMP
+                WHERE instance_id = ? AND id IN ({', '.join('?' * len(task_ids))})
+                RETURNING id, description''',
+            (notes, instance_id, *task_ids)
+        )
+        await self._connection.commit()
+
+        completed = {row['id']: row['description'] for row in rows}
+        if completed:
+            self.version += 1
+        for task_id in completed:
+            self._log_task_action(task_id, 'completed', notes, instance_id)
+        return completed
+
+    async def cancel_tasks(self, task_ids: List[int]) -> Dict[int, str]:
+        """
+        Cancel several pending tasks in one statement.
+
+        Returns:
+            Task ID -> description for the tasks that were cancelled
+        """
+        if not task_ids:
+            return {}
+        rows = await self._connection.execute_fetchall(
+            f'''UPDATE tasks SET status = 'cancelled'
+                WHERE status = 'pending' AND id IN ({', '.join('?' * len(task_ids))})
+                RETURNING id, description''',
+            task_ids
+        )
+        await self._connection.commit()
+
+        cancelled = {row['id']: row['description'] for row in rows}
+        if cancelled:
+            self.version += 1
+        for task_id in cancelled:
+            self._log_task_action(task_id, 'cancelled')
+        return cancelled
+
     async def cancel_task(self, task_id: int) -> bool:
         """Cancel a pending task."""
         cursor = await self._connection.execute(
@@ -201,7 +394,8 @@ class Database:
         await self._connection.commit()
 
         if cursor.rowcount > 0:
-            await self._log_task_action(task_id, 'cancelled')
+            self.version += 1
+            self._log_task_action(task_id, 'cancelled')
             return True
         return False
 
@@ -225,30 +419,179 @@ class Database:
 
     async def reset_stale_tasks(self, hours: int = 2) -> int:
         """Reset tasks stuck in_progress for more than X hours."""
-        cursor = await self._connection.execute(
-            '''UPDATE tasks SET status = 'pending', instance_id = NULL,
-               instance_name = NULL, claimed_at = NULL
+        # RETURNING yields the new (NULL) instance_id, so the instances losing
+        # their tasks are read first, in the same transaction as the reset
+        if not self._connection.in_transaction:
+            await self._connection.execute('BEGIN IMMEDIATE')
+        stale = await self._connection.execute_fetchall(
+            '''SELECT id, instance_id FROM tasks
                WHERE status = 'in_progress'
                AND claimed_at < datetime('now', ? || ' hours')''',
             (f'-{hours}',)
         )
+        if stale:
+            await self._connection.execute(
+                f'''UPDATE tasks SET status = 'pending', instance_id = NULL,
+                    instance_name = NULL, claimed_at = NULL
+                    WHERE id IN ({', '.join('?' * len(stale))})''',
+                [row['id'] for row in stale]
+            )
         await self._connection.commit()
-        return cursor.rowcount
-
-    async def _log_task_action(
+        if not stale:
+            return 0
+
+        self.version += 1
+        for row in stale:
+            self._log_task_action(row['id'], 'reset', f'Stale after {hours}h', row['instance_id'])
+        await self._signal_task_available()
+        return len(stale)
+
+    async def _signal_task_available(self) -> None:
+        """Wake long-poll waiters after a task becomes pending."""
+        async with self._task_available:
+            self._task_seq += 1
+            self._task_available.notify_all()
+
+    async def wait_for_task(
+        self,
+        timeout: float,
+        instance_id: str = None,
+        instance_name: str = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the next task, waiting up to `timeout` seconds for one to arrive.
+
+        Waiters sleep on an in-process condition instead of polling SQLite and
+        wake as soon as create_task() commits.
+
+        Args:
+            timeout: Maximum seconds to wait
+            instance_id: Claim the task atomically for this instance
+            instance_name: Display name recorded with the claim
+
+        Returns:
+            The (claimed) task, or None if none arrived in time
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            # Take the sequence number before looking so a task created in
+            # between is never missed
+            seq = self._task_seq
+            if instance_id:
+                task = await self.claim_next_task(instance_id, instance_name)
+            else:
+                task = await self.get_next_task()
+            remaining = deadline - loop.time()
+            if task or remaining <= 0:
+                return task
+
+            async with self._task_available:
+                try:
+                    await asyncio.wait_for(
+                        self._task_available.wait_for(lambda: self._task_seq != seq),
+                        remaining
+                    )
+                except asyncio.TimeoutError:
+                    return None
+
+    def _log_task_action(
         self,
         task_id: int,
         action: str,
         details: str = None,
         instance_id: str = None
     ) -> None:
-        """Log a task action."""
-        await self._connection.execute(
-            '''INSERT INTO task_logs (task_id, action, details, instance_id)
-               VALUES (?, ?, ?, ?)''',
-            (task_id, action, details, instance_id)
+        """Queue a task action for the audit log; rows are written in batches."""
+        self._log_buffer.append((task_id, action, details, instance_id))
+        if len(self._log_buffer) >= LOG_FLUSH_SIZE:
+            # The loop only keeps weak references to tasks; hold this one until done
+            write = asyncio.create_task(self.flush_logs())
+            self._log_writes.add(write)
+            write.add_done_callback(self._log_writes.discard)
+        elif self._log_flusher is None or self._log_flusher.done():
+            self._log_flusher = asyncio.create_task(self._flush_logs_later())
+
+    async def _flush_logs_later(self) -> None:
+        await asyncio.sleep(LOG_FLUSH_INTERVAL)
+        await self.flush_logs()
+
+    async def flush_logs(self) -> None:
+        """Write all buffered audit log rows in one transaction and publish them."""
+        async with self._log_lock:
+            if not self._log_buffer:
+                return
+            rows, self._log_buffer = self._log_buffer, []
+            try:
+                await self._connection.executemany(
+                    '''INSERT INTO task_logs (task_id, action, details, instance_id)
+                       VALUES (?, ?, ?, ?)''',
+                    rows
+                )
+                await self._connection.commit()
+            except Exception as e:
+                # Keep the rows (the audit trail and event replay source);
+                # the next flush retries them
+                self._log_buffer[:0] = rows
+                logger.error(f"Failed to write {len(rows)} task log rows: {e}")
+                return
+
+            # Log rows double as the event stream; their IDs are the event IDs
+            for event in await self._fetch_task_events(self._last_log_id):
+                self._last_log_id = event['id']
+                self._publish(f"task.{event['action']}", event, event['id'])
+
+    # ==================== Event Stream Methods ====================
+
+    @property
+    def last_event_id(self) -> int:
+        """ID of the newest task event published so far."""
+        return self._last_log_id
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a live event listener.
+
+        The queue receives dicts with 'event', 'data' and 'id' (None for
+        events that are not stored, like instance heartbeats). A None item
+        means the listener fell behind and was dropped.
+        """
+        queue = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    def publish(self, event: str, data: Dict[str, Any]) -> None:
+        """Send an event that is not stored (like download progress) to live listeners."""
+        self._publish(event, data)
+
+    def _publish(self, event: str, data: Dict[str, Any], event_id: int = None) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait({'event': event, 'data': data, 'id': event_id})
+            except asyncio.QueueFull:
+                # Drop the slow listener; it can reconnect and resume from task_logs
+                self._subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+                logger.warning("Dropped event listener that fell behind")
+
+    async def get_task_events(self, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """Task events (audit log rows) after an event ID, oldest first."""
+        await self.flush_logs()
+        return await self._fetch_task_events(after_id, limit)
+
+    async def _fetch_task_events(self, after_id: int, limit: int = -1) -> List[Dict[str, Any]]:
+        rows = await self._connection.execute_fetchall(
+            '''SELECT l.id, l.task_id, l.action, l.details, l.instance_id, l.timestamp,
+                      t.description, t.priority, t.status, t.instance_name
+               FROM task_logs l LEFT JOIN tasks t ON t.id = l.task_id
+               WHERE l.id > ? ORDER BY l.id LIMIT ?''',
+            (after_id, limit)
         )
-        await self._connection.commit()
+        return [dict(row) for row in rows]
 
     # ==================== Instance Registry Methods ====================
 
@@ -265,6 +608,13 @@ class Database:
             (instance_id, instance_name, status)
         )
         await self._connection.commit()
+        self.version += 1
+        self._publish('instance', {
+            'instance_id': instance_id,
+            'instance_name': instance_name,
+            'status': status,
+            'last_seen': datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S'),
+        })
 
     async def get_active_instances(self, minutes: int = 5) -> List[Dict[str, Any]]:
         """Get instances active in the last X minutes."""
@@ -0,0 +1,399 @@
+"""
+Sentinel Bot Download Events
+Single source of Radarr/Sonarr download events: grabs, progress milestones,
+completions, imports and failures, published to every consumer.
+"""
+
+import logging
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Set, Any, Callable, Awaitable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .bot import SentinelBot
+
+logger = logging.getLogger('sentinel.downloads')
+
+# Progress milestones announced per download; 0 records that the grab was
+# announced and 100 that the download finished
+GRABBED = 0
+MILESTONES = (50, 80, 100)
+
+# Queue poll intervals (seconds) while something is in a queue: polls are
+# timed for the next milestone of the fastest download, within these bounds
+POLL_BASE = 30
+POLL_MIN = 10
+POLL_MAX = 300
+
+# With empty queues only webhooks wake the poller; this safety poll catches
+# downloads started while webhooks were not delivered
+IDLE_RECHECK = 900
+
+# Webhook event types that end a download unsuccessfully
+FAILURE_EVENTS = ('DownloadFailed', 'ManualInteractionRequired')
+
+SERVICES = ('radarr', 'sonarr')
+
+DownloadListener = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def poster_url(media: Dict[str, Any]) -> Optional[str]:
+    """Poster URL of a Radarr movie or Sonarr series, if it has one."""
+    for image in media.get('images') or []:
+        if image.get('coverType') == 'poster':
+            return image.get('remoteUrl') or image.get('url')
+    return None
+
+
+def movie_title(movie: Dict[str, Any]) -> str:
+    title = movie.get('title') or 'Unknown Movie'
+    year = movie.get('year')
+    return f"{title} ({year})" if year else title
+
+
+def episode_title(series: Dict[str, Any], episodes: List[Dict[str, Any]]) -> str:
+    title = series.get('title') or 'Unknown Series'
+    if not episodes:
+        return title
+    first = episodes[0]
+    season = first.get('seasonNumber', 0)
+    if len(episodes) > 1:
+        return f"{title} - S{season:02d} ({len(episodes)} episodes)"
+    return f"{title} - S{season:02d}E{first.get('episodeNumber', 0):02d}"
+
+
+@dataclass
+class Download:
+    """A download known from a webhook or the queue."""
+    key: str              # '<service>_<downloadId>', '' for untracked imports
+    service: str          # radarr or sonarr
+    title: str
+    media_type: str       # movie or episode
+    media_id: Optional[int] = None  # Radarr movie / Sonarr series ID
+    poster: Optional[str] = None
+    quality: str = ''
+    size: int = 0
+    sizeleft: int = 0
+    status: str = 'queued'
+    timeleft: Optional[str] = None
+    milestones: Set[int] = field(default_factory=set)
+    rate: Optional[float] = None  # bytes/second, smoothed over polls
+    sampled_at: float = 0.0
+
+    @property
+    def percent(self) -> float:
+        if self.size <= 0:
+            return 100.0 if 100 in self.milestones else 0.0
+        return (self.size - self.sizeleft) / self.size * 100
+
+    def sample(self, size: int, sizeleft: int) -> None:
+        """Record a queue reading and update the download rate."""
+        now = time.monotonic()
+        if self.sampled_at and size == self.size and sizeleft <= self.sizeleft:
+            rate = (self.sizeleft - sizeleft) / max(now - self.sampled_at, 1e-3)
+            self.rate = rate if self.rate is None else (self.rate + rate) / 2
+        self.size, self.sizeleft, self.sampled_at = size, sizeleft, now
+
+    def seconds_to_milestone(self) -> Optional[float]:
+        """Estimated time until the next unannounced milestone (None if unknown)."""
+        pending = [m for m in MILESTONES if m not in self.milestones and m > self.percent]
+        if not pending:
+            return float('inf')
+        if self.rate is None:
+            return None
+        if self.rate <= 0:
+            return float('inf')
+        target_left = self.size * (1 - pending[0] / 100)
+        return (self.sizeleft - target_left) / self.rate
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.key,
+            'service': self.service,
+            'media_type': self.media_type,
+            'media_id': self.media_id,
+            'title': self.title,
+            'poster': self.poster,
+            'quality': self.quality,
+            'size': self.size,
+            'percent': round(self.percent, 1),
+            'status': self.status,
+            'timeleft': self.timeleft,
+        }
+
+
+class DownloadEventService:
+    """
+    Turns Radarr/Sonarr webhooks and queue polls into download events.
+
+    Webhooks (Grab, Download, DownloadFailed) drive state transitions. The
+    queues are only polled while they hold something, at an interval aimed
+    at the next milestone of the fastest download; with empty queues the
+    poller sleeps until a Grab webhook wakes it.
+
+    Events are dicts with 'kind' (grabbed, progress, completed, imported,
+    failed) plus the download fields. They go to listeners registered with
+    subscribe() and to the database event stream as download.<kind>.
+    Announced milestones are kept in download_tracking, so a restart does
+    not announce anything twice.
+    """
+
+    def __init__(self, bot: 'SentinelBot'):
+        self.bot = bot
+        self.downloads: Dict[str, Download] = {}
+        self.interval: float = POLL_BASE
+        self.last_poll: float = 0.0
+        self.polls = 0  # queue polls made, for diagnostics
+        self._listeners: List[DownloadListener] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, listener: DownloadListener) -> None:
+        """Register a coroutine called with every download event."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: DownloadListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _loop(self) -> None:
+        await self.bot.wait_until_ready()
+        while True:
+            self._wake.clear()
+            try:
+                failed = not await self.poll()
+            except Exception as e:
+                logger.error(f"Download queue poll failed: {e}")
+                failed = True
+            self.interval = self._next_interval(failed)
+            logger.debug(f"{len(self.downloads)} download(s) tracked, next poll in {self.interval:.0f}s")
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            # Bursts of Grab webhooks share one poll
+            delay = self.last_poll + POLL_MIN - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+    def _next_interval(self, failed: bool) -> float:
+        if failed:
+            return min(self.interval * 2, POLL_MAX)
+        if not self.downloads:
+            return IDLE_RECHECK
+        active = [d for d in self.downloads.values() if d.status == 'downloading']
+        if not active:
+            return POLL_MAX
+        waits = [d.seconds_to_milestone() for d in active]
+        if None in waits:
+            return POLL_BASE
+        return min(max(min(waits), POLL_MIN), POLL_MAX)
+
+    # ==================== Queue Polling ====================
+
+    async def poll(self) -> bool:
+        """Poll both queues once; returns False if any queue could not be read."""
+        self.polls += 1
+        self.last_poll = time.monotonic()
+        services = [s for s in SERVICES if self._api_key(s)]
+        results = await asyncio.gather(*(self._fetch_queue(s) for s in services))
+
+        ok = True
+        for service, records in zip(services, results):
+            if records is None:
+                ok = False
+                continue
+            await self._apply_queue(service, records)
+        return ok
+
+    def _api_key(self, service: str) -> str:
+        return getattr(self.bot.config.api, f"{service}_api_key")
+
+    async def _fetch_queue(self, service: str) -> Optional[List[Dict[str, Any]]]:
+        return await self.bot.queues[service].read()
+
+    async def _apply_queue(self, service: str, records: List[Dict[str, Any]]) -> None:
+        # Season packs show up as one record per episode with the same downloadId
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            key = f"{service}_{record.get('downloadId') or 'q' + str(record.get('id'))}"
+            grouped.setdefault(key, []).append(record)
+
+        for key, group in grouped.items():
+            download = self.downloads.get(key)
+            if download is None:
+                download = await self._track(self._from_queue(key, service, group))
+            first = group[0]
+            download.status = (first.get('status') or 'queued').lower()
+            download.timeleft = first.get('timeleft')
+            download.sample(first.get('size') or 0, first.get('sizeleft') or 0)
+
+            if GRABBED not in download.milestones:
+                # Started while no webhook reached us
+                await self._record(download, GRABBED)
+                await self._emit('grabbed', download)
+            await self._check_milestones(download)
+
+        # Gone from the queue: imported or removed (webhooks announce which)
+        for key in [k for k, d in self.downloads.items() if d.service == service and k not in grouped]:
+            del self.downloads[key]
+
+    def _from_queue(self, key: str, service: str, records: List[Dict[str, Any]]) -> Download:
+        first = records[0]
+        if service == 'radarr':
+            media = first.get('movie') or {}
+            title = movie_title(media) if media else first.get('title', 'Unknown')
+            media_type = 'movie'
+            media_id = first.get('movieId')
+        else:
+            media = first.get('series') or {}
+            episodes = [r['episode'] for r in records if r.get('episode')]
+            title = episode_title(media, episodes) if media else first.get('title', 'Unknown')
+            media_type = 'episode'
+            media_id = first.get('seriesId')
+        return Download(
+            key=key,
+            service=service,
+            title=title,
+            media_type=media_type,
+            media_id=media_id,
+            poster=poster_url(media),
+            quality=((first.get('quality') or {}).get('quality') or {}).get('name', ''),
+        )
+
+    async def _check_milestones(self, download: Download) -> None:
+        reached = [m for m in MILESTONES if download.percent >= m and m not in download.milestones]
+        if not reached:
+            return
+        # A download that jumped past several milestones is announced once
+        for milestone in reached:
+            await self._record(download, milestone)
+        milestone = reached[-1]
+        if milestone == 100:
+            if self.bot.db:
+                await self.bot.db.complete_download(download.key)
+            await self._emit('completed', download, milestone=100)
+        else:
+            await self._emit('progress', download, milestone=milestone)
+
+    # ==================== Webhooks ====================
+
+    async def handle_webhook(self, service: str, data: Dict[str, Any]) -> None:
+        """Apply a Radarr/Sonarr webhook (eventType Grab, Download or DownloadFailed)."""
+        event_type = data.get('eventType', '')
+        if event_type not in ('Grab', 'Download') + FAILURE_EVENTS:
+            logger.debug(f"Ignoring {service} {event_type or 'unknown'} webhook")
+            return
+
+        incoming = self._from_webhook(service, data)
+        if not incoming.key:
+            # Manual imports have no download to track
+            if event_type == 'Download':
+                await self._emit('imported', incoming, upgrade=bool(data.get('isUpgrade')))
+            return
+
+        download = await self._track(incoming)
+        if event_type == 'Grab':
+            if GRABBED not in download.milestones:
+                await self._record(download, GRABBED)
+                await self._emit('grabbed', download)
+            self._wake.set()
+
+        elif event_type == 'Download':
+            self.downloads.pop(download.key, None)
+            download.status = 'imported'
+            if 100 not in download.milestones:
+                await self._record(download, 100)
+                download.sizeleft = 0
+                await self._emit('completed', download, milestone=100)
+            if self.bot.db:
+                await self.bot.db.complete_download(download.key)
+            await self._emit('imported', download, upgrade=bool(data.get('isUpgrade')))
+
+        else:
+            self.downloads.pop(download.key, None)
+            download.status = 'failed'
+            await self._emit('failed', download, reason=data.get('message') or event_type)
+
+    def _from_webhook(self, service: str, data: Dict[str, Any]) -> Download:
+        download_id = data.get('downloadId')
+        if service == 'radarr':
+            media = data.get('movie') or {}
+            title = movie_title(media)
+            media_type = 'movie'
+        else:
+            media = data.get('series') or {}
+            title = episode_title(media, data.get('episodes') or [])
+            media_type = 'episode'
+        release = data.get('release') or {}
+        return Download(
+            key=f"{service}_{download_id}" if download_id else '',
+            service=service,
+            title=title,
+            media_type=media_type,
+            media_id=media.get('id'),
+            poster=poster_url(media),
+            quality=release.get('quality', ''),
+            size=release.get('size') or 0,
+            sizeleft=release.get('size') or 0,
+        )
+
+    # ==================== State ====================
+
+    async def _track(self, download: Download) -> Download:
+        """Return the tracked download for a key, loading its milestones on first sight."""
+        existing = self.downloads.get(download.key)
+        if existing:
+            existing.media_id = existing.media_id or download.media_id
+            existing.poster = existing.poster or download.poster
+            existing.quality = existing.quality or download.quality
+            return existing
+
+        if self.bot.db:
+            await self.bot.db.start_download_tracking(
+                download.key, download.media_type, download.title, download.poster, download.size or None
+            )
+            download.milestones = set(await self.bot.db.get_download_milestones(download.key))
+        self.downloads[download.key] = download
+        return download
+
+    async def _record(self, download: Download, milestone: int) -> None:
+        download.milestones.add(milestone)
+        if self.bot.db:
+            await self.bot.db.add_download_milestone(download.key, milestone)
+
+    async def _emit(self, kind: str, download: Download, **extra: Any) -> None:
+        event = {'kind': kind, **download.to_dict(), **extra}
+        logger.info(f"Download {kind}: {download.title} ({download.percent:.0f}%)")
+        if self.bot.db:
+            self.bot.db.publish(f"download.{kind}", event)
+
+        results = await asyncio.gather(
+            *(listener(event) for listener in list(self._listeners)),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Download event listener failed: {result}")
+
+    def status(self) -> Dict[str, Any]:
+        """Tracked downloads and poller state, for diagnostics."""
+        return {
+            'downloads': [d.to_dict() for d in self.downloads.values()],
+            'interval': round(self.interval, 1),
+            'polls': self.polls,
+            'listeners': len(self._listeners),
+        }
@@ -0,0 +1,118 @@
+"""
+Sentinel Bot Health Probe
+One-shot remote script that reports a Docker host's health as compact JSON.
+"""
+
+import json
+import shlex
+from dataclasses import dataclass, field
+from typing import Optional, List
+
+# Collects disk usage, per-container state/health/restarts/OOM flag, memory
+# usage read straight from the container cgroups (what `docker stats` reports,
+# without its ~2s sampling delay) and OOM events from the last hour.
+# Output: {"disk":N,"docker":bool,"containers":[[name,state,health,restarts,
+# oom_killed,exit_code,mem_pct],...],"oom":[name,...]}
+HEALTH_PROBE = r'''
+disk=$(df -P / 2>/dev/null | awk 'NR == 2 {sub("%", "", $5); print $5}')
+total=$(awk '/^MemTotal:/ {print $2 * 1024}' /proc/meminfo)
+
+mem_pct() {
+    for d in /sys/fs/cgroup/system.slice/docker-$1.scope /sys/fs/cgroup/docker/$1 \
+             /sys/fs/cgroup/memory/system.slice/docker-$1.scope /sys/fs/cgroup/memory/docker/$1; do
+        if [ -r "$d/memory.current" ]; then
+            used=$(cat "$d/memory.current"); limit=$(cat "$d/memory.max"); stat=inactive_file
+        elif [ -r "$d/memory.usage_in_bytes" ]; then
+            used=$(cat "$d/memory.usage_in_bytes"); limit=$(cat "$d/memory.limit_in_bytes"); stat=total_inactive_file
+        else
+            continue
+        fi
+        awk -v used="$used" -v limit="$limit" -v total="$total" -v stat="$stat" '
+            $1 == stat { used -= $2 }
+            END {
+                if (limit == "max" || limit + 0 > total + 0) limit = total
+                printf "%.1f", (limit > 0 ? used * 100 / limit : 0)
+            }' "$d/memory.stat"
+        return
+    done
+    printf null
+}
+
+printf '{"disk":%s,' "${disk:-null}"
+if ! ids=$(docker ps -aq --no-trunc 2>/dev/null); then
+    printf '"docker":false,"containers":[],"oom":[]}\n'
+    exit 0
+fi
+
+printf '"docker":true,"containers":['
+if [ -n "$ids" ]; then
+    docker inspect --format '{{.Id}}|{{.Name}}|{{.State.Status}}|{{if .State.Health}}{{.State.Health.Status}}{{end}}|{{.RestartCount}}|{{.State.OOMKilled}}|{{.State.ExitCode}}' $ids 2>/dev/null |
+    {
+        sep=
+        while IFS='|' read -r id name state health restarts oom code; do
+            mem=null
+            [ "$state" = running ] && mem=$(mem_pct "$id")
+            printf '%s["%s","%s","%s",%s,%s,%s,%s]' "$sep" "${name#/}" "$state" "$health" "$restarts" "$oom" "$code" "$mem"
+            sep=,
+        done
+    }
+fi
+
+printf '],"oom":['
+docker events --since 1h --until "$(date +%s)" --filter event=oom --format '{{.Actor.Attributes.name}}' 2>/dev/null | sort -u |
+{
+    sep=
+    while read -r name; do
+        printf '%s"%s"' "$sep" "$name"
+        sep=,
+    done
+}
+printf ']}\n'
+'''
+
+PROBE_COMMAND = f"sh -c {shlex.quote(HEALTH_PROBE)}"
+
+
+@dataclass
+class ContainerHealth:
+    """State of one container as reported by the probe."""
+    name: str
+    state: str                      # running, exited, restarting, ...
+    health: str = ''                # healthy, unhealthy, starting or '' without a healthcheck
+    restarts: int = 0
+    oom_killed: bool = False
+    exit_code: int = 0
+    mem_pct: Optional[float] = None  # None when not running
+
+
+@dataclass
+class HostHealth:
+    """Parsed probe output for one host."""
+    disk: Optional[int] = None
+    docker: bool = False
+    containers: List[ContainerHealth] = field(default_factory=list)
+    oom_events: List[str] = field(default_factory=list)  # containers OOM-killed in the last hour
+
+    @property
+    def crashed(self) -> List[ContainerHealth]:
+        return [c for c in self.containers if c.state == 'exited' and c.exit_code != 0]
+
+
+def parse_probe(output: str) -> HostHealth:
+    """
+    Parse the JSON printed by HEALTH_PROBE.
+
+    Raises:
+        ValueError: If the output is not valid probe JSON
+    """
+    try:
+        data = json.loads(output)
+        containers = [ContainerHealth(*row) for row in data.get('containers', [])]
+        return HostHealth(
+            disk=data.get('disk'),
+            docker=bool(data.get('docker')),
+            containers=containers,
+            oom_events=list(data.get('oom', [])),
+        )
+    except (json.JSONDecodeError, TypeError, AttributeError) as e:
+        raise ValueError(f"Invalid probe output: {e}") from e
@@ -0,0 +1,266 @@
+"""
+Sentinel Bot Library Index
+In-memory index of the Radarr movie and Sonarr series catalogs, kept
+current by webhooks and history deltas so library commands never
+download the whole catalog.
+
+Standard library only: Mnemosyne deploys this same file next to its
+script as library_index.py.
+"""
+
+import logging
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from operator import attrgetter
+from typing import Optional, Dict, Tuple, Any, Callable, Awaitable
+
+logger = logging.getLogger('sentinel.library')
+
+# Changed items are picked up from history this often (seconds); a full
+# reload catches anything history does not record
+DELTA_INTERVAL = 300
+FULL_INTERVAL = 6 * 3600
+
+# Items fetched concurrently during a delta refresh
+MAX_CONCURRENT_FETCHES = 8
+
+# Webhook events that change one item, and those that remove it
+REFRESH_EVENTS = {
+    'radarr': ('Download', 'MovieAdded', 'MovieFileDelete', 'Rename'),
+    'sonarr': ('Download', 'SeriesAdd', 'EpisodeFileDelete', 'Rename'),
+}
+DELETE_EVENTS = {'radarr': ('MovieDelete',), 'sonarr': ('SeriesDelete',)}
+
+# fetch(service, endpoint, params) -> decoded JSON, or None on failure
+LibraryFetch = Callable[[str, str, Optional[Dict[str, Any]]], Awaitable[Any]]
+
+
+def sort_key(title: str) -> str:
+    """Title sort key: case-insensitive, leading article ignored."""
+    title = title.lower()
+    for article in ('the ', 'a ', 'an '):
+        if title.startswith(article):
+            return title[len(article):]
+    return title
+
+
+class Movie:
+    """Compact library record for a Radarr movie."""
+    __slots__ = ('id', 'title', 'sort_title', 'year', 'has_file', 'monitored', 'quality')
+
+    def __init__(self, data: Dict[str, Any]):
+        self.id: int = data['id']
+        self.title: str = data.get('title') or 'Unknown'
+        self.sort_title = sort_key(self.title)
+        self.year: int = data.get('year') or 0
+        self.has_file: bool = bool(data.get('hasFile'))
+        self.monitored: bool = bool(data.get('monitored'))
+        movie_file = data.get('movieFile') or {}
+        self.quality: str = ((movie_file.get('quality') or {}).get('quality') or {}).get('name', '')
+
+
+class Series:
+    """Compact library record for a Sonarr series."""
+    __slots__ = ('id', 'title', 'sort_title', 'year', 'status', 'seasons', 'episode_files', 'total_episodes', 'complete')
+
+    def __init__(self, data: Dict[str, Any]):
+        stats = data.get('statistics') or {}
+        self.id: int = data['id']
+        self.title: str = data.get('title') or 'Unknown'
+        self.sort_title = sort_key(self.title)
+        self.year: int = data.get('year') or 0
+        self.status: str = data.get('status') or 'unknown'
+        self.seasons: int = data.get('seasonCount') or stats.get('seasonCount') or 0
+        self.episode_files: int = stats.get('episodeFileCount', 0)
+        self.total_episodes: int = stats.get('totalEpisodeCount', 0)
+        self.complete: bool = stats.get('percentOfEpisodes', 0) >= 100
+
+
+@dataclass
+class Page:
+    """One page of an index view."""
+    items: Tuple
+    page: int
+    pages: int
+    total: int
+
+
+class LibraryIndex:
+    """
+    Movies and series held as compact records with precomputed views.
+
+    Views (title-sorted tuples of all and available items) and counts are
+    rebuilt once after a change instead of on every command, so listing
+    and stats commands are answered from memory. Webhooks refresh single
+    items; a history delta every DELTA_INTERVAL catches changes whose
+    webhook was missed, and a full reload runs every FULL_INTERVAL.
+    """
+
+    def __init__(self, fetch: LibraryFetch):
+        self.fetch = fetch
+        self.movies: Dict[int, Movie] = {}
+        self.series: Dict[int, Series] = {}
+        self.counts: Dict[str, int] = {}
+        self.loaded_at: float = 0.0
+        self.refreshed_at: float = 0.0
+        self._views: Dict[str, Tuple] = {}
+        self._dirty = True
+        self._history_since: Dict[str, str] = {}
+        self._load_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._loop())
+
+    def stop(self) -> None:
+        if self._loop_task:
+            self._loop_task.cancel()
+            self._loop_task = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                if time.time() - self.loaded_at >= FULL_INTERVAL:
+                    await self.load()
+                else:
+                    await self.refresh_delta()
+            except Exception as e:
+                logger.error(f"Library refresh failed: {e}")
+            await asyncio.sleep(DELTA_INTERVAL)
+
+    async def ensure_loaded(self) -> bool:
+        """Load the catalogs if that has not happened yet; returns whether data is available."""
+        if not self.loaded_at:
+            if self._load_task is None or self._load_task.done():
+                self._load_task = asyncio.create_task(self.load())
+            await asyncio.shield(self._load_task)
+        return bool(self.loaded_at)
+
+    # ==================== Loading ====================
+
+    async def load(self) -> None:
+        """Replace the index with the full catalogs."""
+        since = self._now_iso()
+        movies, series = await asyncio.gather(
+            self.fetch('radarr', 'movie', None),
+            self.fetch('sonarr', 'series', None)
+        )
+        if movies is None and series is None:
+            logger.warning("Library load failed: neither Radarr nor Sonarr answered")
+            return
+
+        if movies is not None:
+            self.movies = {m['id']: Movie(m) for m in movies}
+            self._history_since['radarr'] = since
+        if series is not None:
+            self.series = {s['id']: Series(s) for s in series}
+            self._history_since['sonarr'] = since
+        self._dirty = True
+        self.loaded_at = self.refreshed_at = time.time()
+        logger.info(f"Library loaded: {len(self.movies)} movies, {len(self.series)} series")
+
+    async def refresh_delta(self) -> None:
+        """Refetch the items that have history entries since the last refresh."""
+        for service, id_field in (('radarr', 'movieId'), ('sonarr', 'seriesId')):
+            since = self._history_since.get(service)
+            if not since:
+                continue
+            now = self._now_iso()
+            history = await self.fetch(service, 'history/since', {'date': since})
+            if history is None:
+                continue
+            ids = {record[id_field] for record in history if record.get(id_field)}
+            if ids:
+                semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+
+                async def refresh(item_id: int):
+                    async with semaphore:
+                        await self.refresh_item(service, item_id)
+
+                await asyncio.gather(*(refresh(i) for i in ids))
+                logger.debug(f"Library delta: refreshed {len(ids)} {service} item(s)")
+            self._history_since[service] = now
+        self.refreshed_at = time.time()
+
+    async def refresh_item(self, service: str, item_id: int) -> None:
+        """Refetch one movie or series."""
+        endpoint = f"movie/{item_id}" if service == 'radarr' else f"series/{item_id}"
+        data = await self.fetch(service, endpoint, None)
+        if not isinstance(data, dict) or 'id' not in data:
+            # Failed or already deleted; delete webhooks and the full load settle it
+            return
+        if service == 'radarr':
+            self.movies[item_id] = Movie(data)
+        else:
+            self.series[item_id] = Series(data)
+        self._dirty = True
+
+    def remove(self, service: str, item_id: int) -> None:
+        items = self.movies if service == 'radarr' else self.series
+        if items.pop(item_id, None) is not None:
+            self._dirty = True
+
+    async def handle_webhook(self, service: str, data: Dict[str, Any]) -> None:
+        """Apply a Radarr/Sonarr webhook that adds, changes or deletes an item."""
+        event_type = data.get('eventType', '')
+        media = data.get('movie' if service == 'radarr' else 'series') or {}
+        item_id = media.get('id')
+        if not item_id or not self.loaded_at:
+            return
+        if event_type in DELETE_EVENTS[service]:
+            self.remove(service, item_id)
+        elif event_type in REFRESH_EVENTS[service]:
+            await self.refresh_item(service, item_id)
+
+    @staticmethod
+    def _now_iso() -> str:
+        return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+    # ==================== Views ====================
+
+    def _rebuild(self) -> None:
+        movies = tuple(sorted(self.movies.values(), key=attrgetter('sort_title', 'year')))
+        series = tuple(sorted(self.series.values(), key=attrgetter('sort_title', 'year')))
+        self._views = {
+            'movies': movies,
+            'movies_available': tuple(m for m in movies if m.has_file),
+            'series': series,
+            'series_available': tuple(s for s in series if s.episode_files > 0),
+        }
+        self.counts = {
+            'movies': len(movies),
+            'movies_available': len(self._views['movies_available']),
+            'movies_monitored': sum(1 for m in movies if m.monitored),
+            'series': len(series),
+            'series_available': len(self._views['series_available']),
+            'series_continuing': sum(1 for s in series if s.status == 'continuing'),
+            'series_ended': sum(1 for s in series if s.status == 'ended'),
+            'episodes': sum(s.episode_files for s in series),
+        }
+        self._dirty = False
+
+    def view(self, name: str) -> Tuple:
+        """A title-sorted view: movies, movies_available, series or series_available."""
+        if self._dirty:
+            self._rebuild()
+        return self._views[name]
+
+    def page(self, name: str, page: int = 1, per_page: int = 20) -> Page:
+        """One page of a view (pages are 1-based and clamped to the valid range)."""
+        items = self.view(name)
+        per_page = max(1, per_page)
+        pages = max(1, math.ceil(len(items) / per_page))
+        page = min(max(1, page), pages)
+        start = (page - 1) * per_page
+        return Page(items[start:start + per_page], page, pages, len(items))
+
+    def stats(self) -> Dict[str, int]:
+        if self._dirty:
+            self._rebuild()
+        return self.counts
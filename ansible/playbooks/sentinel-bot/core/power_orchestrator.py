@@ -0,0 +1,241 @@
+"""
+Sentinel Bot Power Orchestrator
+Dependency-aware parallel start and shutdown of Proxmox guests.
+"""
+
+import logging
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Set, Iterable, Callable, Awaitable, TYPE_CHECKING
+
+from .cluster_snapshot import GuestInfo
+
+if TYPE_CHECKING:
+    from .ssh_manager import SSHManager
+
+logger = logging.getLogger('sentinel.power')
+
+
+@dataclass
+class GuestOutcome:
+    """Progress and result of one guest in a power operation."""
+    guest: GuestInfo
+    state: str = 'waiting'  # waiting, running, done, failed, skipped
+    forced: bool = False
+    error: str = ''
+    elapsed: float = 0.0
+
+    @property
+    def label(self) -> str:
+        return f"{self.guest.name or self.guest.kind} ({self.guest.vmid})"
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ('done', 'failed', 'skipped')
+
+
+# Called whenever a guest changes state
+ProgressCallback = Callable[[GuestOutcome], Awaitable[None]]
+
+
+class PowerOrchestrator:
+    """
+    Starts or stops a set of guests as a dependency graph.
+
+    Each guest runs as soon as its prerequisites are done, bounded by a
+    per-node and a global concurrency limit, so an operation takes as long
+    as its critical path. Startup runs dependencies first; shutdown runs the
+    graph in reverse. Graceful shutdowns that fail or time out are followed
+    by a hard stop.
+    """
+
+    def __init__(
+        self,
+        ssh: 'SSHManager',
+        dependencies: Dict[str, List[str]] = None,
+        foundation: Iterable[int] = (),
+        node_concurrency: int = 3,
+        global_concurrency: int = 8,
+        shutdown_timeout: int = 120,
+        start_timeout: int = 120
+    ):
+        self.ssh = ssh
+        self.dependencies = dependencies or {}
+        self.foundation = set(foundation)
+        self.node_concurrency = node_concurrency
+        self.global_concurrency = global_concurrency
+        self.shutdown_timeout = shutdown_timeout
+        self.start_timeout = start_timeout
+
+    # ==================== Planning ====================
+
+    def prerequisites(self, guests: List[GuestInfo]) -> Dict[int, Set[int]]:
+        """
+        Map each guest to the guests that must be running before it starts.
+
+        Raises:
+            ValueError: If the dependency graph has a cycle
+        """
+        by_name = {g.name: g.vmid for g in guests if g.name}
+        vmids = {g.vmid for g in guests}
+        foundation = self.foundation & vmids
+
+        prereqs: Dict[int, Set[int]] = {}
+        for g in guests:
+            deps = {by_name[n] for n in self.dependencies.get(g.name, ()) if n in by_name}
+            if g.vmid not in foundation:
+                deps |= foundation
+            prereqs[g.vmid] = deps - {g.vmid}
+
+        self._check_acyclic(prereqs)
+        return prereqs
+
+    @staticmethod
+    def _check_acyclic(prereqs: Dict[int, Set[int]]) -> None:
+        remaining = {vmid: set(deps) for vmid, deps in prereqs.items()}
+        while remaining:
+            ready = [vmid for vmid, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Power dependency cycle between guests {sorted(remaining)}")
+            for vmid in ready:
+                del remaining[vmid]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    @staticmethod
+    def _reverse(prereqs: Dict[int, Set[int]]) -> Dict[int, Set[int]]:
+        """Turn 'needs' edges into 'needed by' edges for shutdown."""
+        dependents: Dict[int, Set[int]] = {vmid: set() for vmid in prereqs}
+        for vmid, deps in prereqs.items():
+            for dep in deps:
+                dependents[dep].add(vmid)
+        return dependents
+
+    # ==================== Operations ====================
+
+    async def shutdown(
+        self,
+        guests: List[GuestInfo],
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[GuestOutcome]:
+        """Shut down guests, dependents before the guests they depend on."""
+        order = self._reverse(self.prerequisites(guests))
+        # A dependency still goes down if a dependent failed - the node is going anyway
+        return await self._run(guests, order, self._stop_guest, on_progress, skip_on_failure=False)
+
+    async def startup(
+        self,
+        guests: List[GuestInfo],
+        on_progress: Optional[ProgressCallback] = None
+    ) -> List[GuestOutcome]:
+        """Start guests, dependencies first. Guests whose dependencies fail are skipped."""
+        order = self.prerequisites(guests)
+        return await self._run(guests, order, self._start_guest, on_progress, skip_on_failure=True)
+
+    async def _run(
+        self,
+        guests: List[GuestInfo],
+        order: Dict[int, Set[int]],
+        action: Callable[[GuestOutcome], Awaitable[bool]],
+        on_progress: Optional[ProgressCallback],
+        skip_on_failure: bool
+    ) -> List[GuestOutcome]:
+        outcomes = {g.vmid: GuestOutcome(guest=g) for g in guests}
+        finished = {vmid: asyncio.Event() for vmid in outcomes}
+        global_sem = asyncio.Semaphore(self.global_concurrency)
+        node_sems: Dict[str, asyncio.Semaphore] = {}
+
+        async def notify(outcome: GuestOutcome) -> None:
+            if on_progress:
+                try:
+                    await on_progress(outcome)
+                except Exception as e:
+                    logger.warning(f"Power progress callback failed: {e}")
+
+        async def run_one(outcome: GuestOutcome) -> None:
+            vmid = outcome.guest.vmid
+            try:
+                for dep in order[vmid]:
+                    await finished[dep].wait()
+
+                blocked = [outcomes[d].label for d in order[vmid] if outcomes[d].state != 'done']
+                if blocked and skip_on_failure:
+                    outcome.state = 'skipped'
+                    outcome.error = f"waiting on {', '.join(blocked)}"
+                    logger.warning(f"Skipping {outcome.label}: {outcome.error}")
+                    await notify(outcome)
+                    return
+
+                node_sem = node_sems.setdefault(
+                    outcome.guest.node, asyncio.Semaphore(self.node_concurrency)
+                )
+                async with node_sem, global_sem:
+                    outcome.state = 'running'
+                    await notify(outcome)
+                    started = time.monotonic()
+                    try:
+                        ok = await action(outcome)
+                    except Exception as e:
+                        outcome.error = str(e)
+                        ok = False
+                    outcome.elapsed = time.monotonic() - started
+                    outcome.state = 'done' if ok else 'failed'
+
+                await notify(outcome)
+            finally:
+                finished[vmid].set()
+
+        await asyncio.gather(*(run_one(o) for o in outcomes.values()))
+        return list(outcomes.values())
+
+    # ==================== Guest Actions ====================
+
+    async def _stop_guest(self, outcome: GuestOutcome) -> bool:
+        """Graceful shutdown with a per-guest timeout, then a hard stop."""
+        g = outcome.guest
+        if not g.node_ip:
+            outcome.error = f"unknown node {g.node}"
+            return False
+
+        if g.kind == 'qemu':
+            shutdown, stop = self.ssh.pve_shutdown_vm, self.ssh.pve_stop_vm
+        else:
+            shutdown, stop = self.ssh.pve_shutdown_lxc, self.ssh.pve_stop_lxc
+
+        logger.info(f"Shutting down {outcome.label} on {g.node}")
+        try:
+            result = await asyncio.wait_for(
+                shutdown(g.node_ip, g.vmid, timeout=self.shutdown_timeout),
+                self.shutdown_timeout + 60
+            )
+            if result.success:
+                return True
+            reason = result.stderr.strip() or 'shutdown failed'
+        except asyncio.TimeoutError:
+            reason = f'no response after {self.shutdown_timeout}s'
+
+        logger.warning(f"Graceful shutdown of {outcome.label} failed ({reason}), forcing stop")
+        outcome.forced = True
+        result = await stop(g.node_ip, g.vmid)
+        if not result.success:
+            outcome.error = result.stderr.strip() or 'stop failed'
+        return result.success
+
+    async def _start_guest(self, outcome: GuestOutcome) -> bool:
+        g = outcome.guest
+        if not g.node_ip:
+            outcome.error = f"unknown node {g.node}"
+            return False
+
+        start = self.ssh.pve_start_vm if g.kind == 'qemu' else self.ssh.pve_start_lxc
+
+        logger.info(f"Starting {outcome.label} on {g.node}")
+        try:
+            result = await asyncio.wait_for(start(g.node_ip, g.vmid), self.start_timeout)
+        except asyncio.TimeoutError:
+            outcome.error = f'no response after {self.start_timeout}s'
+            return False
+        if not result.success:
+            outcome.error = result.stderr.strip() or 'start failed'
+        return result.success
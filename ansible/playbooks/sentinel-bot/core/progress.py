@@ -3,8 +3,16 @@ Sentinel Bot Progress Bar Utilities
 Shared progress bar helpers for Discord embeds.
 """
 
+import logging
+import asyncio
+import time
 import discord
-from typing import Optional
+from typing import Optional, Dict, Any
+
+logger = logging.getLogger('sentinel.progress')
+
+# Minimum seconds between edits of one progress message
+EDIT_INTERVAL = 1.5
 
 
 def make_progress_bar(current: int, total: int, width: int = 20) -> str:
@@ -43,8 +51,72 @@ def make_step_progress(current_step: int, total_steps: int, step_name: str) -> s
     return f"Step {current_step}/{total_steps}: {step_name}"
 
 
+class MessageUpdater:
+    """
+    Coalesces edits to one Discord message.
+
+    update() only records the latest state and returns immediately; a
+    background task sends it at most once per interval, dropping any
+    intermediate states. Slow or rate-limited edits never block the caller.
+    finish() sends the final state right away and waits for it.
+    """
+
+    def __init__(self, message: discord.Message, interval: float = EDIT_INTERVAL):
+        self.message = message
+        self.interval = interval
+        self._pending: Optional[Dict[str, Any]] = None
+        self._last_edit = 0.0
+        self._now = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._finished = False
+
+    def update(self, **fields) -> None:
+        """Queue message.edit(**fields), replacing any update not yet sent."""
+        if self._finished:
+            return
+        self._pending = fields
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def flush(self) -> None:
+        """Send any queued update now and wait until it's delivered."""
+        self._now.set()
+        try:
+            if self._task and not self._task.done():
+                await self._task
+        finally:
+            self._now.clear()
+
+    async def finish(self, **fields) -> None:
+        """Send the final state immediately; later update() calls are ignored."""
+        if fields:
+            self.update(**fields)
+        self._finished = True
+        await self.flush()
+
+    async def _flush_loop(self) -> None:
+        while self._pending is not None:
+            delay = self._last_edit + self.interval - time.monotonic()
+            if delay > 0 and not self._now.is_set():
+                try:
+                    await asyncio.wait_for(self._now.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+            fields, self._pending = self._pending, None
+            self._last_edit = time.monotonic()
+            try:
+                await self.message.edit(**fields)
+            except discord.HTTPException as e:
+                logger.warning(f"Progress message edit failed: {e}")
+
+
 class ProgressEmbed:
-    """Helper class for managing progress updates in Discord embeds."""
+    """
+    Helper class for managing progress updates in Discord embeds.
+
+    Once attached to a message, update() queues an edit through a
+    MessageUpdater and finish() sends the final embed.
+    """
 
     def __init__(
         self,
@@ -62,14 +134,26 @@ class ProgressEmbed:
             color=color
         )
         self.embed.add_field(name="Status", value="Starting...", inline=False)
+        self.updater: Optional[MessageUpdater] = None
+
+    def attach(self, message: discord.Message, interval: float = EDIT_INTERVAL) -> None:
+        """Stream updates to the message showing this embed."""
+        self.updater = MessageUpdater(message, interval)
 
     def update(self, current: int, status: str) -> discord.Embed:
-        """Update progress and return the embed."""
+        """Update progress, queue an edit if attached, and return the embed."""
         self.current = current
         self.embed.description = make_progress_bar(current, self.total)
         self.embed.set_field_at(0, name="Status", value=status, inline=False)
+        if self.updater:
+            self.updater.update(embed=self.embed)
         return self.embed
 
+    async def finish(self) -> None:
+        """Send the embed in its final state (after complete() or error())."""
+        if self.updater:
+            await self.updater.finish(embed=self.embed)
+
     def complete(
         self,
         title: str,
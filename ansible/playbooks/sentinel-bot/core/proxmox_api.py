@@ -0,0 +1,167 @@
+"""
+Sentinel Bot Proxmox API Client
+Pooled async HTTPS client for the Proxmox VE REST API.
+"""
+
+import logging
+import asyncio
+import time
+import aiohttp
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger('sentinel.proxmox')
+
+
+class ProxmoxAPIError(Exception):
+    """The Proxmox API answered with an error response."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"HTTP {status}: {message}")
+        self.status = status
+
+
+class ProxmoxUnavailable(Exception):
+    """The Proxmox API could not be reached or rejected our credentials."""
+
+
+class ProxmoxAPI:
+    """
+    Async Proxmox VE API client.
+
+    Requests go to the node being managed (https://<node_ip>:<port>), using
+    API-token auth over a shared keep-alive connection pool. Node names are
+    resolved from IPs via /cluster/status and cached.
+    """
+
+    def __init__(
+        self,
+        token_id: str,
+        token_secret: str,
+        port: int = 8006,
+        verify_ssl: bool = False,
+        timeout: float = 10,
+        scheme: str = 'https'
+    ):
+        self.token_id = token_id
+        self.token_secret = token_secret
+        self.port = port
+        self.verify_ssl = verify_ssl
+        self.timeout = timeout
+        self.scheme = scheme
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._node_names: Dict[str, str] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=8,
+                keepalive_timeout=60,
+                ssl=None if self.verify_ssl else False,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'Authorization': f'PVEAPIToken={self.token_id}={self.token_secret}'},
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the HTTP connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    async def _request(self, node_ip: str, method: str, path: str, **kwargs) -> Any:
+        """Make an API request against a node and return the `data` payload."""
+        url = f"{self.scheme}://{node_ip}:{self.port}/api2/json{path}"
+        try:
+            async with self._get_session().request(method, url, **kwargs) as resp:
+                if resp.status == 401:
+                    raise ProxmoxUnavailable(f"Authentication failed for {node_ip}")
+                if resp.status >= 400:
+                    raise ProxmoxAPIError(resp.status, resp.reason or await resp.text())
+                payload = await resp.json(content_type=None)
+                return payload.get('data') if payload else None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise ProxmoxUnavailable(f"{node_ip}: {e or 'timeout'}") from e
+
+    async def node_name(self, node_ip: str) -> str:
+        """Resolve a node's cluster name from its IP."""
+        if node_ip not in self._node_names:
+            for entry in await self._request(node_ip, 'GET', '/cluster/status') or []:
+                if entry.get('type') == 'node' and entry.get('ip'):
+                    self._node_names[entry['ip']] = entry['name']
+            if node_ip not in self._node_names:
+                # Standalone node - ask it directly
+                nodes = await self._request(node_ip, 'GET', '/nodes') or []
+                if len(nodes) != 1:
+                    raise ProxmoxAPIError(404, f"Cannot resolve node name for {node_ip}")
+                self._node_names[node_ip] = nodes[0]['node']
+        return self._node_names[node_ip]
+
+    # ==================== Read Endpoints ====================
+
+    async def node_status(self, node_ip: str) -> Dict[str, Any]:
+        node = await self.node_name(node_ip)
+        return await self._request(node_ip, 'GET', f'/nodes/{node}/status')
+
+    async def list_guests(self, node_ip: str, kind: str) -> List[Dict[str, Any]]:
+        """List guests of a kind ('qemu' or 'lxc') on a node."""
+        node = await self.node_name(node_ip)
+        return await self._request(node_ip, 'GET', f'/nodes/{node}/{kind}') or []
+
+    async def guest_status(self, node_ip: str, kind: str, vmid: int) -> Dict[str, Any]:
+        node = await self.node_name(node_ip)
+        return await self._request(node_ip, 'GET', f'/nodes/{node}/{kind}/{vmid}/status/current')
+
+    async def cluster_status(self, node_ip: str) -> List[Dict[str, Any]]:
+        return await self._request(node_ip, 'GET', '/cluster/status') or []
+
+    async def cluster_resources(self, node_ip: str, resource_type: str = None) -> List[Dict[str, Any]]:
+        params = {'type': resource_type} if resource_type else None
+        return await self._request(node_ip, 'GET', '/cluster/resources', params=params) or []
+
+    # ==================== Actions ====================
+
+    async def guest_action(
+        self,
+        node_ip: str,
+        kind: str,
+        vmid: int,
+        action: str,
+        wait: bool = True,
+        timeout: float = 120,
+        params: Dict[str, Any] = None
+    ) -> str:
+        """
+        Run a guest power action (start/stop/shutdown/reboot).
+
+        Returns the task UPID. With wait=True, blocks until the task finishes
+        and raises ProxmoxAPIError if it did not exit OK.
+        """
+        node = await self.node_name(node_ip)
+        upid = await self._request(
+            node_ip, 'POST', f'/nodes/{node}/{kind}/{vmid}/status/{action}', data=params
+        )
+        if wait:
+            try:
+                await self.wait_task(node_ip, upid, timeout=timeout)
+            except ProxmoxUnavailable as e:
+                # The action was accepted - don't let callers retry it elsewhere
+                raise ProxmoxAPIError(503, f"Lost contact while waiting for {upid}: {e}") from e
+        return upid
+
+    async def wait_task(self, node_ip: str, upid: str, timeout: float = 120) -> Dict[str, Any]:
+        """Poll a task UPID until it stops."""
+        node = upid.split(':')[1] if upid.startswith('UPID:') else await self.node_name(node_ip)
+        deadline = time.monotonic() + timeout
+        delay = 0.2
+        while True:
+            status = await self._request(node_ip, 'GET', f'/nodes/{node}/tasks/{upid}/status')
+            if status.get('status') == 'stopped':
+                if status.get('exitstatus') != 'OK':
+                    raise ProxmoxAPIError(500, status.get('exitstatus') or 'task failed')
+                return status
+            if time.monotonic() >= deadline:
+                raise ProxmoxAPIError(504, f"Task {upid} still running after {timeout}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 2.0)
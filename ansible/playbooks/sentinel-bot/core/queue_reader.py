@@ -0,0 +1,140 @@
+"""
+Sentinel Bot Queue Reader
+Reads Radarr/Sonarr download queues in lean pages and attaches movie,
+series and episode details from a cache, fetching only what is missing.
+
+Standard library only: the media download bots (download-monitor and
+Mnemosyne) deploy this same file next to their scripts as queue_reader.py.
+"""
+
+import logging
+import asyncio
+import math
+import time
+from typing import Optional, Dict, List, Tuple, Any, Callable, Awaitable
+
+logger = logging.getLogger('sentinel.queue')
+
+# Records per queue page (the API default is only 10)
+QUEUE_PAGE_SIZE = 100
+
+# Concurrent requests per service for queue pages and missing details
+MAX_CONCURRENT_REQUESTS = 4
+
+# Cached movie/series/episode details are refetched after this long (seconds)
+MEDIA_TTL = 6 * 3600
+
+# Details attached to queue records: (record key, record ID field) per service
+EMBEDDED = {
+    'radarr': (('movie', 'movieId'),),
+    'sonarr': (('series', 'seriesId'), ('episode', 'episodeId')),
+}
+
+# fetch(endpoint, params) -> decoded JSON, or None on failure
+QueueFetch = Callable[[str, Any], Awaitable[Any]]
+
+
+def slim(kind: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """The fields of a movie, series or episode that titles and posters need."""
+    if kind == 'episode':
+        return {k: data.get(k) for k in ('id', 'seriesId', 'seasonNumber', 'episodeNumber', 'title')}
+    posters = [i for i in data.get('images') or [] if i.get('coverType') == 'poster']
+    return {
+        'id': data.get('id'),
+        'title': data.get('title'),
+        'year': data.get('year'),
+        'images': posters[:1],
+    }
+
+
+class QueueReader:
+    """
+    Reads one service's download queue.
+
+    Pages are requested without include* flags, which would embed the full
+    movie or series (with every image, rating and statistic) in each
+    record. The first page gives the page count and the rest are fetched
+    concurrently. Details are memoized by movie/series/episode ID and
+    requested only for records whose ID is not cached, then attached to
+    the records under the usual 'movie', 'series' and 'episode' keys.
+    """
+
+    def __init__(self, service: str, fetch: QueueFetch):
+        self.service = service
+        self.fetch = fetch
+        self.requests = 0  # API requests made, for diagnostics
+        self._media: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}  # (kind, id) -> (expires, details)
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def _get(self, endpoint: str, params: Any = None) -> Any:
+        async with self._semaphore:
+            self.requests += 1
+            return await self.fetch(endpoint, params)
+
+    # ==================== Queue ====================
+
+    async def read(self) -> Optional[List[Dict[str, Any]]]:
+        """All queue records with details attached, or None if the queue could not be read."""
+        first = await self._get('queue', self._page_params(1))
+        if first is None:
+            return None
+
+        pages = [first]
+        page_count = math.ceil((first.get('totalRecords') or 0) / QUEUE_PAGE_SIZE)
+        if page_count > 1:
+            rest = await asyncio.gather(*(
+                self._get('queue', self._page_params(page)) for page in range(2, page_count + 1)
+            ))
+            if any(page is None for page in rest):
+                return None
+            pages.extend(rest)
+
+        # Records can shift between pages while they are read; keep one per ID
+        records = {}
+        for page in pages:
+            for record in page.get('records') or []:
+                records[record.get('id')] = record
+        records = list(records.values())
+
+        await self._attach(records)
+        return records
+
+    @staticmethod
+    def _page_params(page: int) -> Dict[str, str]:
+        return {'page': str(page), 'pageSize': str(QUEUE_PAGE_SIZE)}
+
+    # ==================== Details ====================
+
+    async def _attach(self, records: List[Dict[str, Any]]) -> None:
+        now = time.monotonic()
+        for kind, id_field in EMBEDDED[self.service]:
+            ids = {r[id_field] for r in records if r.get(id_field)}
+            missing = [i for i in ids if self._media.get((kind, i), (0,))[0] <= now]
+            if missing:
+                await self._load(kind, missing)
+            for record in records:
+                cached = self._media.get((kind, record.get(id_field)))
+                if cached:
+                    record[kind] = cached[1]
+
+    async def _load(self, kind: str, ids: List[int]) -> None:
+        if kind == 'episode':
+            # Episodes are requested in batches (season packs have many)
+            batches = [ids[i:i + QUEUE_PAGE_SIZE] for i in range(0, len(ids), QUEUE_PAGE_SIZE)]
+            results = await asyncio.gather(*(
+                self._get('episode', [('episodeIds', str(i)) for i in batch]) for batch in batches
+            ))
+            items = [item for result in results if isinstance(result, list) for item in result]
+        else:
+            results = await asyncio.gather(*(self._get(f"{kind}/{i}") for i in ids))
+            items = [r for r in results if isinstance(r, dict)]
+
+        now = time.monotonic()
+        self._media = {key: entry for key, entry in self._media.items() if entry[0] > now}
+        for item in items:
+            if item.get('id'):
+                self._media[(kind, item['id'])] = (now + MEDIA_TTL, slim(kind, item))
+        logger.debug(f"{self.service}: fetched {len(items)}/{len(ids)} missing {kind} detail(s)")
+
+    def stats(self) -> Dict[str, int]:
+        return {'requests': self.requests, 'cached': len(self._media)}
@@ -0,0 +1,222 @@
+"""
+Sentinel Bot Registry Client
+Resolves image tags to manifest digests with Docker Registry v2 HEAD
+requests, caching bearer tokens and digests.
+"""
+
+import logging
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple, Iterable
+
+import aiohttp
+
+logger = logging.getLogger('sentinel.registry')
+
+DOCKER_HUB = 'docker.io'
+DOCKER_HUB_API = 'registry-1.docker.io'
+
+# Ask for the multi-arch index first: that is the digest `docker pull <tag>`
+# records in RepoDigests
+MANIFEST_ACCEPT = ', '.join([
+    'application/vnd.oci.image.index.v1+json',
+    'application/vnd.docker.distribution.manifest.list.v2+json',
+    'application/vnd.docker.distribution.manifest.v2+json',
+    'application/vnd.oci.image.manifest.v1+json',
+])
+
+# Remote digests are reused for this long (seconds)
+DIGEST_TTL = 3600
+
+# Concurrent registry requests
+MAX_CONCURRENT_LOOKUPS = 8
+
+
+class RegistryError(Exception):
+    """A registry lookup failed."""
+
+
+@dataclass(frozen=True)
+class ImageRef:
+    """A parsed image reference like ghcr.io/org/app:1.2."""
+    registry: str
+    repository: str
+    tag: str = 'latest'
+    digest: Optional[str] = None  # set for pinned references (image@sha256:...)
+
+    @property
+    def name(self) -> str:
+        """registry/repository, the key RepoDigests are matched on."""
+        return f"{self.registry}/{self.repository}"
+
+    def __str__(self) -> str:
+        return f"{self.name}@{self.digest}" if self.digest else f"{self.name}:{self.tag}"
+
+
+def parse_image_ref(reference: str) -> ImageRef:
+    """
+    Parse an image reference the way the Docker CLI does.
+
+    Raises:
+        ValueError: If the reference is empty or an image ID
+    """
+    reference = reference.strip()
+    if not reference or re.fullmatch(r'(sha256:)?[0-9a-f]{64}', reference):
+        raise ValueError(f"Not an image reference: {reference!r}")
+
+    name, _, digest = reference.partition('@')
+    registry = DOCKER_HUB
+    first, sep, rest = name.partition('/')
+    if sep and ('.' in first or ':' in first or first == 'localhost'):
+        registry, name = first, rest
+
+    tag = 'latest'
+    last_slash = name.rfind('/')
+    if ':' in name[last_slash + 1:]:
+        name, tag = name.rsplit(':', 1)
+
+    if registry == DOCKER_HUB and '/' not in name:
+        name = f"library/{name}"
+    return ImageRef(registry, name.lower(), tag, digest or None)
+
+
+class RegistryClient:
+    """
+    Looks up manifest digests for image tags.
+
+    Bearer tokens are cached per scope until they expire, and each
+    registry's auth challenge is remembered so later repositories fetch a
+    token up front instead of taking a 401 first. Digests are cached per
+    image:tag for `ttl` seconds and concurrent lookups of the same tag
+    share one request.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DIGEST_TTL,
+        concurrency: int = MAX_CONCURRENT_LOOKUPS,
+        plain_http: Iterable[str] = (),
+        timeout: float = 15
+    ):
+        self.ttl = ttl
+        self.plain_http = set(plain_http)  # registries served over http (local test registries)
+        self.timeout = timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+        self._digests: Dict[str, Tuple[float, str]] = {}         # image:tag -> (expires, digest)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._challenges: Dict[str, Tuple[str, str]] = {}        # registry -> (realm, service)
+        self._tokens: Dict[Tuple[str, str, str], Tuple[float, str]] = {}  # (realm, service, scope) -> (expires, token)
+
+        self.requests = 0  # HTTP requests made, for diagnostics
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENT_LOOKUPS, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the HTTP connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+    # ==================== Digests ====================
+
+    async def remote_digest(self, image: ImageRef) -> str:
+        """
+        Current manifest digest of an image tag.
+
+        Raises:
+            RegistryError: If the registry could not be queried
+        """
+        key = str(image)
+        cached = self._digests.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._lookup(image))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        digest = await asyncio.shield(task)
+
+        self._digests[key] = (time.monotonic() + self.ttl, digest)
+        return digest
+
+    def forget(self, image: ImageRef) -> None:
+        """Drop a cached digest, e.g. after the image was pulled."""
+        self._digests.pop(str(image), None)
+
+    async def _lookup(self, image: ImageRef) -> str:
+        host = DOCKER_HUB_API if image.registry == DOCKER_HUB else image.registry
+        scheme = 'http' if image.registry in self.plain_http else 'https'
+        url = f"{scheme}://{host}/v2/{image.repository}/manifests/{image.tag}"
+        scope = f"repository:{image.repository}:pull"
+
+        async with self._semaphore:
+            try:
+                headers = {'Accept': MANIFEST_ACCEPT}
+                if image.registry in self._challenges:
+                    headers['Authorization'] = f"Bearer {await self._token(image.registry, scope)}"
+
+                resp = await self._head(url, headers)
+                if resp.status == 401:
+                    # First contact (or an expired token): follow the challenge once
+                    self._parse_challenge(image.registry, resp.headers.get('WWW-Authenticate', ''))
+                    headers['Authorization'] = f"Bearer {await self._token(image.registry, scope, refresh=True)}"
+                    resp = await self._head(url, headers)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                raise RegistryError(f"{image.registry}: {e or 'timeout'}") from e
+
+        if resp.status != 200:
+            raise RegistryError(f"{image}: HTTP {resp.status}")
+        digest = resp.headers.get('Docker-Content-Digest')
+        if not digest:
+            raise RegistryError(f"{image}: registry did not return a digest")
+        return digest
+
+    async def _head(self, url: str, headers: Dict[str, str]) -> aiohttp.ClientResponse:
+        self.requests += 1
+        async with self._get_session().head(url, headers=headers) as resp:
+            return resp
+
+    # ==================== Auth ====================
+
+    def _parse_challenge(self, registry: str, header: str) -> None:
+        if not header.lower().startswith('bearer '):
+            raise RegistryError(f"{registry}: unsupported auth challenge {header!r}")
+        params = dict(re.findall(r'(\w+)="([^"]*)"', header))
+        if 'realm' not in params:
+            raise RegistryError(f"{registry}: auth challenge without realm")
+        self._challenges[registry] = (params['realm'], params.get('service', ''))
+
+    async def _token(self, registry: str, scope: str, refresh: bool = False) -> str:
+        realm, service = self._challenges[registry]
+        key = (realm, service, scope)
+        cached = self._tokens.get(key)
+        if cached and cached[0] > time.monotonic() and not refresh:
+            return cached[1]
+
+        self.requests += 1
+        params = {'scope': scope}
+        if service:
+            params['service'] = service
+        async with self._get_session().get(realm, params=params) as resp:
+            if resp.status != 200:
+                raise RegistryError(f"{registry}: token request failed (HTTP {resp.status})")
+            data = await resp.json(content_type=None)
+
+        token = data.get('token') or data.get('access_token')
+        if not token:
+            raise RegistryError(f"{registry}: token response without a token")
+        # Renew a little early so a token never expires mid-request
+        expires = time.monotonic() + max(int(data.get('expires_in', 60)) - 15, 0)
+        self._tokens[key] = (expires, token)
+        return token
@@ -5,12 +5,44 @@ Async SSH client for infrastructure management.
 
 import logging
 import asyncio
+import contextlib
+import json
+import random
+import time
 import asyncssh
-from typing import Optional, Tuple, Dict, Any
-from dataclasses import dataclass
+from collections import deque
+from typing import (
+    Optional, Tuple, Dict, Any, List, Mapping, Iterable, AsyncIterator, Union,
+    Callable, Awaitable, Deque
+)
+from dataclasses import dataclass, field
+
+from .proxmox_api import ProxmoxAPI, ProxmoxAPIError, ProxmoxUnavailable
 
 logger = logging.getLogger('sentinel.ssh')
 
+# Fan-out command map value: a command, or a (command, user) pair
+FanoutCommand = Union[str, Tuple[str, str]]
+
+# Callback receiving each batch of streamed output lines
+OutputCallback = Callable[[List[str]], Awaitable[None]]
+
+# Callback notified after a guest power action: (node_ip, kind, vmid, action, success)
+MutationListener = Callable[[str, str, int, str, bool], None]
+
+# Result cache TTLs (seconds) per read-only command class
+CACHE_TTLS = {
+    'pve_node': 10,     # node status
+    'pve_guests': 15,   # VM/LXC lists and per-guest status
+    'pve_cluster': 5,   # cluster-wide resource listing
+    'docker_ps': 10,    # container lists
+    'system': 30,       # uptime, disk and memory usage
+}
+
+# Reconnect backoff bounds (seconds)
+RECONNECT_BACKOFF_BASE = 1.0
+RECONNECT_BACKOFF_MAX = 30.0
+
 
 @dataclass
 class SSHResult:
@@ -26,12 +58,393 @@ class SSHResult:
         return self.stdout.strip() or self.stderr.strip()
 
 
+class _PoolClient(asyncssh.SSHClient):
+    """SSH client callbacks used to detect dead transports without probing."""
+
+    def __init__(self):
+        self.lost = False
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.lost = True
+        if exc:
+            logger.debug(f"SSH transport lost: {exc}")
+
+
+@dataclass
+class _PooledConnection:
+    """A pooled SSH connection and its channel accounting."""
+    conn: asyncssh.SSHClientConnection
+    client: _PoolClient
+    channels: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+
+    @property
+    def alive(self) -> bool:
+        return not self.client.lost
+
+
+class _HostPool:
+    """
+    Connection pool for a single user@host.
+
+    Multiplexes several channels over each connection and opens additional
+    connections (up to max_connections) only when all existing ones are busy.
+    """
+
+    def __init__(self, key: str, connect, max_connections: int, max_channels: int):
+        self.key = key
+        self._connect = connect
+        self.max_connections = max_connections
+        self.max_channels = max_channels
+        self._connections: List[_PooledConnection] = []
+        self._opening = 0
+        self._cond = asyncio.Condition()
+        self._failures = 0
+        self._retry_at = 0.0
+
+    def _prune(self) -> None:
+        """Drop connections whose transport has gone away."""
+        for pooled in [p for p in self._connections if not p.alive]:
+            self._discard(pooled)
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        if pooled in self._connections:
+            self._connections.remove(pooled)
+            logger.debug(f"Discarded SSH connection to {self.key}")
+        pooled.conn.close()
+
+    def _least_loaded(self) -> Optional[_PooledConnection]:
+        candidates = [p for p in self._connections if p.channels < self.max_channels]
+        return min(candidates, key=lambda p: p.channels) if candidates else None
+
+    async def acquire(self) -> _PooledConnection:
+        """Reserve a channel slot, opening a new connection if needed."""
+        async with self._cond:
+            while True:
+                self._prune()
+                pooled = self._least_loaded()
+                if pooled:
+                    pooled.channels += 1
+                    return pooled
+                if len(self._connections) + self._opening < self.max_connections:
+                    self._opening += 1
+                    break
+                await self._cond.wait()
+
+        try:
+            pooled = await self._open()
+        except BaseException:
+            async with self._cond:
+                self._opening -= 1
+                self._cond.notify_all()
+            raise
+
+        async with self._cond:
+            self._opening -= 1
+            pooled.channels += 1
+            self._connections.append(pooled)
+            self._cond.notify_all()
+        return pooled
+
+    async def release(self, pooled: _PooledConnection, broken: bool = False) -> None:
+        """Return a channel slot to the pool."""
+        async with self._cond:
+            pooled.channels -= 1
+            pooled.last_used = time.monotonic()
+            if broken or not pooled.alive:
+                self._discard(pooled)
+            self._cond.notify_all()
+
+    async def _open(self) -> _PooledConnection:
+        """Open a new connection, honouring the reconnect backoff."""
+        wait = self._retry_at - time.monotonic()
+        if wait > 0:
+            raise ConnectionError(f"Reconnect to {self.key} backing off for {wait:.0f}s")
+
+        try:
+            conn, client = await self._connect()
+        except Exception:
+            self._failures += 1
+            backoff = min(RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_BASE * 2 ** (self._failures - 1))
+            self._retry_at = time.monotonic() + backoff * random.uniform(0.5, 1.0)
+            raise
+
+        self._failures = 0
+        self._retry_at = 0.0
+        logger.debug(f"SSH connected to {self.key}")
+        return _PooledConnection(conn=conn, client=client)
+
+    async def evict_idle(self, idle_timeout: float) -> int:
+        """Close connections with no open channels that have been idle too long."""
+        now = time.monotonic()
+        async with self._cond:
+            idle = [
+                p for p in self._connections
+                if not p.alive or (p.channels == 0 and now - p.last_used > idle_timeout)
+            ]
+            for pooled in idle:
+                self._discard(pooled)
+            return len(idle)
+
+    def close(self) -> None:
+        for pooled in list(self._connections):
+            self._discard(pooled)
+
+
+class SSHStream:
+    """
+    Streaming output of a remote command.
+
+    Iterate with `async for batch in stream` to receive lists of output lines
+    (or raw chunks when chunk_size is set). A bounded queue sits between the
+    SSH channel and the consumer, so a slow consumer pauses the remote side
+    via SSH flow control instead of growing memory. Only the last tail_lines
+    lines are retained for result().
+    """
+
+    def __init__(
+        self,
+        pool: _HostPool,
+        host: str,
+        command: str,
+        timeout: int = 600,
+        batch_lines: int = 20,
+        batch_interval: float = 1.0,
+        chunk_size: int = None,
+        max_bytes: int = None,
+        tail_lines: int = 200,
+    ):
+        self.host = host
+        self.command = command
+        self.timeout = timeout
+        self.batch_lines = batch_lines
+        self.batch_interval = batch_interval
+        self.chunk_size = chunk_size
+        self.max_bytes = max_bytes
+
+        self.tail: Deque[str] = deque(maxlen=tail_lines)
+        self.bytes_read = 0
+        self.truncated = False
+        self.timed_out = False
+        self.exit_code: Optional[int] = None
+        self.error: Optional[str] = None
+
+        self._pool = pool
+        self._pooled: Optional[_PooledConnection] = None
+        self._process: Optional[asyncssh.SSHClientProcess] = None
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=batch_lines * 4)
+        self._reader: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'SSHStream':
+        self._pooled = await self._pool.acquire()
+        try:
+            self._process = await self._pooled.conn.create_process(
+                self.command, stderr=asyncssh.STDOUT
+            )
+        except Exception:
+            await self._pool.release(self._pooled)
+            self._pooled = None
+            raise
+        self._reader = asyncio.create_task(self._read())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _read(self) -> None:
+        """Pump output from the channel into the bounded queue."""
+        deadline = time.monotonic() + self.timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                if self.chunk_size:
+                    data = await asyncio.wait_for(self._process.stdout.read(self.chunk_size), remaining)
+                else:
+                    data = await asyncio.wait_for(self._process.stdout.readline(), remaining)
+                if not data:
+                    break
+
+                self.bytes_read += len(data)
+                if self.max_bytes and self.bytes_read > self.max_bytes:
+                    self.truncated = True
+                    self._process.close()
+                    break
+
+                await self._queue.put(data if self.chunk_size else data.rstrip('\r\n'))
+
+            if not self.truncated:
+                completed = await asyncio.wait_for(
+                    self._process.wait(check=False),
+                    max(deadline - time.monotonic(), 1)
+                )
+                self.exit_code = completed.exit_status
+        except asyncio.TimeoutError:
+            self.timed_out = True
+            self.error = f'Command timed out after {self.timeout}s'
+            self._process.close()
+        except Exception as e:
+            self.error = str(e)
+            self._process.close()
+        finally:
+            await self._queue.put(None)
+
+    def __aiter__(self) -> AsyncIterator[List[str]]:
+        return self._batches()
+
+    async def _batches(self) -> AsyncIterator[List[str]]:
+        """Group queued output into batches by size or elapsed time."""
+        done = False
+        while not done:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            flush_at = time.monotonic() + self.batch_interval
+            while len(batch) < self.batch_lines:
+                remaining = flush_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    done = True
+                    break
+                batch.append(item)
+
+            if self.chunk_size:
+                self.tail.extend(''.join(batch).splitlines())
+            else:
+                self.tail.extend(batch)
+            yield batch
+
+    async def close(self) -> None:
+        """Stop the remote command (if still running) and free the channel."""
+        if self._reader and not self._reader.done():
+            self._process.close()
+            self._reader.cancel()
+            try:
+                await self._reader
+            except (asyncio.CancelledError, Exception):
+                pass
+        if self._pooled:
+            await self._pool.release(self._pooled)
+            self._pooled = None
+
+    def result(self) -> SSHResult:
+        """Summarise the stream as an SSHResult holding the retained tail."""
+        output = '\n'.join(self.tail)
+        if self.error:
+            return SSHResult(success=False, stdout=output, stderr=self.error, exit_code=-1)
+        if self.truncated:
+            return SSHResult(
+                success=False,
+                stdout=output,
+                stderr=f'Output exceeded {self.max_bytes} bytes',
+                exit_code=-1
+            )
+        exit_code = self.exit_code or 0
+        # stderr is merged into the stream; surface the last lines on failure
+        stderr = '\n'.join(list(self.tail)[-5:]) if exit_code else ''
+        return SSHResult(success=exit_code == 0, stdout=output, stderr=stderr, exit_code=exit_code)
+
+
+class _ResultCache:
+    """
+    TTL cache for read-only command results with single-flight de-duplication.
+
+    Concurrent requests for the same key share one in-flight execution;
+    only successful results are kept after it completes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str], Tuple[float, SSHResult]] = {}
+        self._inflight: Dict[Tuple[str, str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    async def get_or_run(
+        self,
+        key: Tuple[str, str, str],
+        ttl: float,
+        factory: Callable[[], Awaitable[SSHResult]]
+    ) -> SSHResult:
+        entry = self._entries.get(key)
+        if entry and entry[0] > time.monotonic():
+            self.hits += 1
+            return entry[1]
+
+        task = self._inflight.get(key)
+        if task:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.create_task(factory())
+            self._inflight[key] = task
+
+            def store(done: asyncio.Task) -> None:
+                if self._inflight.get(key) is not done:
+                    return  # invalidated while running
+                del self._inflight[key]
+                if not done.cancelled() and not done.exception() and done.result().success:
+                    self._entries[key] = (time.monotonic() + ttl, done.result())
+
+            task.add_done_callback(store)
+
+        # Shield so one cancelled caller doesn't abort the shared execution
+        return await asyncio.shield(task)
+
+    def invalidate(self, host: str = None, classes: Iterable[str] = ()) -> int:
+        """Drop entries for a host (all hosts if None) and command classes (all if empty)."""
+        classes = set(classes)
+        stale = [
+            key for key in self._entries
+            if (host is None or key[1] == host) and (not classes or key[0] in classes)
+        ]
+        for key in stale:
+            del self._entries[key]
+        # In-flight results may predate the mutation - don't let them be stored
+        for key in [k for k in self._inflight
+                    if (host is None or k[1] == host) and (not classes or k[0] in classes)]:
+            del self._inflight[key]
+        self.invalidations += 1
+        return len(stale)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'invalidations': self.invalidations,
+            'entries': len(self._entries),
+        }
+
+
 class SSHManager:
-    """Async SSH manager for infrastructure commands."""
+    """
+    Async SSH manager for infrastructure commands.
+
+    When a ProxmoxAPI client is supplied, the pve_* helpers use the REST API
+    and fall back to SSH + pvesh/qm/pct if the API is unreachable.
+    """
 
-    def __init__(self, ssh_config):
+    def __init__(self, ssh_config, pve_api: Optional[ProxmoxAPI] = None):
         self.config = ssh_config
-        self._connections: Dict[str, asyncssh.SSHClientConnection] = {}
+        self.pve_api = pve_api
+        self._pools: Dict[str, _HostPool] = {}
+        self._reaper: Optional[asyncio.Task] = None
+
+        # Fan-out limits shared by every run_many() caller
+        self._fanout_sem = asyncio.Semaphore(ssh_config.fanout_concurrency)
+        self._host_sems: Dict[str, asyncio.Semaphore] = {}
+
+        self._cache = _ResultCache()
+        self._mutation_listeners: List[MutationListener] = []
 
     @property
     def key_path(self) -> str:
@@ -45,43 +458,53 @@ class SSHManager:
     def proxmox_user(self) -> str:
         return self.config.proxmox_user
 
-    async def _get_connection(
-        self,
-        host: str,
-        user: str = None,
-        force_new: bool = False
-    ) -> asyncssh.SSHClientConnection:
-        """Get or create an SSH connection to a host."""
+    def _get_pool(self, host: str, user: str = None) -> _HostPool:
+        """Get or create the connection pool for user@host."""
         user = user or self.user
         cache_key = f"{user}@{host}"
 
-        # Check for existing connection
-        if not force_new and cache_key in self._connections:
-            conn = self._connections[cache_key]
-            # Verify connection is still alive
-            try:
-                # Quick test
-                await asyncio.wait_for(conn.run('echo ok', check=False), timeout=5)
-                return conn
-            except Exception:
-                # Connection dead, remove from cache
-                del self._connections[cache_key]
-
-        # Create new connection
-        try:
-            conn = await asyncssh.connect(
-                host,
-                username=user,
-                client_keys=[self.key_path],
-                known_hosts=None,  # Accept all host keys
-                connect_timeout=10,
+        pool = self._pools.get(cache_key)
+        if pool is None:
+            async def connect() -> Tuple[asyncssh.SSHClientConnection, _PoolClient]:
+                try:
+                    return await asyncssh.create_connection(
+                        _PoolClient,
+                        host,
+                        username=user,
+                        client_keys=[self.key_path],
+                        known_hosts=None,  # Accept all host keys
+                        connect_timeout=10,
+                        keepalive_interval=self.config.keepalive_interval,
+                        keepalive_count_max=self.config.keepalive_count_max,
+                    )
+                except (OSError, asyncssh.Error) as e:
+                    logger.error(f"SSH connection failed to {cache_key}: {e}")
+                    raise
+
+            pool = _HostPool(
+                cache_key,
+                connect,
+                max_connections=self.config.max_connections_per_host,
+                max_channels=self.config.max_channels_per_connection,
             )
-            self._connections[cache_key] = conn
-            logger.debug(f"SSH connected to {cache_key}")
-            return conn
-        except asyncssh.Error as e:
-            logger.error(f"SSH connection failed to {cache_key}: {e}")
-            raise
+            self._pools[cache_key] = pool
+
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle())
+        return pool
+
+    async def _reap_idle(self) -> None:
+        """Periodically close idle pooled connections."""
+        interval = max(self.config.idle_timeout / 2, 5)
+        while True:
+            await asyncio.sleep(interval)
+            for pool in list(self._pools.values()):
+                try:
+                    evicted = await pool.evict_idle(self.config.idle_timeout)
+                    if evicted:
+                        logger.debug(f"Evicted {evicted} idle SSH connection(s) to {pool.key}")
+                except Exception as e:
+                    logger.warning(f"Idle eviction failed for {pool.key}: {e}")
 
     async def run(
         self,
@@ -105,11 +528,38 @@ class SSHManager:
         user = user or self.user
 
         try:
-            conn = await self._get_connection(host, user)
-            result = await asyncio.wait_for(
-                conn.run(command, check=False),
-                timeout=timeout
-            )
+            pool = self._get_pool(host, user)
+
+            # One retry when the channel can't be opened on a stale connection;
+            # the command has not started in that case so it is safe to repeat.
+            for attempt in range(2):
+                pooled = await pool.acquire()
+                broken = False
+                process = None
+                try:
+                    process = await pooled.conn.create_process(command)
+                    # Raises asyncssh.TimeoutError, an asyncio.TimeoutError
+                    result = await process.wait(check=False, timeout=timeout)
+                    break
+                except asyncssh.ChannelOpenError:
+                    # release() drops the connection if its transport is gone
+                    if attempt:
+                        raise
+                except (asyncssh.ConnectionLost, asyncssh.DisconnectError):
+                    broken = True
+                    raise
+                except (asyncio.TimeoutError, asyncio.CancelledError):
+                    # Neither a timeout nor cancellation closes the channel; close
+                    # it before the slot is reused, or drop the connection if
+                    # that fails (the server caps sessions per connection)
+                    if process:
+                        try:
+                            process.close()
+                        except Exception:
+                            broken = True
+                    raise
+                finally:
+                    await pool.release(pooled, broken=broken)
 
             return SSHResult(
                 success=result.exit_status == 0,
@@ -151,122 +601,498 @@ class SSHManager:
         """Execute a command on a Proxmox node as root."""
         return await self.run(node_ip, command, user=self.proxmox_user, timeout=timeout)
 
+    async def run_cached(
+        self,
+        host: str,
+        command: str,
+        cache_class: str,
+        user: str = None,
+        timeout: int = 60
+    ) -> SSHResult:
+        """
+        Execute a read-only command through the result cache.
+
+        Identical in-flight requests share one execution, and successful
+        results are reused for CACHE_TTLS[cache_class] seconds.
+        """
+        user = user or self.user
+        ttl = CACHE_TTLS.get(cache_class, 0)
+        if not ttl:
+            return await self.run(host, command, user=user, timeout=timeout)
+
+        return await self._cache.get_or_run(
+            (cache_class, host, f"{user}:{command}"),
+            ttl,
+            lambda: self.run(host, command, user=user, timeout=timeout)
+        )
+
+    def invalidate(self, host: str = None, *classes: str) -> None:
+        """Invalidate cached results for a host after a mutating command."""
+        dropped = self._cache.invalidate(host, classes)
+        if dropped:
+            logger.debug(f"Invalidated {dropped} cached result(s) for {host or 'all hosts'}")
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get result cache hit/miss counters."""
+        return self._cache.stats()
+
+    def stream(
+        self,
+        host: str,
+        command: str,
+        user: str = None,
+        timeout: int = 600,
+        batch_lines: int = 20,
+        batch_interval: float = 1.0,
+        chunk_size: int = None,
+        max_bytes: int = None,
+        tail_lines: int = 200
+    ) -> SSHStream:
+        """
+        Stream a command's combined stdout/stderr.
+
+        Usage:
+            async with ssh.stream(host, 'apt upgrade -y') as stream:
+                async for lines in stream:
+                    ...
+            result = stream.result()
+
+        Args:
+            host: Target host IP or hostname
+            command: Command to execute
+            user: SSH user (defaults to config.user)
+            timeout: Overall command timeout in seconds
+            batch_lines: Maximum lines (or chunks) per yielded batch
+            batch_interval: Maximum seconds to wait while filling a batch
+            chunk_size: Yield raw chunks of this size instead of lines
+            max_bytes: Stop the command once this much output has been read
+            tail_lines: Number of trailing lines kept for result()
+        """
+        return SSHStream(
+            self._get_pool(host, user),
+            host,
+            command,
+            timeout=timeout,
+            batch_lines=batch_lines,
+            batch_interval=batch_interval,
+            chunk_size=chunk_size,
+            max_bytes=max_bytes,
+            tail_lines=tail_lines,
+        )
+
+    async def run_streaming(
+        self,
+        host: str,
+        command: str,
+        user: str = None,
+        timeout: int = 600,
+        on_output: OutputCallback = None,
+        max_bytes: int = None,
+        tail_lines: int = 200
+    ) -> SSHResult:
+        """
+        Execute a command while streaming its output.
+
+        Memory is bounded by tail_lines; on_output (if given) receives each
+        batch of lines as it arrives.
+        """
+        try:
+            async with self.stream(
+                host, command, user=user, timeout=timeout,
+                max_bytes=max_bytes, tail_lines=tail_lines
+            ) as stream:
+                async for lines in stream:
+                    if on_output:
+                        try:
+                            await on_output(lines)
+                        except Exception as e:
+                            logger.warning(f"Output callback failed for {host}: {e}")
+            result = stream.result()
+            if not result.success:
+                logger.error(f"Streaming command failed on {host}: {command[:50]}... ({result.stderr or result.exit_code})")
+            return result
+        except Exception as e:
+            logger.error(f"SSH stream error on {host}: {e}")
+            return SSHResult(success=False, stdout='', stderr=str(e), exit_code=-1)
+
+    # ==================== Multi-host Fan-out ====================
+
+    def _host_semaphore(self, host: str) -> asyncio.Semaphore:
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.config.fanout_per_host)
+            self._host_sems[host] = sem
+        return sem
+
+    async def _run_limited(
+        self,
+        host: str,
+        command: str,
+        user: str,
+        timeout: int,
+        local_sem: Optional[asyncio.Semaphore]
+    ) -> SSHResult:
+        """Run a command under the per-call, per-host and global limits."""
+        # Take the global slot last so it is never held while queued on a busy host
+        async with contextlib.AsyncExitStack() as stack:
+            if local_sem is not None:
+                await stack.enter_async_context(local_sem)
+            await stack.enter_async_context(self._host_semaphore(host))
+            await stack.enter_async_context(self._fanout_sem)
+            return await self.run(host, command, user=user, timeout=timeout)
+
+    async def as_completed(
+        self,
+        commands: Mapping[str, FanoutCommand],
+        user: str = None,
+        timeout: int = 60,
+        concurrency: int = None
+    ) -> AsyncIterator[Tuple[str, SSHResult]]:
+        """
+        Run a per-host command map concurrently, yielding as each host answers.
+
+        Args:
+            commands: Mapping of host -> command, or host -> (command, user)
+            user: SSH user for plain commands (defaults to config.user)
+            timeout: Timeout in seconds applied to each host individually
+            concurrency: Optional extra cap for this call only
+
+        Yields:
+            (host, SSHResult) tuples in completion order
+        """
+        local_sem = asyncio.Semaphore(concurrency) if concurrency else None
+
+        async def run_one(host: str, command: FanoutCommand) -> Tuple[str, SSHResult]:
+            if isinstance(command, tuple):
+                command, host_user = command
+            else:
+                host_user = user
+            return host, await self._run_limited(host, command, host_user, timeout, local_sem)
+
+        tasks = [asyncio.create_task(run_one(h, c)) for h, c in commands.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early - don't leave commands running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def run_many(
+        self,
+        commands: Mapping[str, FanoutCommand],
+        user: str = None,
+        timeout: int = 60,
+        concurrency: int = None
+    ) -> Dict[str, SSHResult]:
+        """
+        Run a per-host command map concurrently.
+
+        Returns:
+            Mapping of host -> SSHResult in the same order as `commands`
+        """
+        results = {host: None for host in commands}
+        async for host, result in self.as_completed(commands, user, timeout, concurrency):
+            results[host] = result
+        return results
+
+    async def run_on_hosts(
+        self,
+        hosts: Iterable[str],
+        command: str,
+        user: str = None,
+        timeout: int = 60,
+        concurrency: int = None
+    ) -> Dict[str, SSHResult]:
+        """Run the same command on many hosts concurrently."""
+        return await self.run_many(
+            {host: command for host in hosts}, user, timeout, concurrency
+        )
+
     async def close_all(self) -> None:
-        """Close all cached SSH connections."""
-        for key, conn in self._connections.items():
+        """Close all pooled SSH connections."""
+        if self._reaper:
+            self._reaper.cancel()
+            self._reaper = None
+
+        for key, pool in self._pools.items():
             try:
-                conn.close()
-                logger.debug(f"Closed SSH connection: {key}")
+                pool.close()
+                logger.debug(f"Closed SSH pool: {key}")
             except Exception as e:
-                logger.warning(f"Error closing connection {key}: {e}")
+                logger.warning(f"Error closing pool {key}: {e}")
 
-        self._connections.clear()
+        self._pools.clear()
         logger.info("All SSH connections closed")
 
+        if self.pve_api:
+            await self.pve_api.close()
+
     # ==================== Docker Commands ====================
 
     async def docker_ps(self, host: str) -> SSHResult:
         """List running Docker containers."""
-        return await self.run(host, 'docker ps --format "{{.Names}}\t{{.Status}}\t{{.Image}}"')
+        return await self.run_cached(host, 'docker ps --format "{{.Names}}\t{{.Status}}\t{{.Image}}"', 'docker_ps')
 
     async def docker_ps_all(self, host: str) -> SSHResult:
         """List all Docker containers."""
-        return await self.run(host, 'docker ps -a --format "{{.Names}}\t{{.Status}}\t{{.Image}}"')
+        return await self.run_cached(host, 'docker ps -a --format "{{.Names}}\t{{.Status}}\t{{.Image}}"', 'docker_ps')
 
     async def docker_restart(self, host: str, container: str) -> SSHResult:
         """Restart a Docker container."""
-        return await self.run(host, f'docker restart {container}')
+        result = await self.run(host, f'docker restart {container}')
+        self.invalidate(host, 'docker_ps')
+        return result
 
     async def docker_stop(self, host: str, container: str) -> SSHResult:
         """Stop a Docker container."""
-        return await self.run(host, f'docker stop {container}')
+        result = await self.run(host, f'docker stop {container}')
+        self.invalidate(host, 'docker_ps')
+        return result
 
     async def docker_start(self, host: str, container: str) -> SSHResult:
         """Start a Docker container."""
-        return await self.run(host, f'docker start {container}')
+        result = await self.run(host, f'docker start {container}')
+        self.invalidate(host, 'docker_ps')
+        return result
 
-    async def docker_logs(self, host: str, container: str, tail: int = 50) -> SSHResult:
-        """Get Docker container logs."""
-        return await self.run(host, f'docker logs {container} --tail {tail}')
+    async def docker_logs(
+        self,
+        host: str,
+        container: str,
+        tail: int = 50,
+        max_bytes: int = 256 * 1024
+    ) -> SSHResult:
+        """Get Docker container logs (bounded to `tail` lines and max_bytes)."""
+        return await self.run_streaming(
+            host,
+            f'docker logs {container} --tail {tail}',
+            timeout=60,
+            max_bytes=max_bytes,
+            tail_lines=tail
+        )
 
-    async def docker_pull(self, host: str, container: str) -> SSHResult:
-        """Pull latest image for a container."""
+    async def docker_pull(
+        self,
+        host: str,
+        container: str,
+        on_output: OutputCallback = None
+    ) -> SSHResult:
+        """Pull latest image for a container, streaming pull progress."""
         # Get current image
         result = await self.run(host, f'docker inspect {container} --format "{{{{.Config.Image}}}}"')
         if not result.success:
             return result
 
         image = result.output
-        return await self.run(host, f'docker pull {image}', timeout=300)
+        return await self.run_streaming(
+            host, f'docker pull {image}', timeout=300, on_output=on_output, tail_lines=50
+        )
 
     async def docker_compose_up(self, host: str, compose_dir: str) -> SSHResult:
         """Run docker compose up -d in a directory."""
-        return await self.run(host, f'cd {compose_dir} && docker compose up -d', timeout=120)
+        result = await self.run(host, f'cd {compose_dir} && docker compose up -d', timeout=120)
+        self.invalidate(host, 'docker_ps')
+        return result
 
     async def docker_compose_down(self, host: str, compose_dir: str) -> SSHResult:
         """Run docker compose down in a directory."""
-        return await self.run(host, f'cd {compose_dir} && docker compose down')
+        result = await self.run(host, f'cd {compose_dir} && docker compose down')
+        self.invalidate(host, 'docker_ps')
+        return result
 
-    async def docker_compose_pull(self, host: str, compose_dir: str) -> SSHResult:
-        """Pull images for a docker compose project."""
-        return await self.run(host, f'cd {compose_dir} && docker compose pull', timeout=300)
+    async def docker_compose_pull(
+        self,
+        host: str,
+        compose_dir: str,
+        on_output: OutputCallback = None
+    ) -> SSHResult:
+        """Pull images for a docker compose project, streaming progress."""
+        return await self.run_streaming(
+            host,
+            f'cd {compose_dir} && docker compose pull',
+            timeout=300,
+            on_output=on_output,
+            tail_lines=50
+        )
 
     # ==================== Proxmox Commands ====================
 
+    async def _pve_query(
+        self,
+        node_ip: str,
+        command: str,
+        cache_class: str,
+        api_call: Callable[[], Awaitable[Any]]
+    ) -> SSHResult:
+        """Run a cached Proxmox read via the API, falling back to SSH."""
+        async def execute() -> SSHResult:
+            if self.pve_api:
+                try:
+                    data = await api_call()
+                    return SSHResult(success=True, stdout=json.dumps(data), stderr='', exit_code=0)
+                except ProxmoxAPIError as e:
+                    return SSHResult(success=False, stdout='', stderr=str(e), exit_code=1)
+                except ProxmoxUnavailable as e:
+                    logger.warning(f"Proxmox API unavailable, using SSH: {e}")
+            return await self.run_proxmox(node_ip, command)
+
+        return await self._cache.get_or_run(
+            (cache_class, node_ip, f"{self.proxmox_user}:{command}"),
+            CACHE_TTLS[cache_class],
+            execute
+        )
+
+    async def _pve_action(
+        self,
+        node_ip: str,
+        kind: str,
+        vmid: int,
+        action: str,
+        command: str,
+        params: Dict[str, Any] = None,
+        timeout: int = 120
+    ) -> SSHResult:
+        """Run a guest power action via the API (waiting on its task), falling back to SSH."""
+        result = None
+        if self.pve_api:
+            try:
+                await self.pve_api.guest_action(node_ip, kind, vmid, action, timeout=timeout, params=params)
+                result = SSHResult(success=True, stdout='', stderr='', exit_code=0)
+            except ProxmoxAPIError as e:
+                result = SSHResult(success=False, stdout='', stderr=str(e), exit_code=1)
+            except ProxmoxUnavailable as e:
+                logger.warning(f"Proxmox API unavailable, using SSH: {e}")
+
+        if result is None:
+            result = await self.run_proxmox(node_ip, command, timeout=timeout)
+        self.invalidate(node_ip, 'pve_guests', 'pve_node')
+        self.invalidate(None, 'pve_cluster')
+
+        for listener in self._mutation_listeners:
+            try:
+                listener(node_ip, kind, vmid, action, result.success)
+            except Exception as e:
+                logger.error(f"Mutation listener failed: {e}")
+        return result
+
+    def add_mutation_listener(self, listener: MutationListener) -> None:
+        """Register a callback run after every guest power action."""
+        self._mutation_listeners.append(listener)
+
     async def pve_node_status(self, node_ip: str) -> SSHResult:
         """Get Proxmox node status."""
-        return await self.run_proxmox(node_ip, 'pvesh get /nodes/$(hostname)/status --output-format json')
+        return await self._pve_query(
+            node_ip,
+            'pvesh get /nodes/$(hostname)/status --output-format json',
+            'pve_node',
+            lambda: self.pve_api.node_status(node_ip)
+        )
 
     async def pve_list_vms(self, node_ip: str) -> SSHResult:
         """List VMs on a Proxmox node."""
-        return await self.run_proxmox(node_ip, 'pvesh get /nodes/$(hostname)/qemu --output-format json')
+        return await self._pve_query(
+            node_ip,
+            'pvesh get /nodes/$(hostname)/qemu --output-format json',
+            'pve_guests',
+            lambda: self.pve_api.list_guests(node_ip, 'qemu')
+        )
 
     async def pve_list_lxc(self, node_ip: str) -> SSHResult:
         """List LXC containers on a Proxmox node."""
-        return await self.run_proxmox(node_ip, 'pvesh get /nodes/$(hostname)/lxc --output-format json')
+        return await self._pve_query(
+            node_ip,
+            'pvesh get /nodes/$(hostname)/lxc --output-format json',
+            'pve_guests',
+            lambda: self.pve_api.list_guests(node_ip, 'lxc')
+        )
 
     async def pve_vm_status(self, node_ip: str, vmid: int) -> SSHResult:
         """Get status of a specific VM."""
-        return await self.run_proxmox(
+        return await self._pve_query(
             node_ip,
-            f'pvesh get /nodes/$(hostname)/qemu/{vmid}/status/current --output-format json'
+            f'pvesh get /nodes/$(hostname)/qemu/{vmid}/status/current --output-format json',
+            'pve_guests',
+            lambda: self.pve_api.guest_status(node_ip, 'qemu', vmid)
         )
 
     async def pve_lxc_status(self, node_ip: str, ctid: int) -> SSHResult:
         """Get status of a specific LXC container."""
-        return await self.run_proxmox(
+        return await self._pve_query(
             node_ip,
-            f'pvesh get /nodes/$(hostname)/lxc/{ctid}/status/current --output-format json'
+            f'pvesh get /nodes/$(hostname)/lxc/{ctid}/status/current --output-format json',
+            'pve_guests',
+            lambda: self.pve_api.guest_status(node_ip, 'lxc', ctid)
         )
 
     async def pve_start_vm(self, node_ip: str, vmid: int) -> SSHResult:
         """Start a VM."""
-        return await self.run_proxmox(node_ip, f'qm start {vmid}')
+        return await self._pve_action(node_ip, 'qemu', vmid, 'start', f'qm start {vmid}')
 
     async def pve_stop_vm(self, node_ip: str, vmid: int) -> SSHResult:
         """Stop a VM."""
-        return await self.run_proxmox(node_ip, f'qm stop {vmid}')
+        return await self._pve_action(node_ip, 'qemu', vmid, 'stop', f'qm stop {vmid}')
 
     async def pve_restart_vm(self, node_ip: str, vmid: int) -> SSHResult:
         """Restart a VM."""
-        return await self.run_proxmox(node_ip, f'qm reboot {vmid}')
+        return await self._pve_action(node_ip, 'qemu', vmid, 'reboot', f'qm reboot {vmid}')
+
+    async def pve_shutdown_vm(self, node_ip: str, vmid: int, timeout: int = 120) -> SSHResult:
+        """Gracefully shut down a VM (ACPI), failing if it is not off within timeout seconds."""
+        return await self._pve_action(
+            node_ip, 'qemu', vmid, 'shutdown',
+            f'qm shutdown {vmid} --timeout {timeout}',
+            params={'timeout': timeout},
+            timeout=timeout + 30
+        )
 
     async def pve_start_lxc(self, node_ip: str, ctid: int) -> SSHResult:
         """Start an LXC container."""
-        return await self.run_proxmox(node_ip, f'pct start {ctid}')
+        return await self._pve_action(node_ip, 'lxc', ctid, 'start', f'pct start {ctid}')
 
     async def pve_stop_lxc(self, node_ip: str, ctid: int) -> SSHResult:
         """Stop an LXC container."""
-        return await self.run_proxmox(node_ip, f'pct stop {ctid}')
+        return await self._pve_action(node_ip, 'lxc', ctid, 'stop', f'pct stop {ctid}')
 
     async def pve_restart_lxc(self, node_ip: str, ctid: int) -> SSHResult:
         """Restart an LXC container."""
-        return await self.run_proxmox(node_ip, f'pct reboot {ctid}')
+        return await self._pve_action(node_ip, 'lxc', ctid, 'reboot', f'pct reboot {ctid}')
+
+    async def pve_shutdown_lxc(self, node_ip: str, ctid: int, timeout: int = 120) -> SSHResult:
+        """Gracefully shut down an LXC container, failing if it is not off within timeout seconds."""
+        return await self._pve_action(
+            node_ip, 'lxc', ctid, 'shutdown',
+            f'pct shutdown {ctid} --timeout {timeout}',
+            params={'timeout': timeout},
+            timeout=timeout + 30
+        )
+
+    async def pve_shutdown_node(self, node_ip: str) -> SSHResult:
+        """Power off a Proxmox node."""
+        # Detach so the command returns before sshd goes away
+        result = await self.run_proxmox(
+            node_ip,
+            'nohup sh -c "sleep 2; shutdown -h now" >/dev/null 2>&1 &',
+            timeout=15
+        )
+        self.invalidate(node_ip)
+        self.invalidate(None, 'pve_cluster')
+        return result
 
     async def pve_cluster_status(self, node_ip: str) -> SSHResult:
         """Get Proxmox cluster status."""
         return await self.run_proxmox(node_ip, 'pvecm status')
 
+    async def pve_cluster_resources(self, node_ip: str) -> SSHResult:
+        """List every node, VM and LXC in the cluster in one query (JSON)."""
+        return await self._pve_query(
+            node_ip,
+            'pvesh get /cluster/resources --output-format json',
+            'pve_cluster',
+            lambda: self.pve_api.cluster_resources(node_ip)
+        )
+
     # ==================== System Commands ====================
 
     async def apt_update(self, host: str) -> SSHResult:
@@ -277,25 +1103,29 @@ class SSHManager:
         """List upgradable packages."""
         return await self.run(host, 'apt list --upgradable 2>/dev/null | tail -n +2')
 
-    async def apt_upgrade(self, host: str) -> SSHResult:
-        """Upgrade all packages (non-interactive)."""
-        return await self.run(
+    async def apt_upgrade(self, host: str, on_output: OutputCallback = None) -> SSHResult:
+        """Upgrade all packages (non-interactive), streaming apt output."""
+        result = await self.run_streaming(
             host,
             'sudo DEBIAN_FRONTEND=noninteractive apt upgrade -y',
-            timeout=600
+            timeout=600,
+            on_output=on_output,
+            tail_lines=100
         )
+        self.invalidate(host, 'system')
+        return result
 
     async def system_uptime(self, host: str) -> SSHResult:
         """Get system uptime."""
-        return await self.run(host, 'uptime -p')
+        return await self.run_cached(host, 'uptime -p', 'system')
 
     async def disk_usage(self, host: str) -> SSHResult:
         """Get disk usage summary."""
-        return await self.run(host, 'df -h / | tail -1')
+        return await self.run_cached(host, 'df -h / | tail -1', 'system')
 
     async def memory_usage(self, host: str) -> SSHResult:
         """Get memory usage."""
-        return await self.run(host, 'free -h | grep Mem')
+        return await self.run_cached(host, 'free -h | grep Mem', 'system')
 
     # ==================== File Operations ====================
 
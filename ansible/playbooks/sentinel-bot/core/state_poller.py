@@ -0,0 +1,294 @@
+"""
+Sentinel Bot State Poller
+Background polling of nodes and Docker hosts into an in-memory state store.
+"""
+
+import logging
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple, Any, Callable, Awaitable, TYPE_CHECKING
+
+from .health_probe import PROBE_COMMAND, parse_probe
+
+if TYPE_CHECKING:
+    from .ssh_manager import SSHManager
+
+logger = logging.getLogger('sentinel.poller')
+
+# Poll intervals (seconds) per job: (base, min, max). Intervals shrink while
+# the polled state keeps changing and grow while it is steady.
+POLL_INTERVALS = {
+    'nodes': (30, 15, 120),     # Proxmox node CPU/memory/uptime
+    'docker': (60, 20, 300),    # container states per Docker host
+    'health': (120, 60, 600),   # health probe: disk, container memory/restarts/OOMs
+    'uptime': (300, 120, 900),  # host uptime
+}
+
+
+def format_age(seconds: float) -> str:
+    """Human-readable age like '45s ago' or '3m ago'."""
+    if seconds < 5:
+        return "just now"
+    if seconds < 60:
+        return f"{seconds:.0f}s ago"
+    if seconds < 3600:
+        return f"{seconds // 60:.0f}m ago"
+    return f"{seconds // 3600:.0f}h ago"
+
+
+@dataclass
+class StateEntry:
+    """One polled value and when it was fetched."""
+    data: Any
+    updated_at: float
+    ok: bool = True
+    error: str = ''
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+
+class StateStore:
+    """Latest polled state keyed by '<kind>:<host>'."""
+
+    def __init__(self):
+        self._entries: Dict[str, StateEntry] = {}
+
+    def put(self, key: str, data: Any, ok: bool = True, error: str = '') -> None:
+        self._entries[key] = StateEntry(data=data, updated_at=time.time(), ok=ok, error=error)
+
+    def get(self, key: str) -> Optional[StateEntry]:
+        return self._entries.get(key)
+
+    def oldest(self, keys: List[str]) -> Optional[float]:
+        """Age of the stalest of the given entries, or None if any is missing."""
+        ages = []
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            ages.append(entry.age)
+        return max(ages) if ages else None
+
+
+@dataclass
+class PollJob:
+    """A periodically polled slice of state with an adaptive interval."""
+    name: str
+    fetch: Callable[[], Awaitable[Any]]  # stores results, returns a change fingerprint
+    keys: List[str]
+    interval: float
+    min_interval: float
+    max_interval: float
+    fingerprint: Any = None
+    last_run: float = 0.0
+    task: Optional[asyncio.Task] = None
+
+    def adapt(self, changed: bool, failed: bool) -> None:
+        if failed:
+            self.interval = min(self.interval * 2, self.max_interval)
+        elif changed:
+            self.interval = max(self.interval / 2, self.min_interval)
+        else:
+            self.interval = min(self.interval * 1.5, self.max_interval)
+
+
+class StatePoller:
+    """
+    Polls Proxmox nodes and Docker hosts on a schedule.
+
+    Commands read the StateStore and return immediately; refresh() runs a
+    job on demand (shared with any poll already in flight).
+    """
+
+    def __init__(self, ssh: 'SSHManager', ssh_config, store: StateStore = None):
+        self.ssh = ssh
+        self.store = store or StateStore()
+
+        self.nodes: List[Tuple[str, str]] = [
+            ('node01', ssh_config.node01_ip),
+            ('node02', ssh_config.node02_ip),
+        ]
+        self.docker_hosts: List[Tuple[str, str]] = [
+            ('utilities', ssh_config.docker_utilities_ip),
+            ('media', ssh_config.docker_media_ip),
+            ('glance', ssh_config.docker_glance_ip),
+        ]
+        self.disk_hosts: List[Tuple[str, str]] = self.docker_hosts + [
+            ('traefik', ssh_config.traefik_ip),
+            ('authentik', ssh_config.authentik_ip),
+        ]
+
+        self.jobs: Dict[str, PollJob] = {}
+        self._add_job('nodes', self._poll_nodes, [f'node:{name}' for name, _ in self.nodes])
+        self._add_job('docker', self._poll_docker, [f'docker:{ip}' for _, ip in self.docker_hosts])
+        self._add_job('health', self._poll_health, [f'health:{ip}' for _, ip in self.disk_hosts])
+        self._add_job(
+            'uptime',
+            self._poll_uptime,
+            [f'uptime:{ip}' for _, ip in self.nodes + self.docker_hosts]
+        )
+
+        self._loops: List[asyncio.Task] = []
+
+    def _add_job(self, name: str, fetch, keys: List[str]) -> None:
+        base, low, high = POLL_INTERVALS[name]
+        self.jobs[name] = PollJob(name, fetch, keys, base, low, high)
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        """Start one background loop per job."""
+        if not self._loops:
+            self._loops = [asyncio.create_task(self._job_loop(job)) for job in self.jobs.values()]
+
+    def stop(self) -> None:
+        for task in self._loops:
+            task.cancel()
+        self._loops = []
+
+    async def _job_loop(self, job: PollJob) -> None:
+        # Stagger the first polls so jobs don't all hit the hosts at once
+        await asyncio.sleep(random.uniform(0, 3))
+        while True:
+            await self.refresh(job.name)
+            await asyncio.sleep(job.interval * random.uniform(0.9, 1.1))
+
+    # ==================== Polling ====================
+
+    async def refresh(self, name: str) -> None:
+        """Poll a job now; concurrent callers share the same poll."""
+        job = self.jobs[name]
+        if job.task is None or job.task.done():
+            job.task = asyncio.create_task(self._run(job))
+        await asyncio.shield(job.task)
+
+    async def ensure(self, name: str) -> None:
+        """Poll a job only if it has no data yet."""
+        if self.store.oldest(self.jobs[name].keys) is None:
+            await self.refresh(name)
+
+    async def _run(self, job: PollJob) -> None:
+        failed = False
+        try:
+            fingerprint = await job.fetch()
+        except Exception as e:
+            logger.error(f"Poll job {job.name} failed: {e}")
+            fingerprint, failed = job.fingerprint, True
+
+        changed = fingerprint != job.fingerprint
+        job.fingerprint = fingerprint
+        job.last_run = time.time()
+        job.adapt(changed, failed)
+        logger.debug(f"Polled {job.name} (changed={changed}), next in ~{job.interval:.0f}s")
+
+    def age(self, name: str) -> Optional[float]:
+        """Age of a job's stalest entry, or None before its first poll."""
+        return self.store.oldest(self.jobs[name].keys)
+
+    def staleness(self, *names: str) -> str:
+        """Footer text describing how fresh the given jobs' data is."""
+        ages = [self.age(name) for name in names]
+        known = [a for a in ages if a is not None]
+        if not known:
+            return "No data yet"
+        age = max(known)
+        stale = any(
+            a is not None and a > 2 * self.jobs[name].max_interval
+            for name, a in zip(names, ages)
+        )
+        return f"{'⚠️ Stale - ' if stale else ''}Updated {format_age(age)}"
+
+    # ==================== Jobs ====================
+
+    async def _poll_nodes(self) -> Any:
+        results = await asyncio.gather(*(self.ssh.pve_node_status(ip) for _, ip in self.nodes))
+        fingerprint = []
+        for (name, _), result in zip(self.nodes, results):
+            key = f'node:{name}'
+            if not result.success:
+                self.store.put(key, None, ok=False, error=result.stderr or 'unreachable')
+                fingerprint.append((name, None))
+                continue
+            try:
+                data = json.loads(result.stdout)
+            except json.JSONDecodeError:
+                self.store.put(key, None, ok=False, error='parse error')
+                fingerprint.append((name, 'parse'))
+                continue
+
+            memory = data.get('memory', {})
+            state = {
+                'cpu': data.get('cpu', 0) * 100,
+                'mem_used': memory.get('used', 0),
+                'mem_total': memory.get('total', 0),
+                'uptime': data.get('uptime', 0),
+            }
+            self.store.put(key, state)
+            mem_pct = state['mem_used'] / state['mem_total'] * 100 if state['mem_total'] else 0
+            fingerprint.append((name, round(state['cpu'] / 10), round(mem_pct / 10)))
+        return tuple(fingerprint)
+
+    async def _poll_docker(self) -> Any:
+        results = await self.ssh.run_on_hosts(
+            [ip for _, ip in self.docker_hosts],
+            'docker ps -a --format "{{.Names}}|{{.Status}}" 2>/dev/null'
+        )
+        fingerprint = []
+        for _, ip in self.docker_hosts:
+            result = results[ip]
+            if not result.success:
+                self.store.put(f'docker:{ip}', [], ok=False, error=result.stderr or 'unreachable')
+                fingerprint.append((ip, None))
+                continue
+            containers = [
+                tuple(line.split('|', 1)) for line in result.output.split('\n') if '|' in line
+            ]
+            self.store.put(f'docker:{ip}', containers)
+            # Only the state word matters for change detection, not "Up 5 minutes"
+            fingerprint.append((ip, tuple(sorted((n, s.split(' ')[0]) for n, s in containers))))
+        return tuple(fingerprint)
+
+    async def _poll_health(self) -> Any:
+        # One probe per host collects everything in a single round-trip
+        results = await self.ssh.run_on_hosts([ip for _, ip in self.disk_hosts], PROBE_COMMAND, timeout=30)
+
+        fingerprint = []
+        for _, ip in self.disk_hosts:
+            result = results[ip]
+            key = f'health:{ip}'
+            if not result.success:
+                self.store.put(key, None, ok=False, error=result.stderr or 'unreachable')
+                fingerprint.append((ip, None))
+                continue
+            try:
+                health = parse_probe(result.stdout)
+            except ValueError as e:
+                self.store.put(key, None, ok=False, error=str(e))
+                fingerprint.append((ip, 'parse'))
+                continue
+
+            self.store.put(key, health)
+            fingerprint.append((
+                ip,
+                health.disk // 10 if health.disk is not None else None,
+                tuple(sorted(c.name for c in health.containers if (c.mem_pct or 0) > 80)),
+                tuple(sorted(c.name for c in health.containers if c.health == 'unhealthy')),
+                tuple(health.oom_events),
+            ))
+        return tuple(fingerprint)
+
+    async def _poll_uptime(self) -> Any:
+        host_commands = {ip: ('uptime -p', self.ssh.proxmox_user) for _, ip in self.nodes}
+        host_commands.update({ip: 'uptime -p' for _, ip in self.docker_hosts})
+
+        fingerprint = []
+        async for ip, result in self.ssh.as_completed(host_commands):
+            self.store.put(f'uptime:{ip}', result.output if result.success else None,
+                           ok=result.success, error=result.stderr)
+            fingerprint.append((ip, result.success))
+        return tuple(sorted(fingerprint))
@@ -0,0 +1,170 @@
+"""
+Sentinel Bot Update Checker
+Finds containers whose image tag points at a newer digest in its registry,
+without pulling anything.
+"""
+
+import logging
+import asyncio
+import shlex
+from dataclasses import dataclass, field
+from typing import List, Dict, Iterable, TYPE_CHECKING
+
+from .registry import RegistryClient, RegistryError, ImageRef, parse_image_ref
+
+if TYPE_CHECKING:
+    from .ssh_manager import SSHManager
+
+logger = logging.getLogger('sentinel.updates')
+
+# Lists every running container with the reference it was created from and
+# the repo digests of its image, using one `docker inspect` per kind.
+# Output lines: C|name|image-ref|image-id and I|image-id|repo@digest ...
+LOCAL_IMAGES_PROBE = r'''
+ids=$(docker ps -q --no-trunc 2>/dev/null) || exit 1
+[ -n "$ids" ] || exit 0
+containers=$(docker inspect --format '{{.Name}}|{{.Config.Image}}|{{.Image}}' $ids) || exit 1
+printf '%s\n' "$containers" | sed 's/^/C|/'
+docker image inspect --format 'I|{{.Id}}|{{join .RepoDigests " "}}' \
+    $(printf '%s\n' "$containers" | cut -d'|' -f3 | sort -u)
+'''
+
+LOCAL_IMAGES_COMMAND = f"sh -c {shlex.quote(LOCAL_IMAGES_PROBE)}"
+
+
+@dataclass
+class LocalContainer:
+    """A running container and the digests its image is known by."""
+    host: str
+    name: str
+    image: str                 # reference the container was created from
+    digests: List[str] = field(default_factory=list)  # repo@sha256:... entries
+
+
+@dataclass
+class ImageUpdate:
+    """A container whose tag now points at a different digest."""
+    host: str
+    container: str
+    image: str
+    local_digest: str
+    remote_digest: str
+
+
+@dataclass
+class UpdateReport:
+    """Outcome of checking a set of hosts."""
+    updates: List[ImageUpdate] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    checked: int = 0   # containers compared against their registry
+    skipped: int = 0   # pinned, locally built or unparseable images
+
+
+def parse_local_images(host: str, output: str) -> List[LocalContainer]:
+    """Parse LOCAL_IMAGES_PROBE output into containers."""
+    containers = []
+    image_digests: Dict[str, List[str]] = {}
+    for line in output.splitlines():
+        kind, _, rest = line.partition('|')
+        if kind == 'C':
+            name, image, image_id = (rest.split('|') + ['', ''])[:3]
+            containers.append((name.lstrip('/'), image, image_id))
+        elif kind == 'I':
+            image_id, _, digests = rest.partition('|')
+            image_digests[image_id] = digests.split()
+    return [
+        LocalContainer(host, name, image, image_digests.get(image_id, []))
+        for name, image, image_id in containers
+    ]
+
+
+def local_digest(image: ImageRef, repo_digests: List[str]) -> str:
+    """The digest recorded for this image's repository, or '' if none."""
+    for entry in repo_digests:
+        repo, _, digest = entry.partition('@')
+        try:
+            if parse_image_ref(repo).name == image.name:
+                return digest
+        except ValueError:
+            continue
+    return ''
+
+
+class UpdateChecker:
+    """
+    Compares running containers' image digests with their registries.
+
+    Local digests for every host come from one SSH round-trip each; remote
+    digests come from the RegistryClient, so containers sharing an image
+    cost a single (cached) registry lookup.
+    """
+
+    def __init__(self, ssh: 'SSHManager', registry: RegistryClient = None):
+        self.ssh = ssh
+        self.registry = registry or RegistryClient()
+
+    async def close(self) -> None:
+        await self.registry.close()
+
+    async def local_images(self, hosts: Iterable[str], report: UpdateReport) -> List[LocalContainer]:
+        """Collect running containers on all hosts; failures go into report.errors."""
+        hosts = list(dict.fromkeys(hosts))
+        results = await self.ssh.run_on_hosts(hosts, LOCAL_IMAGES_COMMAND, timeout=30)
+        containers = []
+        for host in hosts:
+            result = results[host]
+            if not result.success:
+                report.errors.append(f"**{host}**: {result.stderr.strip() or 'connection failed'}")
+                continue
+            containers.extend(parse_local_images(host, result.stdout))
+        return containers
+
+    async def check(self, hosts: Iterable[str]) -> UpdateReport:
+        """Check every running container on the given hosts for newer images."""
+        report = UpdateReport()
+        containers = await self.local_images(hosts, report)
+
+        candidates = []
+        for container in containers:
+            try:
+                image = parse_image_ref(container.image)
+            except ValueError:
+                report.skipped += 1
+                continue
+            current = local_digest(image, container.digests)
+            if image.digest or not current:
+                # Pinned to a digest, or built locally and never pulled
+                report.skipped += 1
+                continue
+            candidates.append((container, image, current))
+
+        # Unique image:tags are looked up concurrently; duplicates hit the cache
+        lookups = {str(image): image for _, image, _ in candidates}
+        results = await asyncio.gather(
+            *(self.registry.remote_digest(image) for image in lookups.values()),
+            return_exceptions=True
+        )
+        remote = dict(zip(lookups, results))
+
+        for container, image, current in candidates:
+            digest = remote[str(image)]
+            if isinstance(digest, Exception):
+                if not isinstance(digest, RegistryError):
+                    logger.warning(f"Registry lookup for {image} failed: {digest}")
+                report.errors.append(f"**{container.name}**: {digest}")
+                continue
+            report.checked += 1
+            if digest != current:
+                report.updates.append(ImageUpdate(
+                    host=container.host,
+                    container=container.name,
+                    image=container.image,
+                    local_digest=current,
+                    remote_digest=digest,
+                ))
+
+        logger.info(
+            f"Update check: {len(report.updates)} update(s), {report.checked} checked, "
+            f"{report.skipped} skipped, {len(lookups)} image(s), {len(report.errors)} error(s)"
+        )
+        return report
@@ -0,0 +1,210 @@
+"""
+Sentinel Bot Wake-on-LAN
+Concurrent node wake-up with TCP readiness probes.
+"""
+
+import logging
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple, Iterable, Callable, Awaitable
+
+logger = logging.getLogger('sentinel.wake')
+
+# Ports that must accept connections before a Proxmox node counts as ready
+READY_PORTS = (22, 8006)
+
+
+@dataclass
+class WakeResult:
+    """Outcome of waking one node."""
+    name: str
+    ip: str
+    ready: bool = False
+    already_online: bool = False
+    boot_time: Optional[float] = None  # seconds from first magic packet to ready
+    error: str = ''
+
+
+# Called when a node finishes (ready or timed out)
+WakeCallback = Callable[[WakeResult], Awaitable[None]]
+
+
+def magic_packet(mac: str) -> bytes:
+    """Build a Wake-on-LAN magic packet for a MAC address."""
+    try:
+        mac_bytes = bytes.fromhex(mac.replace(':', '').replace('-', ''))
+    except ValueError:
+        mac_bytes = b''
+    if len(mac_bytes) != 6:
+        raise ValueError(f"Invalid MAC address: {mac}")
+    return b'\xff' * 6 + mac_bytes * 16
+
+
+async def send_magic_packets(
+    macs: Iterable[str],
+    broadcast: str,
+    port: int = 9,
+    retransmits: int = 3,
+    interval: float = 1.0
+) -> None:
+    """
+    Send magic packets for several MACs at once, repeated to survive UDP loss.
+
+    Raises:
+        ValueError: If a MAC address is malformed
+        OSError: If the broadcast socket cannot be opened
+    """
+    packets = [magic_packet(mac) for mac in macs]
+    loop = asyncio.get_running_loop()
+    transport, _ = await loop.create_datagram_endpoint(
+        asyncio.DatagramProtocol,
+        remote_addr=(broadcast, port),
+        allow_broadcast=True
+    )
+    try:
+        for attempt in range(retransmits):
+            for packet in packets:
+                transport.sendto(packet)
+            if attempt < retransmits - 1:
+                await asyncio.sleep(interval)
+    finally:
+        transport.close()
+
+
+async def port_open(ip: str, port: int, timeout: float = 2.0) -> bool:
+    """Check whether a TCP port accepts connections."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def is_ready(ip: str, ports: Tuple[int, ...] = READY_PORTS, timeout: float = 2.0) -> bool:
+    """Check all readiness ports on a host concurrently."""
+    results = await asyncio.gather(*(port_open(ip, port, timeout) for port in ports))
+    return all(results)
+
+
+async def wait_until_ready(
+    ip: str,
+    ports: Tuple[int, ...] = READY_PORTS,
+    timeout: float = 300,
+    initial_interval: float = 1.0,
+    max_interval: float = 10.0
+) -> bool:
+    """Probe a host with exponential backoff until every port is open or timeout passes."""
+    deadline = time.monotonic() + timeout
+    interval = initial_interval
+    while True:
+        if await is_ready(ip, ports):
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(interval * random.uniform(0.8, 1.2), remaining))
+        interval = min(interval * 2, max_interval)
+
+
+async def wake_and_wait(
+    nodes: Dict[str, Tuple[str, Optional[str]]],
+    broadcast: str,
+    timeout: float = 300,
+    ports: Tuple[int, ...] = READY_PORTS,
+    retransmits: int = 3,
+    on_ready: Optional[WakeCallback] = None
+) -> Dict[str, WakeResult]:
+    """
+    Wake offline nodes and wait for all of them in parallel.
+
+    Args:
+        nodes: Node name -> (ip, mac); nodes without a MAC are only probed
+        broadcast: Broadcast address for the magic packets
+        timeout: Seconds to wait for each node (all nodes wait concurrently)
+        ports: TCP ports that must accept connections
+        retransmits: Times each magic packet is sent
+        on_ready: Called once per node as it is found online, comes up,
+            times out or is given up on
+
+    Returns:
+        Node name -> WakeResult, in the order given
+    """
+    results = {name: WakeResult(name=name, ip=ip) for name, (ip, _) in nodes.items()}
+
+    async def finish(result: WakeResult) -> None:
+        if on_ready:
+            try:
+                await on_ready(result)
+            except Exception as e:
+                logger.warning(f"Wake callback failed: {e}")
+
+    # Find out which nodes are already up
+    online = await asyncio.gather(*(is_ready(ip, ports) for ip, _ in nodes.values()))
+    to_wake = []
+    for (name, (ip, mac)), up in zip(nodes.items(), online):
+        if up:
+            results[name].ready = True
+            results[name].already_online = True
+        elif not mac or mac == 'TBD':
+            results[name].error = 'no MAC address'
+        else:
+            try:
+                magic_packet(mac)
+                to_wake.append(name)
+            except ValueError as e:
+                results[name].error = str(e)
+
+    for name, result in results.items():
+        if name not in to_wake:
+            await finish(result)
+
+    if not to_wake:
+        return results
+
+    macs = [nodes[name][1] for name in to_wake]
+    try:
+        await send_magic_packets(macs, broadcast, retransmits=1)
+    except OSError as e:
+        logger.error(f"Failed to send WoL packets: {e}")
+        for name in to_wake:
+            results[name].error = f'WoL send failed: {e}'
+            await finish(results[name])
+        return results
+
+    started = time.monotonic()
+    logger.info(f"Sent WoL to {', '.join(to_wake)}")
+
+    async def retransmit() -> None:
+        # Repeat the packets in case the first ones were dropped
+        try:
+            await asyncio.sleep(1.0)
+            await send_magic_packets(macs, broadcast, retransmits=retransmits - 1)
+        except OSError as e:
+            logger.warning(f"WoL retransmit failed: {e}")
+
+    async def wait_for(name: str) -> None:
+        result = results[name]
+        result.ready = await wait_until_ready(result.ip, ports, timeout=timeout)
+        if result.ready:
+            result.boot_time = time.monotonic() - started
+            logger.info(f"Node {name} ready after {result.boot_time:.1f}s")
+        else:
+            result.error = f'not ready after {timeout:.0f}s'
+            logger.warning(f"Node {name} did not come online within {timeout:.0f}s")
+        await finish(result)
+
+    retransmitter = asyncio.create_task(retransmit()) if retransmits > 1 else None
+    try:
+        await asyncio.gather(*(wait_for(name) for name in to_wake))
+    finally:
+        if retransmitter and not retransmitter.done():
+            retransmitter.cancel()
+
+    return results
@@ -0,0 +1,173 @@
+"""
+Sentinel Bot Fake Proxmox API
+In-memory stand-in for the Proxmox VE REST API, for exercising ProxmoxAPI
+and the SSHManager API path without a cluster. A development tool; it is
+not deployed with the bot.
+
+Run standalone from the sentinel-bot directory:
+    python tools/proxmox_fake.py --port 8006
+
+Then point the bot at it with PROXMOX_API_SCHEME=http and the node IPs set
+to 127.0.0.1.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from typing import Dict, Any, Optional
+
+from aiohttp import web
+
+
+class FakeProxmox:
+    """A small simulated Proxmox cluster served over aiohttp."""
+
+    def __init__(
+        self,
+        nodes: Dict[str, str] = None,
+        token_id: str = 'sentinel@pve!bot',
+        token_secret: str = 'secret',
+        task_duration: float = 0.1
+    ):
+        self.nodes = nodes or {'node01': '127.0.0.1'}
+        self.auth = f'PVEAPIToken={token_id}={token_secret}'
+        self.task_duration = task_duration
+        self.guests: Dict[int, Dict[str, Any]] = {}
+        self.tasks: Dict[str, Dict[str, Any]] = {}
+        self.requests = 0
+        self._upid_seq = itertools.count(1)
+
+    def add_guest(self, vmid: int, name: str, node: str, kind: str = 'qemu', status: str = 'stopped') -> None:
+        self.guests[vmid] = {
+            'vmid': vmid,
+            'name': name,
+            'node': node,
+            'type': kind,
+            'status': status,
+            'cpu': 0.01 if status == 'running' else 0,
+            'mem': 512 * 1024**2 if status == 'running' else 0,
+            'maxmem': 2048 * 1024**2,
+            'uptime': 3600 if status == 'running' else 0,
+        }
+
+    # ==================== Routing ====================
+
+    def make_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._auth_middleware])
+        r = app.router
+        r.add_get('/api2/json/nodes', self._nodes)
+        r.add_get('/api2/json/cluster/status', self._cluster_status)
+        r.add_get('/api2/json/cluster/resources', self._cluster_resources)
+        r.add_get('/api2/json/nodes/{node}/status', self._node_status)
+        r.add_get('/api2/json/nodes/{node}/{kind:qemu|lxc}', self._list_guests)
+        r.add_get('/api2/json/nodes/{node}/{kind:qemu|lxc}/{vmid:\\d+}/status/current', self._guest_status)
+        r.add_post('/api2/json/nodes/{node}/{kind:qemu|lxc}/{vmid:\\d+}/status/{action}', self._guest_action)
+        r.add_get('/api2/json/nodes/{node}/tasks/{upid}/status', self._task_status)
+        return app
+
+    @web.middleware
+    async def _auth_middleware(self, request: web.Request, handler):
+        self.requests += 1
+        if request.headers.get('Authorization') != self.auth:
+            return web.json_response({'data': None}, status=401, reason='authentication failure')
+        return await handler(request)
+
+    @staticmethod
+    def _data(data: Any) -> web.Response:
+        return web.json_response({'data': data})
+
+    def _guest(self, request: web.Request) -> Optional[Dict[str, Any]]:
+        guest = self.guests.get(int(request.match_info['vmid']))
+        kind = request.match_info['kind']
+        if guest and guest['node'] == request.match_info['node'] and guest['type'] == kind:
+            return guest
+        return None
+
+    # ==================== Handlers ====================
+
+    async def _nodes(self, request: web.Request) -> web.Response:
+        return self._data([{'node': name, 'status': 'online'} for name in self.nodes])
+
+    async def _cluster_status(self, request: web.Request) -> web.Response:
+        entries = [{'type': 'cluster', 'name': 'fake', 'quorate': 1, 'nodes': len(self.nodes)}]
+        for i, (name, ip) in enumerate(self.nodes.items(), 1):
+            entries.append({'type': 'node', 'name': name, 'ip': ip, 'nodeid': i, 'online': 1})
+        return self._data(entries)
+
+    async def _cluster_resources(self, request: web.Request) -> web.Response:
+        wanted = request.query.get('type')
+        resources = []
+        if wanted in (None, 'node'):
+            for name in self.nodes:
+                resources.append({
+                    'type': 'node', 'id': f'node/{name}', 'node': name, 'status': 'online',
+                    'cpu': 0.05, 'maxcpu': 8, 'mem': 8 * 1024**3, 'maxmem': 32 * 1024**3,
+                })
+        if wanted in (None, 'vm'):
+            for guest in self.guests.values():
+                resources.append({**guest, 'id': f"{guest['type']}/{guest['vmid']}"})
+        return self._data(resources)
+
+    async def _node_status(self, request: web.Request) -> web.Response:
+        if request.match_info['node'] not in self.nodes:
+            raise web.HTTPInternalServerError(reason='no such node')
+        return self._data({
+            'cpu': 0.05,
+            'memory': {'used': 8 * 1024**3, 'total': 32 * 1024**3, 'free': 24 * 1024**3},
+            'uptime': 86400 * 3,
+        })
+
+    async def _list_guests(self, request: web.Request) -> web.Response:
+        node, kind = request.match_info['node'], request.match_info['kind']
+        return self._data([
+            g for g in self.guests.values() if g['node'] == node and g['type'] == kind
+        ])
+
+    async def _guest_status(self, request: web.Request) -> web.Response:
+        guest = self._guest(request)
+        if not guest:
+            raise web.HTTPInternalServerError(reason='Configuration file does not exist')
+        return self._data(guest)
+
+    async def _guest_action(self, request: web.Request) -> web.Response:
+        guest = self._guest(request)
+        if not guest:
+            raise web.HTTPInternalServerError(reason='Configuration file does not exist')
+
+        action = request.match_info['action']
+        node = request.match_info['node']
+        upid = f"UPID:{node}:{next(self._upid_seq):08X}:{int(time.time()):08X}:{action}:{guest['vmid']}:root@pam:"
+        self.tasks[upid] = {'done_at': time.monotonic() + self.task_duration, 'exitstatus': 'OK'}
+
+        new_status = {'start': 'running', 'reboot': 'running', 'stop': 'stopped', 'shutdown': 'stopped'}.get(action)
+        if new_status:
+            guest['status'] = new_status
+        return self._data(upid)
+
+    async def _task_status(self, request: web.Request) -> web.Response:
+        task = self.tasks.get(request.match_info['upid'])
+        if not task:
+            raise web.HTTPInternalServerError(reason='no such task')
+        if time.monotonic() < task['done_at']:
+            return self._data({'status': 'running'})
+        return self._data({'status': 'stopped', 'exitstatus': task['exitstatus']})
+
+
+async def _serve(port: int) -> None:
+    fake = FakeProxmox()
+    fake.add_guest(100, 'pihole', 'node01', kind='lxc', status='running')
+    fake.add_guest(101, 'docker-media', 'node01', status='running')
+    fake.add_guest(102, 'gitlab', 'node01')
+
+    runner = web.AppRunner(fake.make_app())
+    await runner.setup()
+    await web.TCPSite(runner, '127.0.0.1', port).start()
+    print(f"Fake Proxmox API on http://127.0.0.1:{port} (token {fake.auth})")
+    await asyncio.Event().wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a fake Proxmox API')
+    parser.add_argument('--port', type=int, default=8006)
+    asyncio.run(_serve(parser.parse_args().port))
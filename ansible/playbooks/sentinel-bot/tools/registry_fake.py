@@ -0,0 +1,116 @@
+"""
+Sentinel Bot Fake Registry
+In-memory stand-in for a Docker Registry v2 with bearer-token auth, for
+exercising RegistryClient and UpdateChecker without hitting real registries.
+A development tool; it is not deployed with the bot.
+
+Run standalone from the sentinel-bot directory:
+    python tools/registry_fake.py --port 5000
+
+Then create a RegistryClient(plain_http={'127.0.0.1:5000'}) and check
+images like 127.0.0.1:5000/library/nginx:latest.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import time
+from typing import Dict, Tuple
+
+from aiohttp import web
+
+
+class FakeRegistry:
+    """A registry serving manifest digests and tokens over aiohttp."""
+
+    def __init__(self, token_ttl: int = 300):
+        self.token_ttl = token_ttl
+        self.realm = ''      # filled in by start()
+        self.service = 'fake-registry'
+        self.manifests: Dict[Tuple[str, str], str] = {}  # (repository, tag) -> digest
+        self.tokens: Dict[str, Tuple[float, str]] = {}    # token -> (expires, scope)
+        self.manifest_requests = 0
+        self.token_requests = 0
+        self._token_seq = itertools.count(1)
+        self._runner = None
+
+    def push(self, repository: str, tag: str = 'latest', content: str = None) -> str:
+        """Publish (or move) a tag; returns its new digest."""
+        content = content or f"{repository}:{tag}:{time.time_ns()}"
+        digest = f"sha256:{hashlib.sha256(content.encode()).hexdigest()}"
+        self.manifests[(repository, tag)] = digest
+        return digest
+
+    # ==================== Lifecycle ====================
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get('/token', self._token)
+        app.router.add_route('*', '/v2/{repository:.+}/manifests/{reference}', self._manifest)
+        return app
+
+    async def start(self, port: int = 0) -> int:
+        """Serve on 127.0.0.1; returns the port (a free one if port is 0)."""
+        self._runner = web.AppRunner(self.make_app())
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.realm = f"http://127.0.0.1:{port}/token"
+        return port
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    # ==================== Handlers ====================
+
+    async def _token(self, request: web.Request) -> web.Response:
+        self.token_requests += 1
+        token = f"token-{next(self._token_seq)}"
+        self.tokens[token] = (time.monotonic() + self.token_ttl, request.query.get('scope', ''))
+        return web.json_response({'token': token, 'expires_in': self.token_ttl})
+
+    def _authorized(self, request: web.Request, repository: str) -> bool:
+        auth = request.headers.get('Authorization', '')
+        token = auth[len('Bearer '):] if auth.startswith('Bearer ') else ''
+        expires, scope = self.tokens.get(token, (0, ''))
+        return expires > time.monotonic() and scope == f"repository:{repository}:pull"
+
+    async def _manifest(self, request: web.Request) -> web.Response:
+        self.manifest_requests += 1
+        repository = request.match_info['repository']
+        if not self._authorized(request, repository):
+            challenge = (
+                f'Bearer realm="{self.realm}",service="{self.service}",'
+                f'scope="repository:{repository}:pull"'
+            )
+            return web.json_response(
+                {'errors': [{'code': 'UNAUTHORIZED'}]}, status=401,
+                headers={'WWW-Authenticate': challenge}
+            )
+
+        digest = self.manifests.get((repository, request.match_info['reference']))
+        if not digest:
+            return web.json_response({'errors': [{'code': 'MANIFEST_UNKNOWN'}]}, status=404)
+        headers = {
+            'Docker-Content-Digest': digest,
+            'Content-Type': 'application/vnd.oci.image.index.v1+json',
+        }
+        return web.Response(status=200, headers=headers)
+
+
+async def _serve(port: int) -> None:
+    fake = FakeRegistry()
+    for repository in ('library/nginx', 'library/redis', 'linuxserver/radarr'):
+        print(f"{repository}:latest -> {fake.push(repository)}")
+    await fake.start(port)
+    print(f"Fake registry on http://127.0.0.1:{port} (token realm {fake.realm})")
+    await asyncio.Event().wait()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve a fake Docker registry')
+    parser.add_argument('--port', type=int, default=5000)
+    asyncio.run(_serve(parser.parse_args().port))
@@ -0,0 +1,187 @@
+"""
+Sentinel Bot Webhook Ingestion
+Bounded queue and worker pool that processes webhook events after the
+HTTP request has already been answered.
+"""
+
+import logging
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Callable, Awaitable
+
+logger = logging.getLogger('sentinel.webhooks')
+
+# Idempotency keys are remembered this long (seconds) and at most this many
+DEDUPE_TTL = 3600
+DEDUPE_MAX_KEYS = 10000
+
+# Processing latencies kept for the metrics percentiles
+LATENCY_SAMPLES = 500
+
+WebhookHandler = Callable[[Any], Awaitable[None]]
+
+
+class QueueFullError(Exception):
+    """The ingestion queue has no room for another event."""
+
+
+@dataclass
+class WebhookEvent:
+    """One accepted webhook waiting to be processed."""
+    source: str
+    payload: Any
+    key: str
+    received_at: float = field(default_factory=time.monotonic)
+
+
+def idempotency_key(source: str, payload: Any, header: Optional[str] = None) -> str:
+    """
+    Key identifying a webhook delivery.
+
+    Senders that supply a delivery ID (Idempotency-Key / X-Request-ID)
+    are keyed on it; otherwise a hash of the canonical payload is used,
+    so a retried delivery of the same body is recognised.
+    """
+    if header:
+        return f"{source}:{header}"
+    body = json.dumps(payload, sort_keys=True, default=str)
+    return f"{source}:{hashlib.sha256(body.encode()).hexdigest()}"
+
+
+class WebhookIngestor:
+    """
+    Accepts webhook payloads into a bounded queue and processes them with
+    a pool of workers.
+
+    Duplicate deliveries (same idempotency key within DEDUPE_TTL) are
+    acknowledged but not processed again. A key is forgotten if its event
+    fails, so the sender's retry is processed.
+    """
+
+    def __init__(self, workers: int = 4, queue_size: int = 1000):
+        self.handlers: Dict[str, WebhookHandler] = {}
+        self.worker_count = max(1, workers)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._workers: list = []
+        self._seen: 'OrderedDict[str, float]' = OrderedDict()
+
+        # Metrics
+        self._latencies: deque = deque(maxlen=LATENCY_SAMPLES)
+        self.counters = {
+            'accepted': 0,
+            'duplicates': 0,
+            'rejected': 0,
+            'processed': 0,
+            'failed': 0,
+        }
+
+    def register(self, source: str, handler: WebhookHandler) -> None:
+        """Register the coroutine that processes events from a source."""
+        self.handlers[source] = handler
+
+    # ==================== Lifecycle ====================
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(i)) for i in range(self.worker_count)
+            ]
+            logger.info(f"Webhook ingestion started with {self.worker_count} workers")
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Give queued events a chance to finish, then stop the workers."""
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Dropping {self._queue.qsize()} unprocessed webhook events")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    # ==================== Ingestion ====================
+
+    def submit(self, source: str, payload: Any, key: str) -> bool:
+        """
+        Queue an event for processing.
+
+        Returns:
+            False if the event is a duplicate and was not queued
+
+        Raises:
+            QueueFullError: If the queue is full (sender should retry later)
+        """
+        if source not in self.handlers:
+            raise ValueError(f"No handler for webhook source: {source}")
+
+        self._expire_keys()
+        if key in self._seen:
+            self.counters['duplicates'] += 1
+            logger.info(f"Ignoring duplicate {source} webhook ({key})")
+            return False
+
+        try:
+            self._queue.put_nowait(WebhookEvent(source, payload, key))
+        except asyncio.QueueFull:
+            self.counters['rejected'] += 1
+            raise QueueFullError(f"Webhook queue full ({self._queue.maxsize} events)")
+
+        self._seen[key] = time.monotonic() + DEDUPE_TTL
+        while len(self._seen) > DEDUPE_MAX_KEYS:
+            self._seen.popitem(last=False)
+        self.counters['accepted'] += 1
+        return True
+
+    def _expire_keys(self) -> None:
+        now = time.monotonic()
+        # Keys are inserted in expiry order, so the oldest are at the front
+        while self._seen:
+            key, expires = next(iter(self._seen.items()))
+            if expires > now:
+                break
+            del self._seen[key]
+
+    async def _worker(self, number: int) -> None:
+        while True:
+            event = await self._queue.get()
+            try:
+                await self.handlers[event.source](event.payload)
+                self.counters['processed'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.counters['failed'] += 1
+                # Let a retried delivery through
+                self._seen.pop(event.key, None)
+                logger.error(f"{event.source} webhook failed (worker {number}): {e}")
+            finally:
+                self._latencies.append(time.monotonic() - event.received_at)
+                self._queue.task_done()
+
+    # ==================== Metrics ====================
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth, counters and processing latency (ms, enqueue to done)."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            'queue_depth': self._queue.qsize(),
+            'queue_size': self._queue.maxsize,
+            'workers': len(self._workers),
+            **self.counters,
+            'latency_ms': {
+                'avg': round(sum(latencies) / len(latencies) * 1000, 1) if latencies else None,
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': round(latencies[-1] * 1000, 1) if latencies else None,
+            },
+        }
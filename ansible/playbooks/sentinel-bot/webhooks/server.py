@@ -4,10 +4,16 @@ Quart-based async HTTP server for webhooks and APIs.
 """
 
 import logging
+import asyncio
+import json
+import time
 from functools import wraps
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from quart import Quart, request, jsonify
+from quart import Quart, Response, request, jsonify, make_response
+
+from core.database import PRIORITY_RANKS
+from .ingest import WebhookIngestor, QueueFullError, idempotency_key
 
 if TYPE_CHECKING:
     from core import SentinelBot
@@ -15,6 +21,43 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger('sentinel.webhooks')
 
+# Longest a /api/tasks/next long-poll may park (seconds)
+MAX_TASK_WAIT = 60
+
+# /api/events: comment sent on idle streams (seconds), client reconnect delay
+# (milliseconds) and task events replayed per query when resuming
+SSE_KEEPALIVE = 15
+SSE_RETRY_MS = 5000
+SSE_REPLAY_PAGE = 500
+
+# Most tasks one batch request may create, complete or cancel
+MAX_BATCH_SIZE = 100
+
+# Instances count as active for this long; responses that depend on it are
+# also revalidated every ACTIVE_BUCKET seconds since entries age out
+ACTIVE_MINUTES = 10
+ACTIVE_BUCKET = 60
+
+
+def parse_task_ids(data: Any) -> Tuple[List[int], Optional[str]]:
+    """Read the task_ids list of a batch request; returns (ids, error)."""
+    task_ids = data.get('task_ids') if isinstance(data, dict) else None
+    if not isinstance(task_ids, list) or not task_ids:
+        return [], 'task_ids must be a non-empty list'
+    if len(task_ids) > MAX_BATCH_SIZE:
+        return [], f'At most {MAX_BATCH_SIZE} tasks per batch'
+    if not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in task_ids):
+        return [], 'task_ids must be integers'
+    return list(dict.fromkeys(task_ids)), None
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """Encode one Server-Sent Events message."""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return '\n'.join(lines) + '\n\n'
+
 
 def require_api_key(f):
     """Decorator to require API key for endpoints."""
@@ -37,6 +80,46 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
     app.bot = bot
     app.sentinel_config = config
 
+    # ==================== Response Cache ====================
+
+    # Serialized GET responses keyed by endpoint, each with the ETag it was
+    # built for. The ETag is the database write version (plus a startup tag,
+    # since the version restarts at 0), so unchanged polls get a 304 without
+    # touching SQLite and repeat polls reuse the cached body.
+    startup_tag = f"{int(time.time()):x}"
+    response_cache: Dict[str, Tuple[str, str]] = {}
+
+    async def cached_json(name: str, build, time_bucket: int = 0) -> Response:
+        """
+        Serve a JSON GET response with an ETag, answering If-None-Match.
+
+        Args:
+            name: Cache slot for this response
+            build: Coroutine function returning the response data
+            time_bucket: Also change the ETag every N seconds, for data
+                that goes stale without a write
+        """
+        # Read the version before building so a concurrent write can only
+        # make the cached body newer than its ETag, never older
+        etag = f"{startup_tag}-{bot.db.version}"
+        if time_bucket:
+            etag += f"-{int(time.time() // time_bucket)}"
+
+        if request.if_none_match.contains(etag):
+            response = Response('', status=304)
+        else:
+            cached = response_cache.get(name)
+            if cached and cached[0] == etag:
+                body = cached[1]
+            else:
+                body = app.json.dumps(await build())
+                response_cache[name] = (etag, body)
+            response = Response(body, content_type='application/json')
+
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
     # ==================== Health Check ====================
 
     @app.route('/health', methods=['GET'])
@@ -48,80 +131,164 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             'guilds': len(bot.guilds) if bot else 0,
         })
 
+    # ==================== Webhook Ingestion ====================
+
+    # Webhooks are acknowledged with 202 as soon as they are queued; workers
+    # do the Discord work afterwards so a slow Discord never makes the
+    # sender time out and retry
+    ingestor = WebhookIngestor(workers=config.webhook.workers, queue_size=config.webhook.queue_size)
+    app.ingestor = ingestor
+
+    @app.before_serving
+    async def start_ingestion():
+        ingestor.start()
+
+    @app.after_serving
+    async def stop_ingestion():
+        await ingestor.stop()
+
+    async def ingest(source: str, data: Any):
+        """Queue a validated webhook payload and build the HTTP response."""
+        key = idempotency_key(
+            source, data,
+            request.headers.get('Idempotency-Key') or request.headers.get('X-Request-ID')
+        )
+        try:
+            queued = ingestor.submit(source, data, key)
+        except QueueFullError as e:
+            logger.warning(f"Rejected {source} webhook: {e}")
+            return jsonify({'error': 'Queue full, retry later'}), 503, {'Retry-After': '30'}
+        return jsonify({'status': 'accepted' if queued else 'duplicate'}), 202
+
     # ==================== Watchtower Webhook ====================
 
+    async def process_watchtower(data: Any):
+        """Send update notifications for a Watchtower report."""
+        # Format varies by Watchtower version
+        entries = data if isinstance(data, list) else [data]
+
+        for entry in entries:
+            container = entry.get('name') or entry.get('container')
+            status = entry.get('status', 'updated')
+            image = entry.get('image', 'unknown')
+
+            if container and bot.channel_router:
+                await bot.channel_router.send_update_notification(
+                    container_name=container,
+                    host_ip='watchtower',
+                    status='success' if status == 'updated' else status,
+                    details=f"Image: {image}"
+                )
+
+    ingestor.register('watchtower', process_watchtower)
+
     @app.route('/webhook/watchtower', methods=['POST'])
     async def watchtower_webhook():
-        """Handle Watchtower container update notifications."""
-        try:
-            data = await request.get_json()
-            logger.info(f"Watchtower webhook received: {data}")
-
-            # Parse Watchtower notification
-            # Format varies by Watchtower version
-            entries = data if isinstance(data, list) else [data]
-
-            for entry in entries:
-                container = entry.get('name') or entry.get('container')
-                status = entry.get('status', 'updated')
-                image = entry.get('image', 'unknown')
-
-                if container and bot.channel_router:
-                    await bot.channel_router.send_update_notification(
-                        container_name=container,
-                        host_ip='watchtower',
-                        status='success' if status == 'updated' else status,
-                        details=f"Image: {image}"
-                    )
+        """Accept Watchtower container update notifications."""
+        data = await request.get_json(silent=True)
+        entries = data if isinstance(data, list) else [data]
+        if not entries or not all(isinstance(entry, dict) for entry in entries):
+            return jsonify({'error': 'Expected a JSON object or list of objects'}), 400
 
-            return jsonify({'status': 'ok'})
-        except Exception as e:
-            logger.error(f"Watchtower webhook error: {e}")
-            return jsonify({'error': str(e)}), 500
+        logger.debug(f"Watchtower webhook received: {data}")
+        return await ingest('watchtower', data)
 
     # ==================== Jellyseerr Webhook ====================
 
-    @app.route('/webhook/jellyseerr', methods=['POST'])
-    async def jellyseerr_webhook():
-        """Handle Jellyseerr media request notifications."""
-        try:
-            data = await request.get_json()
-            logger.info(f"Jellyseerr webhook received: {data}")
-
-            notification_type = data.get('notification_type', '')
-            media = data.get('media', {})
-            request_info = data.get('request', {})
-
-            title = media.get('tmdbTitle') or media.get('tvdbTitle') or 'Unknown'
-            media_type = media.get('media_type', 'media')
-            poster = media.get('posterPath')
-
-            # Map Jellyseerr notification types to our events
-            event_map = {
-                'MEDIA_PENDING': 'requested',
-                'MEDIA_APPROVED': 'approved',
-                'MEDIA_AVAILABLE': 'completed',
-                'MEDIA_FAILED': 'failed',
-                'MEDIA_DECLINED': 'declined',
-            }
-            event = event_map.get(notification_type, notification_type)
+    async def process_jellyseerr(data: Dict[str, Any]):
+        """Send a media notification for a Jellyseerr event."""
+        notification_type = data.get('notification_type', '')
+        media = data.get('media') or {}
+        request_info = data.get('request') or {}
+
+        title = media.get('tmdbTitle') or media.get('tvdbTitle') or 'Unknown'
+        media_type = media.get('media_type', 'media')
+        poster = media.get('posterPath')
+
+        # Map Jellyseerr notification types to our events
+        event_map = {
+            'MEDIA_PENDING': 'requested',
+            'MEDIA_APPROVED': 'approved',
+            'MEDIA_AVAILABLE': 'completed',
+            'MEDIA_FAILED': 'failed',
+            'MEDIA_DECLINED': 'declined',
+        }
+        event = event_map.get(notification_type, notification_type)
+
+        if bot.channel_router:
+            await bot.channel_router.send_media_notification(
+                title=title,
+                media_type=media_type,
+                event=event,
+                poster_url=f"https://image.tmdb.org/t/p/w500{poster}" if poster else None,
+                details={
+                    'Requested By': (request_info.get('requestedBy') or {}).get('username', 'Unknown'),
+                    'Status': event.title(),
+                }
+            )
 
-            if bot.channel_router:
-                await bot.channel_router.send_media_notification(
-                    title=title,
-                    media_type=media_type,
-                    event=event,
-                    poster_url=f"https://image.tmdb.org/t/p/w500{poster}" if poster else None,
-                    details={
-                        'Requested By': request_info.get('requestedBy', {}).get('username', 'Unknown'),
-                        'Status': event.title(),
-                    }
-                )
+    ingestor.register('jellyseerr', process_jellyseerr)
 
-            return jsonify({'status': 'ok'})
-        except Exception as e:
-            logger.error(f"Jellyseerr webhook error: {e}")
-            return jsonify({'error': str(e)}), 500
+    @app.route('/webhook/jellyseerr', methods=['POST'])
+    async def jellyseerr_webhook():
+        """Accept Jellyseerr media request notifications."""
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict) or not data.get('notification_type'):
+            return jsonify({'error': 'Expected a JSON object with notification_type'}), 400
+
+        logger.debug(f"Jellyseerr webhook received: {data}")
+        return await ingest('jellyseerr', data)
+
+    # ==================== Radarr / Sonarr Webhooks ====================
+
+    async def process_radarr(data: Dict[str, Any]):
+        """Feed a Radarr event to the download event service and library index."""
+        if bot.download_events:
+            await bot.download_events.handle_webhook('radarr', data)
+        if bot.library:
+            await bot.library.handle_webhook('radarr', data)
+
+    async def process_sonarr(data: Dict[str, Any]):
+        """Feed a Sonarr event to the download event service and library index."""
+        if bot.download_events:
+            await bot.download_events.handle_webhook('sonarr', data)
+        if bot.library:
+            await bot.library.handle_webhook('sonarr', data)
+
+    ingestor.register('radarr', process_radarr)
+    ingestor.register('sonarr', process_sonarr)
+
+    @app.route('/webhook/radarr', methods=['POST'])
+    async def radarr_webhook():
+        """Accept Radarr Connect webhooks (downloads and library changes)."""
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict) or not data.get('eventType'):
+            return jsonify({'error': 'Expected a JSON object with eventType'}), 400
+
+        logger.debug(f"Radarr webhook received: {data.get('eventType')}")
+        return await ingest('radarr', data)
+
+    @app.route('/webhook/sonarr', methods=['POST'])
+    async def sonarr_webhook():
+        """Accept Sonarr Connect webhooks (downloads and library changes)."""
+        data = await request.get_json(silent=True)
+        if not isinstance(data, dict) or not data.get('eventType'):
+            return jsonify({'error': 'Expected a JSON object with eventType'}), 400
+
+        logger.debug(f"Sonarr webhook received: {data.get('eventType')}")
+        return await ingest('sonarr', data)
+
+    @app.route('/api/downloads', methods=['GET'])
+    async def list_downloads():
+        """Downloads being tracked and the queue poller's current interval."""
+        if not bot.download_events:
+            return jsonify({'error': 'Download events not available'}), 503
+        return jsonify(bot.download_events.status())
+
+    @app.route('/api/webhooks/metrics', methods=['GET'])
+    async def webhook_metrics():
+        """Ingestion queue depth, counters and processing latency."""
+        return jsonify(ingestor.metrics())
 
     # ==================== Claude Task API ====================
 
@@ -132,8 +299,10 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             if not bot.db:
                 return jsonify({'error': 'Database not available'}), 503
 
-            tasks = await bot.db.get_pending_tasks(limit=50)
-            return jsonify({'tasks': tasks})
+            async def build():
+                return {'tasks': await bot.db.get_pending_tasks(limit=50)}
+
+            return await cached_json('tasks', build)
         except Exception as e:
             logger.error(f"List tasks error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -172,16 +341,175 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             logger.error(f"Create task error: {e}")
             return jsonify({'error': str(e)}), 500
 
+    # ==================== Batch Task API ====================
+
+    @app.route('/api/tasks/batch', methods=['POST'])
+    async def create_tasks_batch():
+        """
+        Create several tasks in one transaction.
+
+        Body: {"tasks": [{"description": ..., "priority": ...} | "description", ...],
+               "submitted_by": ...}
+        Invalid items are reported and skipped; results follow request order.
+        """
+        try:
+            if not bot.db:
+                return jsonify({'error': 'Database not available'}), 503
+
+            data = await request.get_json(silent=True) or {}
+            items = data.get('tasks') if isinstance(data, dict) else None
+            if not isinstance(items, list) or not items:
+                return jsonify({'error': 'tasks must be a non-empty list'}), 400
+            if len(items) > MAX_BATCH_SIZE:
+                return jsonify({'error': f'At most {MAX_BATCH_SIZE} tasks per batch'}), 400
+
+            results, valid = [], []
+            for index, item in enumerate(items):
+                if isinstance(item, str):
+                    item = {'description': item}
+                if not isinstance(item, dict) or not item.get('description'):
+                    results.append({'index': index, 'error': 'description required'})
+                    continue
+                priority = item.get('priority', 'medium')
+                if priority not in PRIORITY_RANKS:
+                    results.append({'index': index, 'error': f'Invalid priority: {priority}'})
+                    continue
+                results.append({'index': index})
+                valid.append((index, item['description'], priority))
+
+            if not valid:
+                return jsonify({'error': 'No valid tasks in batch', 'results': results, 'created': 0}), 400
+
+            task_ids = await bot.db.create_tasks(
+                [(description, priority) for _, description, priority in valid],
+                submitted_by=data.get('submitted_by', 'api')
+            )
+            for (index, _, _), task_id in zip(valid, task_ids):
+                results[index].update(task_id=task_id, status='created')
+
+            if bot.channel_router:
+                await bot.channel_router.send_task_batch_notification(
+                    'created',
+                    [(task_id, description) for (_, description, _), task_id in zip(valid, task_ids)]
+                )
+
+            return jsonify({'results': results, 'created': len(task_ids)}), 201
+        except Exception as e:
+            logger.error(f"Batch create error: {e}")
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/tasks/batch/complete', methods=['POST'])
+    async def complete_tasks_batch():
+        """
+        Complete several tasks claimed by one instance.
+
+        Body: {"task_ids": [...], "instance_id": ..., "notes": ...}
+        """
+        try:
+            if not bot.db:
+                return jsonify({'error': 'Database not available'}), 503
+
+            data = await request.get_json(silent=True) or {}
+            task_ids, error = parse_task_ids(data)
+            if error:
+                return jsonify({'error': error}), 400
+            instance_id = data.get('instance_id')
+            if not instance_id:
+                return jsonify({'error': 'instance_id required'}), 400
+
+            completed = await bot.db.complete_tasks(task_ids, instance_id, data.get('notes'))
+            if completed:
+                await bot.db.update_instance_heartbeat(instance_id, instance_id, 'idle')
+                if bot.channel_router:
+                    await bot.channel_router.send_task_batch_notification(
+                        'completed', list(completed.items()), instance_name=instance_id
+                    )
+
+            results = [
+                {'task_id': task_id, 'status': 'completed'} if task_id in completed
+                else {'task_id': task_id, 'error': 'Task not found or not claimed by this instance'}
+                for task_id in task_ids
+            ]
+            return jsonify({'results': results, 'completed': len(completed)})
+        except Exception as e:
+            logger.error(f"Batch complete error: {e}")
+            return jsonify({'error': str(e)}), 500
+
+    @app.route('/api/tasks/batch/cancel', methods=['POST'])
+    async def cancel_tasks_batch():
+        """
+        Cancel several pending tasks.
+
+        Body: {"task_ids": [...]}
+        """
+        try:
+            if not bot.db:
+                return jsonify({'error': 'Database not available'}), 503
+
+            data = await request.get_json(silent=True) or {}
+            task_ids, error = parse_task_ids(data)
+            if error:
+                return jsonify({'error': error}), 400
+
+            cancelled = await bot.db.cancel_tasks(task_ids)
+            if cancelled and bot.channel_router:
+                await bot.channel_router.send_task_batch_notification('cancelled', list(cancelled.items()))
+
+            results = [
+                {'task_id': task_id, 'status': 'cancelled'} if task_id in cancelled
+                else {'task_id': task_id, 'error': 'Task not found or not pending'}
+                for task_id in task_ids
+            ]
+            return jsonify({'results': results, 'cancelled': len(cancelled)})
+        except Exception as e:
+            logger.error(f"Batch cancel error: {e}")
+            return jsonify({'error': str(e)}), 500
+
+    async def announce_claim(task_id: int, description: str, instance_id: str, instance_name: str):
+        """Record the claiming instance as busy and post the claim to Discord."""
+        await bot.db.update_instance_heartbeat(instance_id, instance_name or instance_id, 'working')
+        if bot.channel_router:
+            await bot.channel_router.send_task_notification(
+                task_id=task_id,
+                description=description,
+                event='claimed',
+                instance_name=instance_name
+            )
+
     @app.route('/api/tasks/next', methods=['GET'])
     async def get_next_task():
-        """Get the next available task."""
+        """
+        Get the next available task.
+
+        Query params:
+            wait: Seconds to wait for a task if the queue is empty (long-poll)
+            claim: 1 to claim the task atomically (needs instance_id)
+            instance_id, instance_name: Claiming instance
+        """
         try:
             if not bot.db:
                 return jsonify({'error': 'Database not available'}), 503
 
-            task = await bot.db.get_next_task()
+            try:
+                wait = min(max(float(request.args.get('wait', 0)), 0), MAX_TASK_WAIT)
+            except ValueError:
+                return jsonify({'error': 'wait must be a number'}), 400
+            claim = request.args.get('claim', '').lower() in ('1', 'true', 'yes')
+            instance_id = request.args.get('instance_id')
+            instance_name = request.args.get('instance_name')
+
+            if claim and not instance_id:
+                return jsonify({'error': 'instance_id required to claim'}), 400
+
+            task = await bot.db.wait_for_task(
+                wait,
+                instance_id=instance_id if claim else None,
+                instance_name=instance_name
+            )
             if task:
-                return jsonify({'task': task})
+                if claim:
+                    await announce_claim(task['id'], task['description'], instance_id, instance_name)
+                return jsonify({'task': task, 'claimed': claim})
             return jsonify({'task': None, 'message': 'No pending tasks'})
         except Exception as e:
             logger.error(f"Get next task error: {e}")
@@ -204,20 +532,8 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             success = await bot.db.claim_task(task_id, instance_id, instance_name)
 
             if success:
-                # Update instance heartbeat
-                await bot.db.update_instance_heartbeat(instance_id, instance_name or instance_id, 'working')
-
-                # Notify via Discord
-                if bot.channel_router:
-                    task = await bot.db.get_pending_tasks(limit=100)
-                    task_desc = next((t['description'] for t in task if t['id'] == task_id), 'Unknown')
-                    await bot.channel_router.send_task_notification(
-                        task_id=task_id,
-                        description=task_desc,
-                        event='claimed',
-                        instance_name=instance_name
-                    )
-
+                task = await bot.db.get_task(task_id)
+                await announce_claim(task_id, task['description'] if task else 'Unknown', instance_id, instance_name)
                 return jsonify({'status': 'claimed'})
             return jsonify({'error': 'Task not available'}), 409
         except Exception as e:
@@ -266,8 +582,10 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             if not bot.db:
                 return jsonify({'error': 'Database not available'}), 503
 
-            instances = await bot.db.get_active_instances(minutes=10)
-            return jsonify({'instances': instances})
+            async def build():
+                return {'instances': await bot.db.get_active_instances(minutes=ACTIVE_MINUTES)}
+
+            return await cached_json('instances', build, time_bucket=ACTIVE_BUCKET)
         except Exception as e:
             logger.error(f"List instances error: {e}")
             return jsonify({'error': str(e)}), 500
@@ -293,6 +611,103 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             logger.error(f"Heartbeat error: {e}")
             return jsonify({'error': str(e)}), 500
 
+    # ==================== Event Stream ====================
+
+    @app.route('/api/events', methods=['GET'])
+    async def event_stream():
+        """
+        Server-Sent Events stream of task, instance, download and stats changes.
+
+        Events: task.created, task.claimed, task.completed, task.cancelled,
+        task.reset, instance (heartbeats), download.grabbed,
+        download.progress, download.completed, download.imported,
+        download.failed and stats (counts plus delta). Task events carry
+        their task_logs ID; reconnecting clients send it back as
+        Last-Event-ID (or ?last_event_id=N) and missed events are replayed
+        from the log. ?events=download,instance limits the stream to those
+        event types.
+        """
+        if not bot.db:
+            return jsonify({'error': 'Database not available'}), 503
+
+        topics = {t.strip() for t in request.args.get('events', '').split(',') if t.strip()}
+
+        def wanted(event: str) -> bool:
+            return not topics or event.split('.')[0] in topics
+
+        last_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+        try:
+            last_id = int(last_id) if last_id else None
+        except ValueError:
+            return jsonify({'error': 'last_event_id must be an integer'}), 400
+
+        # Subscribe before replaying so nothing published in between is lost
+        queue = bot.db.subscribe()
+
+        async def stats_event(previous: dict) -> tuple:
+            stats = await bot.db.get_task_stats()
+            delta = {
+                status: stats.get(status, 0) - previous.get(status, 0)
+                for status in set(stats) | set(previous)
+                if stats.get(status, 0) != previous.get(status, 0)
+            }
+            return stats, delta
+
+        async def stream():
+            nonlocal last_id
+            try:
+                yield f"retry: {SSE_RETRY_MS}\n\n"
+
+                if last_id is not None and wanted('task'):
+                    while True:
+                        events = await bot.db.get_task_events(last_id, limit=SSE_REPLAY_PAGE)
+                        for event in events:
+                            last_id = event['id']
+                            yield format_sse(f"task.{event['action']}", event, event['id'])
+                        if len(events) < SSE_REPLAY_PAGE:
+                            break
+                else:
+                    last_id = bot.db.last_event_id
+
+                # Initial snapshot; its ID gives new clients a point to resume from
+                stats, _ = await stats_event({})
+                if wanted('stats'):
+                    yield format_sse('stats', {'tasks': stats, 'delta': {}}, last_id)
+
+                while True:
+                    try:
+                        message = await asyncio.wait_for(queue.get(), SSE_KEEPALIVE)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+
+                    if message is None:
+                        # Fell too far behind; the client reconnects and resumes
+                        return
+                    if not wanted(message['event']):
+                        continue
+                    if message['id'] is not None:
+                        if message['id'] <= last_id:
+                            continue  # already sent during replay
+                        last_id = message['id']
+                    yield format_sse(message['event'], message['data'], message['id'])
+
+                    # One stats delta per burst of task events
+                    if message['event'].startswith('task.') and queue.empty() and wanted('stats'):
+                        stats, delta = await stats_event(stats)
+                        if delta:
+                            yield format_sse('stats', {'tasks': stats, 'delta': delta})
+            finally:
+                bot.db.unsubscribe(queue)
+
+        response = await make_response(stream(), {
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        })
+        response.timeout = None  # streams stay open indefinitely
+        return response
+
     # ==================== Stats Endpoint ====================
 
     @app.route('/api/stats', methods=['GET'])
@@ -302,13 +717,15 @@ def create_app(bot: 'SentinelBot', config: 'Config') -> Quart:
             if not bot.db:
                 return jsonify({'error': 'Database not available'}), 503
 
-            task_stats = await bot.db.get_task_stats()
-            instances = await bot.db.get_active_instances(minutes=10)
+            async def build():
+                task_stats = await bot.db.get_task_stats()
+                instances = await bot.db.get_active_instances(minutes=ACTIVE_MINUTES)
+                return {
+                    'tasks': task_stats,
+                    'active_instances': len(instances),
+                }
 
-            return jsonify({
-                'tasks': task_stats,
-                'active_instances': len(instances),
-            })
+            return await cached_json('stats', build, time_bucket=ACTIVE_BUCKET)
         except Exception as e:
             logger.error(f"Stats error: {e}")
             return jsonify({'error': str(e)}), 500
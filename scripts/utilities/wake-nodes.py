@@ -3,14 +3,23 @@
 Wake-on-LAN script for Proxmox nodes
 Works on macOS, Linux, Windows with no dependencies
 
+Magic packets for every target are sent at once (and repeated a few times in
+case one is dropped). With --wait, all nodes are then probed in parallel on
+SSH (22) and the Proxmox web UI (8006) and each node's boot time is reported.
+
 Usage:
-    python3 wake-nodes.py           # Wake all nodes
-    python3 wake-nodes.py node01    # Wake node01 only
-    python3 wake-nodes.py node02    # Wake node02 only
+    python3 wake-nodes.py                  # Wake all nodes
+    python3 wake-nodes.py node01           # Wake node01 only
+    python3 wake-nodes.py node01 node02    # Wake several nodes
+    python3 wake-nodes.py --wait           # Wake all nodes and wait until they're up
+    python3 wake-nodes.py --wait --timeout 600
 """
 
+import argparse
+import asyncio
 import socket
 import sys
+import time
 
 # Node MAC addresses
 NODES = {
@@ -22,70 +31,161 @@ NODES = {
         "mac": "84:47:09:4d:7a:ca",
         "ip": "192.168.20.21",
     },
+    "node03": {
+        "mac": "d8:43:ae:a8:4c:a7",
+        "ip": "192.168.20.22",
+    },
 }
 
 BROADCAST = "255.255.255.255"  # Works across subnets via Tailscale
+VLAN_BROADCAST = "192.168.20.255"
 PORT = 9
 
+# Magic packet repeats and the gap between them (seconds)
+RETRANSMITS = 3
+RETRANSMIT_INTERVAL = 1.0
+
+# Ports that must accept connections before a node counts as up
+READY_PORTS = (22, 8006)
 
-def send_magic_packet(mac_address: str, node_name: str) -> bool:
-    """Send a Wake-on-LAN magic packet."""
+
+def magic_packet(mac_address: str) -> bytes:
+    """Build a Wake-on-LAN magic packet."""
     # Remove delimiters and convert to bytes
     mac_clean = mac_address.replace(":", "").replace("-", "")
     mac_bytes = bytes.fromhex(mac_clean)
 
     # Magic packet: 6 bytes of 0xFF followed by MAC address repeated 16 times
-    magic_packet = b"\xff" * 6 + mac_bytes * 16
+    return b"\xff" * 6 + mac_bytes * 16
+
+
+async def send_magic_packets(targets: list) -> bool:
+    """Send magic packets to all targets at once, repeated RETRANSMITS times."""
+    packets = []
+    for name in targets:
+        try:
+            packets.append(magic_packet(NODES[name]["mac"]))
+        except ValueError as e:
+            print(f"✗ Invalid MAC for {name}: {e}")
+            return False
 
     try:
         # Create UDP socket
         sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    except OSError as e:
+        print(f"✗ Failed to open broadcast socket: {e}")
+        return False
 
-        # Send to broadcast address
-        sock.sendto(magic_packet, (BROADCAST, PORT))
+    try:
+        for attempt in range(RETRANSMITS):
+            for packet in packets:
+                # Send to broadcast address and the VLAN 20 broadcast
+                sock.sendto(packet, (BROADCAST, PORT))
+                sock.sendto(packet, (VLAN_BROADCAST, PORT))
+            if attempt < RETRANSMITS - 1:
+                await asyncio.sleep(RETRANSMIT_INTERVAL)
+    except OSError as e:
+        print(f"✗ Failed to send magic packets: {e}")
+        return False
+    finally:
+        sock.close()
 
-        # Also try the VLAN 20 broadcast
-        sock.sendto(magic_packet, ("192.168.20.255", PORT))
+    for name in targets:
+        print(f"✓ Magic packet sent to {name} ({NODES[name]['mac']})")
+    return True
 
-        sock.close()
-        print(f"✓ Magic packet sent to {node_name} ({mac_address})")
-        return True
-    except Exception as e:
-        print(f"✗ Failed to wake {node_name}: {e}")
+
+async def port_open(ip: str, port: int, timeout: float = 2.0) -> bool:
+    """Check whether a TCP port accepts connections."""
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout)
+    except (OSError, asyncio.TimeoutError):
         return False
+    writer.close()
+    return True
+
+
+async def is_ready(ip: str) -> bool:
+    results = await asyncio.gather(*(port_open(ip, port) for port in READY_PORTS))
+    return all(results)
+
+
+async def wait_for_node(name: str, started: float, timeout: float) -> bool:
+    """Probe a node with exponential backoff until it's up or timeout passes."""
+    ip = NODES[name]["ip"]
+    deadline = started + timeout
+    interval = 1.0
+    while True:
+        if await is_ready(ip):
+            print(f"✓ {name} ({ip}) is up after {time.monotonic() - started:.0f}s")
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            print(f"✗ {name} ({ip}) not up after {timeout:.0f}s")
+            return False
+        await asyncio.sleep(min(interval, remaining))
+        interval = min(interval * 2, 10.0)
+
+
+async def run(targets: list, wait: bool, timeout: float) -> bool:
+    # Skip nodes that are already up
+    online = await asyncio.gather(*(is_ready(NODES[name]["ip"]) for name in targets))
+    for name, up in zip(targets, online):
+        if up:
+            print(f"• {name} ({NODES[name]['ip']}) is already up")
+    to_wake = [name for name, up in zip(targets, online) if not up]
+    if not to_wake:
+        return True
+
+    started = time.monotonic()
+    sender = asyncio.create_task(send_magic_packets(to_wake))
+
+    if not wait:
+        return await sender
+
+    print()
+    print(f"Waiting up to {timeout:.0f}s for {', '.join(to_wake)}...")
+    results = await asyncio.gather(*(wait_for_node(name, started, timeout) for name in to_wake))
+    sent = await sender
+    return sent and all(results)
 
 
 def main():
-    targets = sys.argv[1:] if len(sys.argv) > 1 else ["all"]
+    parser = argparse.ArgumentParser(description="Wake Proxmox nodes via Wake-on-LAN")
+    parser.add_argument("nodes", nargs="*", default=["all"], help="Nodes to wake (default: all)")
+    parser.add_argument("--wait", action="store_true", help="Wait for nodes to come up and report boot times")
+    parser.add_argument("--timeout", type=float, default=300, help="Seconds to wait with --wait (default: 300)")
+    args = parser.parse_args()
 
     print("=" * 50)
     print("Wake-on-LAN for Proxmox Nodes")
     print("=" * 50)
     print()
 
-    success = True
-
-    for target in targets:
+    targets = []
+    for target in args.nodes:
         if target == "all":
-            for name, info in NODES.items():
-                if not send_magic_packet(info["mac"], name):
-                    success = False
+            targets.extend(NODES)
         elif target in NODES:
-            if not send_magic_packet(NODES[target]["mac"], target):
-                success = False
+            targets.append(target)
         else:
             print(f"Unknown node: {target}")
             print(f"Available nodes: {', '.join(NODES.keys())}")
             sys.exit(1)
-
-    print()
-    print("-" * 50)
-    print("Nodes should boot in 30-60 seconds.")
-    print()
-    print("Check status:")
-    for name, info in NODES.items():
-        print(f"  ping {info['ip']}  # {name}")
+    targets = list(dict.fromkeys(targets))
+
+    success = asyncio.run(run(targets, args.wait, args.timeout))
+
+    if not args.wait:
+        print()
+        print("-" * 50)
+        print("Nodes should boot in 30-60 seconds.")
+        print()
+        print("Check status:")
+        for name in targets:
+            print(f"  ping {NODES[name]['ip']}  # {name}")
+        print("  (or rerun with --wait)")
 
     sys.exit(0 if success else 1)
 